@@ -0,0 +1,175 @@
+"""
+Confidence-gated, temporally smoothed letter acceptance
+
+Raw per-frame predictions flicker between classes while a sign is formed. The
+acceptor smooths ``predict_proba`` outputs with an exponential moving average
+and a fixed window mean, and only reports a letter once both agree it is above
+the class's enter threshold. The letter stays accepted until its score falls
+below a lower exit threshold (hysteresis), so a held sign is reported once.
+"""
+import numpy as np
+
+
+class LetterAcceptor:
+    """
+    Per-frame letter acceptance over a fixed ring buffer of probability vectors.
+
+    Every update is O(classes) and works in place on buffers allocated in the
+    constructor.
+    """
+
+    def __init__(self, labels, window=8, alpha=0.35, enter_threshold=0.7, exit_threshold=0.3, thresholds=None):
+        """
+        Args:
+            labels: Class labels in classifier column order
+            window: Number of recent frames in the window mean
+            alpha: EMA weight of the newest frame
+            enter_threshold: Default smoothed score needed to accept a letter
+            exit_threshold: Default smoothed score below which an accepted letter is released
+            thresholds: Optional dict of label -> (enter, exit) overriding the defaults per class
+        """
+        self.labels = [str(label).upper() for label in labels]
+        n_classes = len(self.labels)
+        self.window = window
+        self.alpha = alpha
+
+        self.enter = np.full(n_classes, enter_threshold)
+        self.exit = np.full(n_classes, exit_threshold)
+        for label, (enter, exit_) in (thresholds or {}).items():
+            index = self.labels.index(str(label).upper())
+            self.enter[index] = enter
+            self.exit[index] = exit_
+
+        self._ring = np.zeros((window, n_classes))
+        self._ring_sum = np.zeros(n_classes)
+        self._ema = np.zeros(n_classes)
+        self._mean = np.zeros(n_classes)
+        self._score = np.zeros(n_classes)
+        self._scratch = np.zeros(n_classes)
+        self._zeros = np.zeros(n_classes)
+        self._pos = 0
+
+        self._stable = -1
+        self.confidence = 0.0
+        # Incremented every time a letter becomes accepted, so consumers can detect new acceptances
+        self.accept_count = 0
+
+    @property
+    def letter(self):
+        """Currently accepted letter, or None"""
+        return self.labels[self._stable] if self._stable >= 0 else None
+
+    def reset(self):
+        """Forget all history and release the accepted letter"""
+        self._ring.fill(0.0)
+        self._ring_sum.fill(0.0)
+        self._ema.fill(0.0)
+        self._pos = 0
+        self._stable = -1
+        self.confidence = 0.0
+
+    def update(self, probs):
+        """
+        Feed one frame's class probabilities.
+
+        Args:
+            probs: Probability vector in classifier column order
+
+        Returns:
+            tuple: (letter or None, confidence)
+        """
+        # Window mean: swap the oldest vector out of the running sum
+        slot = self._ring[self._pos]
+        self._ring_sum -= slot
+        slot[:] = probs
+        self._ring_sum += slot
+        self._pos = (self._pos + 1) % self.window
+        # Dividing by the full window (not the frames seen so far) makes start-up conservative
+        np.divide(self._ring_sum, self.window, out=self._mean)
+
+        # EMA of the same stream
+        self._ema *= 1.0 - self.alpha
+        np.multiply(slot, self.alpha, out=self._scratch)
+        self._ema += self._scratch
+
+        # A class must be strong both recently (EMA) and consistently (window mean)
+        score = self._score
+        np.minimum(self._ema, self._mean, out=score)
+        best = int(np.argmax(score))
+        stable = self._stable
+
+        if stable >= 0 and score[stable] < self.exit[stable]:
+            stable = -1
+        if best != stable and score[best] >= self.enter[best] and (stable < 0 or score[best] > score[stable]):
+            stable = best
+            self.accept_count += 1
+        self._stable = stable
+        self.confidence = float(score[stable] if stable >= 0 else score[best])
+        return self.letter, self.confidence
+
+    def update_absent(self):
+        """
+        Feed a frame without a hand, decaying every class.
+
+        Returns:
+            tuple: (letter or None, confidence)
+        """
+        return self.update(self._zeros)
+
+
+def replay(acceptor, frames, truth):
+    """
+    Replay a recorded or synthetic stream through an acceptor and score it.
+
+    Args:
+        acceptor: LetterAcceptor to drive (it is reset first)
+        frames: Sequence of probability vectors, or None for frames without a hand
+        truth: Sequence of the letter actually being signed per frame (None when no sign)
+
+    Returns:
+        dict: Accept count, false accepts, false-accept rate, duplicate accepts of a letter
+        already accepted in the same segment, mean/max accept latency in frames per
+        signed segment, and the number of segments never accepted
+    """
+    acceptor.reset()
+    accepts = 0
+    false_accepts = 0
+    duplicate_accepts = 0
+    latencies = []
+    missed = 0
+    segment_label = None
+    segment_start = 0
+    segment_hit = True
+    last_count = acceptor.accept_count
+
+    for index, (probs, label) in enumerate(zip(frames, truth)):
+        label = str(label).upper() if label is not None else None
+        if label != segment_label:
+            if segment_label is not None and not segment_hit:
+                missed += 1
+            segment_label, segment_start, segment_hit = label, index, label is None
+
+        letter, _ = acceptor.update(probs) if probs is not None else acceptor.update_absent()
+        if acceptor.accept_count != last_count:
+            last_count = acceptor.accept_count
+            accepts += 1
+            if letter != label:
+                false_accepts += 1
+            elif segment_hit:
+                duplicate_accepts += 1
+            else:
+                segment_hit = True
+                latencies.append(index - segment_start + 1)
+
+    if segment_label is not None and not segment_hit:
+        missed += 1
+
+    return {
+        "accepts": accepts,
+        "false_accepts": false_accepts,
+        "false_accept_rate": false_accepts / accepts if accepts else 0.0,
+        "duplicate_accepts": duplicate_accepts,
+        "mean_latency_frames": float(np.mean(latencies)) if latencies else None,
+        "max_latency_frames": int(max(latencies)) if latencies else None,
+        "missed_segments": missed,
+    }
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Headless camera throughput and latency characterization
+
+Measures, for every combination of capture backend, buffer size and read mode
+(``read()`` versus split ``grab()``/``retrieve()``):
+
+- inter-frame interval distribution (jitter)
+- time blocked in ``read()``/``grab()`` and spent in ``retrieve()``
+- duplicate frames (identical frame hashes) and dropped frames (gaps in the interval sequence)
+- capture-to-processing age, from the driver's buffer timestamp where it is on the monotonic clock
+
+``--process-ms`` simulates per-frame detection work, so the ages show how much
+stale footage each buffer size queues up at the app's real processing rate.
+The report is JSON, for choosing settings per kiosk model without a display.
+
+Usage:
+    python camera_characterize.py                                  # camera 0, default sweep
+    python camera_characterize.py --buffer-sizes 1 4 --process-ms 15 --output kiosk_a.json
+    python camera_characterize.py --backends v4l2 gstreamer --frames 600
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import time
+import numpy as np
+import cv2
+from platform_utils import (
+    get_camera_backend,
+    get_platform_info,
+    camera_identity,
+    load_camera_cache,
+    apply_camera_config,
+    decode_fourcc,
+)
+
+BACKENDS = {
+    "default": None,  # get_camera_backend() for this platform
+    "any": cv2.CAP_ANY,
+    "v4l2": cv2.CAP_V4L2,
+    "gstreamer": cv2.CAP_GSTREAMER,
+    "ffmpeg": cv2.CAP_FFMPEG,
+    "dshow": cv2.CAP_DSHOW,
+    "msmf": cv2.CAP_MSMF,
+    "avfoundation": cv2.CAP_AVFOUNDATION,
+}
+READ_MODES = ("read", "grab_retrieve")
+
+# Intervals longer than this many median intervals count as dropped frames
+DROP_FACTOR = 1.5
+# Driver timestamps further than this from the monotonic clock are on another time base
+MAX_PLAUSIBLE_AGE_MS = 5000.0
+
+
+def frame_hash(frame):
+    """
+    Hash a frame cheaply from a strided subsample.
+
+    Args:
+        frame: BGR frame
+
+    Returns:
+        bytes: 8-byte digest; equal digests mean the camera delivered the same image again
+    """
+    return hashlib.blake2b(np.ascontiguousarray(frame[::8, ::8]).tobytes(), digest_size=8).digest()
+
+
+def percentiles(values):
+    """
+    Summarize a distribution.
+
+    Args:
+        values: Sequence of numbers
+
+    Returns:
+        dict or None: mean, std, p50, p90, p99 and max, or None if there are no values
+    """
+    if len(values) == 0:
+        return None
+    values = np.asarray(values, dtype=float)
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(values.max()),
+    }
+
+
+def capture_samples(cam, n_frames, read_mode="read", process_ms=0.0):
+    """
+    Read frames and record per-frame timings.
+
+    Args:
+        cam: Open cv2.VideoCapture
+        n_frames: Frames to record
+        read_mode: "read" or "grab_retrieve"
+        process_ms: Simulated processing time per frame
+
+    Returns:
+        list: One dict per frame with time (s), read_ms, retrieve_ms, hash and pos_msec
+    """
+    samples = []
+    for _ in range(n_frames):
+        start = time.perf_counter()
+        if read_mode == "grab_retrieve":
+            ok = cam.grab()
+            grabbed = time.perf_counter()
+            if ok:
+                ok, frame = cam.retrieve()
+        else:
+            ok, frame = cam.read()
+            grabbed = time.perf_counter()
+        done = time.perf_counter()
+        if not ok:
+            break
+        # Read the driver timestamp before any processing delay
+        pos_msec = cam.get(cv2.CAP_PROP_POS_MSEC)
+        samples.append({
+            "time": done,
+            "monotonic_ms": time.monotonic() * 1000,
+            "read_ms": (grabbed - start) * 1000,
+            "retrieve_ms": (done - grabbed) * 1000,
+            "hash": frame_hash(frame),
+            "pos_msec": pos_msec,
+        })
+        if process_ms > 0:
+            time.sleep(process_ms / 1000)
+    return samples
+
+
+def summarize(samples, read_mode="read"):
+    """
+    Turn per-frame samples into the report's metrics.
+
+    Args:
+        samples: Output of capture_samples
+        read_mode: Read mode the samples were taken with
+
+    Returns:
+        dict: frames, fps, interval_ms, read_ms, retrieve_ms (split reads only), duplicates,
+        dropped and age_ms (None when the driver timestamps are not on the monotonic clock)
+    """
+    times = np.array([sample["time"] for sample in samples])
+    intervals = np.diff(times) * 1000 if len(times) > 1 else np.array([])
+
+    duplicates = sum(1 for previous, sample in itertools.pairwise(samples) if previous["hash"] == sample["hash"])
+    dropped = 0
+    if len(intervals):
+        period = float(np.median(intervals))
+        if period > 0:
+            long_gaps = intervals[intervals > DROP_FACTOR * period]
+            dropped = int(np.sum(np.round(long_gaps / period) - 1))
+
+    ages = [sample["monotonic_ms"] - sample["pos_msec"] for sample in samples if sample["pos_msec"] > 0]
+    if not ages or not all(0.0 <= age <= MAX_PLAUSIBLE_AGE_MS for age in ages):
+        ages = []
+
+    return {
+        "frames": len(samples),
+        "fps": (len(samples) - 1) / (times[-1] - times[0]) if len(times) > 1 and times[-1] > times[0] else 0.0,
+        "interval_ms": percentiles(intervals),
+        "read_ms": percentiles([sample["read_ms"] for sample in samples]),
+        "retrieve_ms": percentiles([sample["retrieve_ms"] for sample in samples]) if read_mode == "grab_retrieve" else None,
+        "duplicates": duplicates,
+        "dropped": dropped,
+        "age_ms": percentiles(ages),
+    }
+
+
+def open_capture(source, backend, buffer_size, target_fps):
+    """
+    Open a capture with the given backend and buffer size, in the device's cached mode if it has one.
+
+    Returns:
+        tuple: (cv2.VideoCapture, settings dict actually applied), or (None, None) if it did not open
+    """
+    cam = cv2.VideoCapture(source, backend)
+    if not cam.isOpened():
+        return None, None
+    cached = load_camera_cache().get(camera_identity(source, backend)) if isinstance(source, int) else None
+    if cached is not None:
+        apply_camera_config(cam, cached)
+    else:
+        cam.set(cv2.CAP_PROP_FPS, target_fps)
+    cam.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+    settings = {
+        "width": int(cam.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cam.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fourcc": decode_fourcc(cam.get(cv2.CAP_PROP_FOURCC)),
+        "reported_fps": cam.get(cv2.CAP_PROP_FPS),
+        "buffer_size": cam.get(cv2.CAP_PROP_BUFFERSIZE),
+        "cached_mode": cached is not None,
+    }
+    return cam, settings
+
+
+def characterize(source=0, backends=("default",), buffer_sizes=(1, 4), read_modes=READ_MODES,
+                 n_frames=300, warmup=15, process_ms=0.0, target_fps=60):
+    """
+    Sweep backends, buffer sizes and read modes over one camera.
+
+    Returns:
+        dict: JSON-serializable report with platform info and one entry per run
+    """
+    runs = []
+    for backend_name in backends:
+        backend = BACKENDS[backend_name]
+        if backend is None:
+            # Video files (useful for checking the tool itself) go through whatever backend can decode them
+            backend = get_camera_backend() if isinstance(source, int) else cv2.CAP_ANY
+        for buffer_size in buffer_sizes:
+            for read_mode in read_modes:
+                run = {"backend": backend_name, "buffer_size": buffer_size, "read_mode": read_mode}
+                cam, settings = open_capture(source, backend, buffer_size, target_fps)
+                if cam is None:
+                    run["error"] = "could not open"
+                    runs.append(run)
+                    continue
+                try:
+                    capture_samples(cam, warmup, read_mode)
+                    samples = capture_samples(cam, n_frames, read_mode, process_ms)
+                finally:
+                    cam.release()
+                run["settings"] = settings
+                run.update(summarize(samples, read_mode))
+                runs.append(run)
+                print(format_run(run))
+    return {
+        "platform": get_platform_info(),
+        "source": str(source),
+        "identity": camera_identity(source, get_camera_backend()) if isinstance(source, int) else None,
+        "process_ms": process_ms,
+        "frames_per_run": n_frames,
+        "runs": runs,
+    }
+
+
+def format_run(run):
+    """One summary line for a run"""
+    label = f"{run['backend']:>10s} buf={run['buffer_size']} {run['read_mode']:>13s}"
+    if "error" in run:
+        return f"  {label}: {run['error']}"
+    interval = run["interval_ms"] or {}
+    read = run["read_ms"] or {}
+    age = f"age p50 {run['age_ms']['p50']:.1f}ms" if run["age_ms"] else "age n/a"
+    return (f"  {label}: {run['fps']:5.1f} FPS | interval p50 {interval.get('p50', 0):.1f} "
+            f"p99 {interval.get('p99', 0):.1f}ms | read p50 {read.get('p50', 0):.1f}ms | "
+            f"dup {run['duplicates']} drop {run['dropped']} | {age}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Characterize camera throughput and latency without a display")
+    parser.add_argument("--source", default="0", help="camera index or video file")
+    parser.add_argument("--backends", nargs="+", default=["default"], choices=sorted(BACKENDS))
+    parser.add_argument("--buffer-sizes", nargs="+", type=int, default=[1, 4])
+    parser.add_argument("--read-modes", nargs="+", default=list(READ_MODES), choices=READ_MODES)
+    parser.add_argument("--frames", type=int, default=300, help="frames recorded per run")
+    parser.add_argument("--process-ms", type=float, default=0.0, help="simulated processing time per frame")
+    parser.add_argument("--fps", type=int, default=60, help="frame rate requested when the camera has no cached mode")
+    parser.add_argument("--output", default="camera_report.json", help="JSON report path")
+    args = parser.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    print("=" * 60)
+    print(f"CAMERA CHARACTERIZATION: {args.source}")
+    print("=" * 60)
+    report = characterize(source, args.backends, args.buffer_sizes, args.read_modes,
+                          n_frames=args.frames, process_ms=args.process_ms, target_fps=args.fps)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print("=" * 60)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
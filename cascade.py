@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Early-exit classifier cascade
+
+Most frames of a held sign are easy. ``CascadeClassifier`` puts cheap stages in
+front of the full predictor: a stage answers for a row when the margin between
+its top two probabilities reaches the stage's threshold, and only the rows no
+stage was sure about go to the full predictor. It has ``classes_`` and
+``predict_proba`` like the classifier it wraps, so it is saved as an ordinary
+``predictor_vN.pkl`` and loaded (or hot-reloaded) by the app unchanged.
+
+Stages are plain numpy (no scikit-learn call overhead): a linear softmax model
+and a nearest-centroid model, both on the scaled features. Thresholds are
+calibrated offline on recorded landmarks, stage by stage, to the lowest margin
+that keeps cascade accuracy within ``--tolerance`` of the full predictor.
+
+Usage:
+    python cascade.py datasets/v2 --version 1 --tolerance 0.005
+"""
+import argparse
+import datetime
+import time
+import numpy as np
+from classification import predict_proba
+
+
+def _softmax(scores):
+    scores = scores - scores.max(axis=1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=1, keepdims=True)
+    return scores
+
+
+class LinearStage:
+    """Multinomial linear model evaluated with one matrix product"""
+
+    def __init__(self, coef, intercept, classes):
+        self.coef = np.ascontiguousarray(coef.T)
+        self.intercept = intercept
+        self.classes_ = np.asarray(classes)
+
+    @classmethod
+    def fit(cls, data, labels, C=1.0):
+        """Fit on scaled features with scikit-learn's LogisticRegression and keep only the weights"""
+        from sklearn.linear_model import LogisticRegression
+
+        model = LogisticRegression(C=C, max_iter=2000).fit(data, labels)
+        coef, intercept = model.coef_, model.intercept_
+        if len(model.classes_) == 2:
+            # Binary problems have one weight row; expand to one per class
+            coef, intercept = np.vstack([-coef / 2, coef / 2]), np.array([-intercept[0] / 2, intercept[0] / 2])
+        return cls(coef, intercept, model.classes_)
+
+    def predict_proba(self, data):
+        return _softmax(data @ self.coef + self.intercept)
+
+
+class CentroidStage:
+    """Nearest class centroid, with a softmax over negative squared distances"""
+
+    def __init__(self, centroids, classes, temperature=1.0):
+        self.centroids = centroids
+        self.classes_ = np.asarray(classes)
+        self.temperature = temperature
+        self._norms = (centroids ** 2).sum(axis=1)
+
+    @classmethod
+    def fit(cls, data, labels):
+        """Class means of the scaled features; the temperature is the median squared distance to the own centroid"""
+        classes = np.unique(labels)
+        centroids = np.array([data[labels == label].mean(axis=0) for label in classes])
+        own = centroids[np.searchsorted(classes, labels)]
+        temperature = float(np.median(((data - own) ** 2).sum(axis=1))) or 1.0
+        return cls(centroids, classes, temperature)
+
+    def predict_proba(self, data):
+        distances = (data ** 2).sum(axis=1, keepdims=True) - 2 * data @ self.centroids.T + self._norms
+        return _softmax(-distances / self.temperature)
+
+
+def margins(probs):
+    """Difference between each row's two highest probabilities"""
+    top2 = np.partition(probs, -2, axis=1)[:, -2:]
+    return top2[:, 1] - top2[:, 0]
+
+
+class CascadeClassifier:
+    """
+    Cheap stages with early exit in front of a full classifier.
+
+    Counts rows per exit in ``exits`` (one entry per stage, then the full predictor).
+    """
+
+    def __init__(self, stages, thresholds, full):
+        """
+        Args:
+            stages: Cheap models with classes_ and predict_proba, cheapest first
+            thresholds: Minimum top-two margin for each stage to answer
+            full: The full classifier, answering everything else
+        """
+        self.stages = list(stages)
+        self.thresholds = list(thresholds)
+        self.full = full
+        self.classes_ = full.classes_
+        # Column order of each stage's probabilities in the full classifier's class order
+        self._columns = [np.searchsorted(self.classes_, stage.classes_) for stage in self.stages]
+        self.exits = [0] * (len(self.stages) + 1)
+
+    def predict_proba(self, data):
+        probs = np.zeros((len(data), len(self.classes_)))
+        remaining = np.arange(len(data))
+        for index, (stage, threshold, columns) in enumerate(zip(self.stages, self.thresholds, self._columns)):
+            if len(remaining) == 0:
+                break
+            stage_probs = stage.predict_proba(data[remaining])
+            sure = margins(stage_probs) >= threshold if stage_probs.shape[1] > 1 else np.ones(len(remaining), bool)
+            if sure.any():
+                rows = remaining[sure]
+                probs[rows[:, None], columns[None, :]] = stage_probs[sure]
+                self.exits[index] += len(rows)
+                remaining = remaining[~sure]
+        if len(remaining):
+            probs[remaining] = predict_proba(self.full, data[remaining])
+            self.exits[-1] += len(remaining)
+        return probs
+
+    def predict(self, data):
+        return self.classes_[np.argmax(self.predict_proba(data), axis=1)]
+
+    def stats(self):
+        """
+        Where rows have exited so far.
+
+        Returns:
+            dict: rows, early-exit fraction and per-stage row counts
+        """
+        total = sum(self.exits)
+        return {
+            "rows": total,
+            "early_exit": sum(self.exits[:-1]) / total if total else None,
+            "exits": dict({f"stage{index}": count for index, count in enumerate(self.exits[:-1])}, full=self.exits[-1]),
+        }
+
+
+def calibrate_thresholds(stages, full, data, labels, tolerance=0.005):
+    """
+    Choose each stage's margin threshold on labelled, scaled calibration data.
+
+    Stage by stage, the lowest threshold (most early exits) is taken for which the
+    cascade so far, with the full predictor behind it, stays within ``tolerance`` of
+    the full predictor's accuracy.
+
+    Args:
+        stages: Fitted cheap stages, cheapest first
+        full: Full classifier
+        data: Scaled calibration features
+        labels: Calibration labels
+        tolerance: Allowed accuracy loss against the full predictor (absolute)
+
+    Returns:
+        tuple: (thresholds, full predictor accuracy, cascade accuracy)
+    """
+    full_correct = full.classes_[np.argmax(predict_proba(full, data), axis=1)] == labels
+    target = full_correct.mean() - tolerance
+    # correct[i]: is row i answered correctly by the cascade built so far
+    correct = full_correct.copy()
+    open_rows = np.ones(len(data), dtype=bool)
+    thresholds = []
+    for stage in stages:
+        probs = stage.predict_proba(data)
+        stage_correct = stage.classes_[np.argmax(probs, axis=1)] == labels
+        stage_margins = margins(probs)
+        # Exiting the rows with the highest margins first: accuracy as a function of how many exit
+        order = np.argsort(-stage_margins, kind="stable")
+        order = order[open_rows[order]]
+        gains = stage_correct[order].astype(int) - correct[order].astype(int)
+        accuracy = (correct.sum() + np.concatenate([[0], np.cumsum(gains)])) / len(data)
+        # Exits happen in groups of equal margin, so only group boundaries are valid cut points
+        sorted_margins = stage_margins[order]
+        valid = np.concatenate([sorted_margins[1:] < sorted_margins[:-1], [True]]) if len(order) else np.array([], bool)
+        cuts = [0] + [k + 1 for k in np.flatnonzero(valid) if accuracy[k + 1] >= target]
+        n_exit = max(cuts)
+        threshold = float(sorted_margins[n_exit - 1]) if n_exit else float("inf")
+        thresholds.append(threshold)
+        exited = order[:n_exit]
+        correct[exited] = stage_correct[exited]
+        open_rows[exited] = False
+    return thresholds, float(full_correct.mean()), float(correct.mean())
+
+
+def time_single_rows(classifier, scaler, features, repeats=2000):
+    """
+    Time the app's per-hand call on rows drawn from ``features``.
+
+    Returns:
+        dict: mean_ms and p99_ms per call
+    """
+    rng = np.random.default_rng(0)
+    times = np.empty(repeats)
+    for index in range(repeats):
+        row = features[rng.integers(len(features))][None, :]
+        start = time.perf_counter()
+        predict_proba(classifier, scaler.transform(row))
+        times[index] = (time.perf_counter() - start) * 1000
+    return {"mean_ms": float(times.mean()), "p99_ms": float(np.percentile(times, 99))}
+
+
+def build_cascade(datasets, version, tolerance=0.005, archive_dir="archive", stage_names=("centroid", "linear")):
+    """
+    Fit cheap stages, calibrate them against an archived predictor and write the cascade as the next version.
+
+    Half of the dataset's source units fit the stages and the other half calibrates the
+    thresholds, so thresholds are not tuned on rows the stages have memorized.
+
+    Returns:
+        dict: The manifest written
+    """
+    from sklearn.model_selection import GroupShuffleSplit
+    from model_store import artifact_paths, load_model
+    from train_model import load_datasets, next_version, write_artifacts
+    from platform_utils import get_platform_info
+
+    base = load_model(*artifact_paths(version, archive_dir))
+    features, labels, groups = load_datasets(datasets)
+    # The archived classifier's own class names (it may use lower-case labels)
+    by_upper = {str(label).upper(): label for label in base.classifier.classes_}
+    keep = np.array([label in by_upper for label in labels])
+    features, groups = features[keep], groups[keep]
+    labels = np.array([by_upper[label] for label in labels[keep]])
+
+    fit_rows, calibration_rows = next(GroupShuffleSplit(n_splits=1, test_size=0.5, random_state=0).split(features, labels, groups))
+    scaled = base.scaler.transform(features)
+    factories = {"centroid": CentroidStage.fit, "linear": LinearStage.fit}
+    stages = [factories[name](scaled[fit_rows], labels[fit_rows]) for name in stage_names]
+    thresholds, full_accuracy, cascade_accuracy = calibrate_thresholds(
+        stages, base.classifier, scaled[calibration_rows], labels[calibration_rows], tolerance
+    )
+    cascade = CascadeClassifier(stages, thresholds, base.classifier)
+
+    full_latency = time_single_rows(base.classifier, base.scaler, features[calibration_rows])
+    cascade_latency = time_single_rows(cascade, base.scaler, features[calibration_rows])
+    stats = cascade.stats()
+    cascade.exits = [0] * len(cascade.exits)
+
+    new_version = next_version(archive_dir)
+    manifest = dict(base.manifest or {})
+    manifest.update({
+        "version": new_version,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "model": "cascade",
+        "accuracy": cascade_accuracy,
+        "latency": {"1": {"p50_ms": None, "p99_ms": cascade_latency["p99_ms"], "mean_ms": cascade_latency["mean_ms"]}},
+        "classes": [str(label) for label in cascade.classes_],
+        "cascade": {
+            "base_version": version,
+            "stages": list(stage_names),
+            "thresholds": thresholds,
+            "tolerance": tolerance,
+            "full_accuracy": full_accuracy,
+            "cascade_accuracy": cascade_accuracy,
+            "early_exit": stats["early_exit"],
+            "exits": stats["exits"],
+            "full_latency": full_latency,
+            "cascade_latency": cascade_latency,
+            "calibration_rows": len(calibration_rows),
+        },
+        "machine": get_platform_info(),
+    })
+    write_artifacts(new_version, cascade, base.scaler, manifest, archive_dir)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an early-exit cascade in front of an archived predictor")
+    parser.add_argument("datasets", nargs="+", help="dataset directories from extract_landmarks.py")
+    parser.add_argument("--version", type=int, required=True, help="archived predictor_vN to put behind the cheap stages")
+    parser.add_argument("--tolerance", type=float, default=0.005, help="allowed accuracy loss against the full predictor")
+    parser.add_argument("--stages", nargs="+", choices=["centroid", "linear"], default=["centroid", "linear"],
+                        help="cheap stages, cheapest first")
+    parser.add_argument("--archive", default="archive", help="artifact directory")
+    args = parser.parse_args()
+
+    # Build through the importable module: classes defined in __main__ would be pickled
+    # as __main__.CascadeClassifier, which the app cannot load
+    from cascade import build_cascade
+    manifest = build_cascade(args.datasets, args.version, args.tolerance, args.archive, args.stages)
+    info = manifest["cascade"]
+    print("=" * 60)
+    print(f"CASCADE v{manifest['version']} over predictor_v{args.version}")
+    print("=" * 60)
+    for name, threshold in zip(info["stages"], info["thresholds"]):
+        print(f"  {name:10s} exits at margin >= {threshold:.3f}")
+    print(f"  Early exit: {info['early_exit'] * 100:.1f}% of rows | exits {info['exits']}")
+    print(f"  Accuracy: {info['cascade_accuracy'] * 100:.2f}% (full predictor {info['full_accuracy'] * 100:.2f}%, "
+          f"tolerance {args.tolerance * 100:.2f}%)")
+    print(f"  Per-hand time: mean {info['cascade_latency']['mean_ms']:.3f}ms p99 {info['cascade_latency']['p99_ms']:.3f}ms "
+          f"(full predictor mean {info['full_latency']['mean_ms']:.3f}ms p99 {info['full_latency']['p99_ms']:.3f}ms)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Helpers for turning landmark features into letter probabilities
+"""
+import numpy as np
+
+# Column names of landmark_features rows: the classifier input schema recorded in model manifests
+FEATURE_COLUMNS = ["handedness"] + [f"{axis}{index}" for index in range(21) for axis in "xyz"]
+
+
+def classifier_letters(classifier):
+    """
+    Get the letter label for each classifier output column.
+
+    Args:
+        classifier: Fitted scikit-learn classifier
+
+    Returns:
+        list: Upper-case labels in ``classes_`` order
+    """
+    return [str(label).upper() for label in classifier.classes_]
+
+
+def predict_proba(classifier, data):
+    """
+    Get class probabilities, falling back to one-hot votes for classifiers without predict_proba.
+
+    Args:
+        classifier: Fitted scikit-learn classifier
+        data: Scaled feature matrix of shape (n_samples, n_features)
+
+    Returns:
+        np.ndarray: Probabilities of shape (n_samples, n_classes) in ``classes_`` order
+    """
+    if hasattr(classifier, "predict_proba"):
+        return classifier.predict_proba(data)
+
+    labels = classifier.predict(data)
+    probs = np.zeros((len(labels), len(classifier.classes_)))
+    probs[np.arange(len(labels)), np.searchsorted(classifier.classes_, labels)] = 1.0
+    return probs
+
+
+def landmark_features(handedness_ls, world_landmarks_ls):
+    """
+    Build classifier input rows for every detected hand at once.
+
+    Args:
+        handedness_ls: ``result.handedness`` from the HandLandmarker
+        world_landmarks_ls: ``result.hand_world_landmarks`` from the HandLandmarker
+
+    Returns:
+        np.ndarray: Unscaled features of shape (n_hands, 64): handedness index then x, y, z per landmark
+    """
+    features = np.empty((len(world_landmarks_ls), 64))
+    for row, (handedness, landmarks) in enumerate(zip(handedness_ls, world_landmarks_ls)):
+        features[row, 0] = handedness[0].index
+        features[row, 1:] = [value for landmark in landmarks for value in (landmark.x, landmark.y, landmark.z)]
+    return features
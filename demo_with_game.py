@@ -1,35 +1,66 @@
+from startup import StartupProfiler, lazy_import, preload, run_parallel
+startup_profile = StartupProfiler()
 import math
-import joblib
-import mediapipe as mp
-import cv2
 import numpy as np
 import threading
 import time
-import queue
 import os
+import argparse
+import signal
 import webbrowser
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from urllib.parse import parse_qs, urlparse
-from utils import draw_landmarks_on_image, add_transparent_image
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
 from platform_utils import initialize_camera, find_instruction_image, get_platform_info
+from latest_value import LatestValueMailbox
+from fingerspelling import PrefixTrie, LexiconBeamDecoder, DEFAULT_LEXICON_PATH
+from sign_engine import SignRecognizer, EngineOptions
+from model_store import artifact_paths, load_model
+from shadow_model import ShadowEvaluator
+from template_store import TemplateStore
+from user_adapter import CalibrationSession
+from multi_camera import CameraSupervisor
+from frame_ring import SharedFrameRing
+from metrics import MetricsRegistry
+from event_log import EventLog
+from stats_store import StatsStore
+from letter_latency import LetterLatency
+from session_recorder import SessionRecorder
+from motion_gate import MotionGate
+from power_state import PowerStateMachine, IDLE
 
-# Load the trained models
-with open("archive/predictor_v1.pkl", "rb") as f:
-    classifier = joblib.load(f)
+# Heavy dependencies are imported by the startup tasks in main(), concurrently
+cv2 = lazy_import("cv2")
+mp = lazy_import("mediapipe")
+joblib = lazy_import("joblib")
+utils = lazy_import("utils")
+startup_profile.record("import game modules", startup_profile.origin)
 
-with open("archive/scaler_v1.pkl", "rb") as f:
-    scaler = joblib.load(f)
-
-HandLandmarker = mp.tasks.vision.HandLandmarker
-HandLandmarkerResult = mp.tasks.vision.HandLandmarkerResult
+# Lexicon for free-spelling mode, indexed over the classifier's letters
+spell_trie = None
 
 # Global variables
-predictions = []
-drawn_frame = np.array([])
-frame_queue = queue.Queue(maxsize=10)
-prediction_queue = queue.Queue(maxsize=5)
+# Single-slot mailboxes between the MediaPipe callback, the camera thread and the main thread
+# (the landmark overlay is published by the engine, in engine.overlays)
+# (track_id, acceptance key, accepted letter or None, confidence) for the primary hand;
+# the key is (static acceptances, dynamic detections) and changes on every fresh acceptance
+prediction_mailbox = LatestValueMailbox((None, 0, None, 0.0))
+# (per-hand tuples as above, live track IDs) for every tracked hand
+hands_mailbox = LatestValueMailbox(((), ()))
+frame_mailbox = LatestValueMailbox()
+# Frames with the game overlay drawn (main thread -> camera window, /api/stream)
+display_mailbox = LatestValueMailbox()
+spelling_mailbox = LatestValueMailbox({'prefixes': [], 'words': ()})
+# (label, distance) of the custom sign closest to the primary hand, or None
+custom_mailbox = LatestValueMailbox(None)
+last_prediction_seq = 0
+last_accept = (None, 0)
+last_hands_seq = 0
+last_display_seq = 0
+last_spelling_seq = 0
 camera_running = False
 camera_ready = threading.Event()
+server_ready = threading.Event()  # Set once the web console is bound (or failed to bind)
+camera_supervisor = None  # Set when running one worker process per camera (--cameras)
 
 # Game state variables
 current_word = ""
@@ -37,16 +68,52 @@ current_letter_index = 0
 completed_letters = set()
 game_active = False
 game_window_created = False
+game_mode = "word"  # "word" (spell a target word) or "spell" (free spelling against the lexicon)
+detected_letter = None
+detected_confidence = 0.0
+spelled_words = []
+spelling_prefixes = []
+# Decoder and committed words for the current free-spelling session; replaced as a whole on restart
+spell_session = None
+# Two-player mode: track ID bound to each player, letters completed, and the last acceptance seen
+player_tracks = [None, None]
+player_progress = [0, 0]
+player_last_accept = [None, None]
+versus_winner = None
+# Persistent statistics (--stats-db): open sessions as (session ID, player), and when each slot's target letter became active
+stats = None
+player_name = "guest"
+stats_sessions = []
+letter_started_at = [0.0, 0.0]
 
 # Web console server variables
 word_input_result = None
 word_input_server = None
 web_console_port = 8765
+# No camera or instruction windows and no browser (--headless); the web console is the only interface
+headless = False
+# Headless main loop wake-up interval when no frame arrives (idle mode), so web console commands and shutdown are picked up
+HEADLESS_WAIT_SECONDS = 0.1
+# How long shutdown waits for the camera thread to close the landmarker, camera or workers and frame rings
+CAMERA_STOP_TIMEOUT = 10.0
 
-# Globals for one-hand-at-a-time logic
-tracked_hand_index = None
-no_hand_counter = 0
-NO_HAND_THRESHOLD = 1  # Number of consecutive frames with no hands before resetting
+# Runtime counters and timings, served at /api/metrics
+metrics = MetricsRegistry()
+# Game, camera and error events: written to the terminal and --event-log by a background thread, served at /api/events
+events = EventLog(rate_limits={"mismatch": 1.0, "error": 1.0, "camera_error": 1.0}, metrics=metrics)
+# Landmarker, classifier, hand tracking and letter acceptance; results arrive in handle_frame_result
+engine = SignRecognizer(EngineOptions(), on_result=lambda result: handle_frame_result(result), metrics=metrics,
+                        events=events)
+# Time to first hit and to acceptance of each target letter, served at /api/latency
+engine.latency = LetterLatency()
+# Rolling buffer of the displayed frames, dumped to a clip with the R key or /api/recording/dump (--record-seconds)
+recorder = None
+# Per-user calibration started from the web console (/api/calibrate/start), or None
+calibration = None
+# Skips detection on frames that barely differ from the last detected one
+motion_gate = MotionGate(metrics=metrics)
+# Drops to low-rate, low-resolution presence polling after a while without hands (--idle-after)
+power_state = PowerStateMachine(idle_after=30.0, metrics=metrics)
 
 class WebConsoleHandler(BaseHTTPRequestHandler):
     """HTTP handler for web-based game console"""
@@ -75,7 +142,7 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
     
     def do_GET(self):
         """Serve the game console or API endpoints"""
-        global word_input_result
+        global word_input_result, calibration
         
         if self.path == '/':
             self.send_response(200)
@@ -278,7 +345,7 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
                         padding: 20px 30px;
                         border-bottom: 2px solid #fa6322;
                         display: grid;
-                        grid-template-columns: repeat(3, 1fr);
+                        grid-template-columns: repeat(4, 1fr);
                         gap: 20px;
                         font-family: 'Share Tech Mono', monospace;
                     }
@@ -565,6 +632,28 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
                     .header.branded {
                         animation: glow 3s infinite;
                     }
+                    .camera-panel {
+                        margin-bottom: 24px;
+                        text-align: center;
+                    }
+                    .camera-panel img {
+                        max-width: 100%;
+                        border: 1px solid rgba(0, 255, 65, 0.3);
+                    }
+                    .latency-panel {
+                        margin-top: 24px;
+                        overflow-x: auto;
+                    }
+                    .latency-heatmap {
+                        border-collapse: collapse;
+                        font-size: 12px;
+                        color: #00ff41;
+                    }
+                    .latency-heatmap th, .latency-heatmap td {
+                        padding: 4px 8px;
+                        text-align: center;
+                        border: 1px solid rgba(0, 255, 65, 0.15);
+                    }
                     /* Terminal cursor effect */
                     @keyframes cursor {
                         0%, 100% { opacity: 1; }
@@ -586,6 +675,10 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
                         <p>Neural Sign Detection v2.0</p>
                     </div>
                     
+                    <div class="camera-panel" id="camera-panel" style="display: none;">
+                        <img id="camera-stream" alt="Camera">
+                    </div>
+                    
                     <div class="status-bar">
                         <div class="status-item">
                             <div class="status-label">Status</div>
@@ -599,6 +692,10 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
                             <div class="status-label">Current Word</div>
                             <div class="status-value" id="current-word">-</div>
                         </div>
+                        <div class="status-item">
+                            <div class="status-label">Detected</div>
+                            <div class="status-value" id="detected-letter">-</div>
+                        </div>
                     </div>
                     
                     <div class="game-area" id="game-area">
@@ -612,6 +709,9 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
                             <button class="btn-primary" onclick="startDefaultGame()">
                                 Start (HELLO)
                             </button>
+                            <button class="btn-primary" onclick="startSpelling()">
+                                Free Spell
+                            </button>
                             <button class="btn-warning" onclick="resetGame()">
                                 Reset Game
                             </button>
@@ -623,6 +723,14 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
                             <button class="btn-success" onclick="startCustomGame()" style="width: 100%;">
                                 Start Custom Word
                             </button>
+                            <button class="btn-primary" onclick="startVersusGame()" style="width: 100%; margin-top: 12px;">
+                                2 Players (Custom Word or HELLO)
+                            </button>
+                        </div>
+                        
+                        <div class="latency-panel">
+                            <div class="target-letter-label">Time to accept per letter</div>
+                            <table class="latency-heatmap" id="latency-heatmap"></table>
                         </div>
                     </div>
                 </div>
@@ -669,15 +777,61 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
                             .then(state => {
                                 currentGameState = state;
                                 
+                                // Without a camera window (--headless) the camera is shown here
+                                const stream = document.getElementById('camera-stream');
+                                if (state.headless && !stream.getAttribute('src')) {
+                                    stream.src = '/api/stream';
+                                    document.getElementById('camera-panel').style.display = 'block';
+                                }
+                                
                                 // Update status bar
                                 document.getElementById('game-status').textContent = state.active ? 'Playing' : 'Ready';
                                 document.getElementById('progress').textContent = state.completed + '/' + state.total;
                                 document.getElementById('current-word').textContent = state.word || '-';
+                                document.getElementById('detected-letter').textContent =
+                                    state.letter ? state.letter + ' ' + Math.round(state.confidence * 100) + '%' : '-';
                                 
                                 // Update game area
                                 const gameArea = document.getElementById('game-area');
                                 
-                                if (state.active && state.word) {
+                                if (state.mode === 'versus' && state.word) {
+                                    let html = '';
+                                    state.players.forEach((player, p) => {
+                                        html += '<div class="word-display">';
+                                        html += '<div class="target-letter-label">Player ' + (p + 1) + (player.present ? '' : ' (show a hand to join)') + '</div>';
+                                        html += '<div class="word-letters">';
+                                        for (let i = 0; i < state.word.length; i++) {
+                                            let className = 'letter-box';
+                                            if (i < player.progress) {
+                                                className += ' completed';
+                                            } else if (i === player.progress) {
+                                                className += ' current';
+                                            }
+                                            html += '<div class="' + className + '">' + state.word[i] + '</div>';
+                                        }
+                                        html += '</div></div>';
+                                    });
+                                    if (state.winner !== null) {
+                                        html += '<div class="message success">🏆 Player ' + (state.winner + 1) + ' wins!</div>';
+                                    }
+                                    gameArea.innerHTML = html;
+                                } else if (state.active && state.mode === 'spell') {
+                                    const best = state.spelling.prefixes.length ? state.spelling.prefixes[0].prefix : '';
+                                    let html = '<div class="word-display">';
+                                    html += '<div class="target-letter-label">Spelling (lower your hand to finish a word):</div>';
+                                    html += '<div class="word-letters">';
+                                    for (let i = 0; i < best.length; i++) {
+                                        html += '<div class="letter-box current">' + best[i] + '</div>';
+                                    }
+                                    html += '</div>';
+                                    html += '<div class="target-letter-label">';
+                                    html += state.spelling.prefixes.slice(1).map(h => h.prefix || '-').join(' &middot; ');
+                                    html += '</div></div>';
+                                    if (state.spelling.words.length) {
+                                        html += '<div class="message success">' + state.spelling.words.join(' ') + '</div>';
+                                    }
+                                    gameArea.innerHTML = html;
+                                } else if (state.active && state.word) {
                                     let html = '<div class="word-display">';
                                     html += '<div class="word-letters">';
                                     
@@ -730,12 +884,57 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
                             });
                     }
                     
+                    function startVersusGame() {
+                        const word = document.getElementById('custom-word').value.trim().toUpperCase() || 'HELLO';
+                        if (!/^[A-Z]+$/.test(word)) {
+                            alert('Please enter only letters!');
+                            return;
+                        }
+                        fetch('/api/versus/' + word)
+                            .then(response => response.json())
+                            .then(() => {
+                                document.getElementById('custom-word').value = '';
+                                updateUI();
+                            });
+                    }
+                    
+                    function startSpelling() {
+                        fetch('/api/spell')
+                            .then(response => response.json())
+                            .then(() => updateUI());
+                    }
+                    
                     function resetGame() {
                         fetch('/api/reset')
                             .then(response => response.json())
                             .then(() => updateUI());
                     }
                     
+                    function updateLatency() {
+                        fetch('/api/latency')
+                            .then(response => response.json())
+                            .then(latency => {
+                                const edges = latency.edges_ms;
+                                const letters = Object.keys(latency.letters).sort();
+                                let html = '<tr><th></th>';
+                                edges.forEach(edge => { html += '<th>&le;' + edge + 'ms</th>'; });
+                                html += '<th>&gt;' + edges[edges.length - 1] + 'ms</th><th>wrong</th></tr>';
+                                letters.forEach(letter => {
+                                    const stats = latency.letters[letter];
+                                    const peak = Math.max(1, ...stats.accept);
+                                    html += '<tr><th>' + letter + '</th>';
+                                    stats.accept.forEach(count => {
+                                        // Cell intensity: share of this letter's most common bin
+                                        const alpha = count ? 0.15 + 0.85 * count / peak : 0;
+                                        html += '<td style="background: rgba(250, 99, 34, ' + alpha.toFixed(2) + ')">' + (count || '') + '</td>';
+                                    });
+                                    html += '<td>' + (stats.wrong_accepts || '') + '</td></tr>';
+                                });
+                                document.getElementById('latency-heatmap').innerHTML = letters.length ? html : '';
+                            })
+                            .catch(() => {});
+                    }
+                    
                     // Allow Enter key to submit custom word
                     document.getElementById('custom-word').addEventListener('keypress', function(e) {
                         if (e.key === 'Enter') {
@@ -749,6 +948,8 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
                     // Update UI every 200ms
                     setInterval(updateUI, 200);
                     updateUI();
+                    setInterval(updateLatency, 2000);
+                    updateLatency();
                 </script>
             </body>
             </html>
@@ -763,10 +964,24 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
             
             state = {
                 'active': game_active,
+                'mode': game_mode,
                 'word': current_word,
                 'current_index': current_letter_index,
                 'completed': len(completed_letters),
-                'total': len(current_word) if current_word else 0
+                'total': len(current_word) if current_word else 0,
+                'letter': detected_letter,
+                'confidence': round(detected_confidence, 3),
+                'custom': custom_mailbox.latest()[1],
+                'headless': headless,
+                'players': [
+                    {'present': track is not None, 'progress': progress}
+                    for track, progress in zip(player_tracks, player_progress)
+                ],
+                'winner': versus_winner,
+                'spelling': {
+                    'prefixes': [{'prefix': prefix, 'p': round(p, 3)} for prefix, p in spelling_prefixes],
+                    'words': spelled_words[-10:]
+                }
             }
             
             import json
@@ -783,6 +998,207 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(b'{"status": "ok"}')
             
+        elif self.path.startswith('/api/versus/'):
+            # Start a two-player game with word from URL
+            word = self.path.replace('/api/versus/', '').upper()
+            if word and word.isalpha():
+                word_input_result = 'VERSUS:' + word
+            
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            self.wfile.write(b'{"status": "ok"}')
+            
+        elif self.path == '/api/spell':
+            # Switch to free-spelling mode
+            word_input_result = 'SPELL'
+            
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            self.wfile.write(b'{"status": "ok"}')
+            
+        elif self.path == '/api/cameras':
+            # Per-camera worker throughput (multi-camera mode only)
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            
+            import json
+            summary = camera_supervisor.summary() if camera_supervisor else {'workers': [], 'total_fps': 0.0}
+            self.wfile.write(json.dumps(summary).encode())
+            
+        elif self.path == '/api/metrics':
+            # Runtime counters/timings, including motion gate decisions
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            
+            import json
+            snapshot = metrics.snapshot()
+            decisions = motion_gate.decisions
+            frames = sum(decisions.values())
+            snapshot['gate'] = {
+                'threshold': motion_gate.threshold,
+                'force_every': motion_gate.force_every,
+                'decisions': dict(decisions),
+                'skip_ratio': decisions['skipped'] / frames if frames else 0.0,
+            }
+            self.wfile.write(json.dumps(snapshot).encode())
+            
+        elif self.path == '/api/model' or self.path.startswith('/api/model/reload'):
+            # Active classifier version; /api/model/reload[/N] loads the newest (or version N) in the background
+            if self.path.startswith('/api/model/reload'):
+                version = self.path.replace('/api/model/reload', '').strip('/')
+                engine.models.request_reload(int(version) if version.isdigit() else None)
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            
+            import json
+            self.wfile.write(json.dumps(engine.models.status()).encode())
+            
+        elif self.path == '/api/shadow' or self.path == '/api/shadow/export':
+            # Candidate-vs-production agreement (--shadow); /api/shadow/export also writes it to a JSON file
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            
+            import json
+            shadow = engine.shadow
+            if shadow is None:
+                self.wfile.write(b'{"enabled": false}')
+            elif self.path == '/api/shadow/export':
+                path = f"shadow_v{shadow.candidate.version}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+                shadow.export(path)
+                self.wfile.write(json.dumps({'enabled': True, 'exported': path}).encode())
+            else:
+                self.wfile.write(json.dumps(dict(shadow.report(), enabled=True)).encode())
+            
+        elif self.path == '/api/custom' or self.path.startswith(('/api/custom/record/', '/api/custom/remove/')):
+            # User-recorded signs; /api/custom/record/NAME records the next few seconds of one hand as NAME
+            templates = engine.templates
+            # The name is the rest of the path, percent-decoded (THANK%20YOU) and without any query string
+            path = unquote(urlparse(self.path).path)
+            if templates is not None and path.startswith('/api/custom/record/'):
+                templates.start_recording(path[len('/api/custom/record/'):].strip().upper())
+            elif templates is not None and path.startswith('/api/custom/remove/'):
+                templates.remove(path[len('/api/custom/remove/'):].strip().upper())
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            
+            import json
+            status = dict(templates.status(), enabled=True) if templates is not None else {'enabled': False}
+            self.wfile.write(json.dumps(status).encode())
+            
+        elif self.path == '/api/calibrate' or self.path.startswith('/api/calibrate/'):
+            # Per-user calibration: start prompts through the letters, skip/finish move on, reset drops the adapter
+            action = self.path.replace('/api/calibrate', '').strip('/')
+            if action == 'start' and engine.models.current is not None:
+                calibration = CalibrationSession(
+                    engine.models.current, on_ready=lambda adapter: setattr(engine, 'adapter', adapter), metrics=metrics
+                )
+            elif action == 'skip' and calibration is not None:
+                calibration.skip()
+            elif action == 'finish' and calibration is not None:
+                calibration.finish()
+            elif action == 'reset':
+                calibration = None
+                engine.adapter = None
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            
+            import json
+            status = calibration.status() if calibration is not None else {'state': None}
+            status['adapter_active'] = engine.adapter is not None and engine.adapter.model is engine.models.current
+            self.wfile.write(json.dumps(status).encode())
+            
+        elif self.path.startswith('/api/events'):
+            # Recent events, oldest first: /api/events?type=mismatch&since=SEQ&limit=N
+            query = parse_qs(urlparse(self.path).query)
+            since = query.get('since', ['0'])[0]
+            limit = query.get('limit', ['100'])[0]
+            records = events.recent(
+                query.get('type', [None])[0],
+                since=int(since) if since.isdigit() else 0,
+                limit=int(limit) if limit.isdigit() else 100,
+            )
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            
+            import json
+            self.wfile.write(json.dumps({'events': records, 'dropped': events.dropped, 'suppressed': events.suppressed}).encode())
+            
+        elif self.path.startswith('/api/stats'):
+            # Persistent statistics: /api/stats/letters[?player=NAME], /api/stats/players, /api/stats/days[?days=N]
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            view = parsed.path.replace('/api/stats', '').strip('/') or 'letters'
+            if stats is None:
+                rows = None
+            elif view == 'players':
+                rows = stats.per_player()
+            elif view == 'days':
+                days = query.get('days', ['30'])[0]
+                rows = stats.per_day(int(days) if days.isdigit() else 30)
+            else:
+                rows = stats.per_letter(query.get('player', [None])[0])
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            
+            import json
+            self.wfile.write(json.dumps({'enabled': stats is not None, 'rows': rows}).encode())
+            
+        elif self.path == '/api/latency' or self.path == '/api/latency/reset':
+            # Per-letter time to first hit / to accept histograms and wrong classes; /reset clears them
+            if self.path == '/api/latency/reset':
+                engine.latency.reset()
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            
+            import json
+            self.wfile.write(json.dumps(engine.latency.snapshot()).encode())
+            
+        elif self.path == '/api/recording' or self.path == '/api/recording/dump':
+            # Rolling session buffer; /api/recording/dump writes it (plus two more seconds) to recordings/
+            status = {'enabled': recorder is not None}
+            if recorder is not None:
+                if self.path == '/api/recording/dump':
+                    status['writing'] = recorder.dump(post_seconds=2.0)
+                status.update(recorder.status())
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            
+            import json
+            self.wfile.write(json.dumps(status).encode())
+            
+        elif self.path == '/api/stream':
+            # MJPEG stream of the displayed frames; each client encodes on its own server thread
+            self.send_response(200)
+            self.send_header('Content-type', 'multipart/x-mixed-replace; boundary=frame')
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            
+            seq = 0
+            try:
+                while camera_running:
+                    slot = display_mailbox.wait(seq, timeout=1.0)
+                    if slot is None:
+                        continue
+                    seq, frame = slot
+                    ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
+                    if not ok:
+                        continue
+                    self.wfile.write(b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + jpeg.tobytes() + b'\r\n')
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # Client closed the page
+            
         elif self.path == '/api/reset':
             # Reset game
             word_input_result = 'RESET'
@@ -796,108 +1212,117 @@ class WebConsoleHandler(BaseHTTPRequestHandler):
             self.send_response(404)
             self.end_headers()
 
-def print_result(result, output_image, timestamp_ms):
+def handle_frame_result(result):
+    """Feed one engine FrameResult to the game (MediaPipe callback thread, or the camera thread for gate replays)"""
     try:
-        landmarks_ls = result.hand_world_landmarks
-        handedness_ls = result.handedness
-        global predictions
-        global drawn_frame
-        global tracked_hand_index
-        global no_hand_counter
-        predictions = []
-
-        if len(landmarks_ls) == 0:
-            # No hands detected
-            no_hand_counter += 1
-            if no_hand_counter >= NO_HAND_THRESHOLD:
-                tracked_hand_index = None
-                drawn_frame = np.zeros_like(output_image.numpy_view())
-            return
+        power_state.observe(bool(result.hands))
+        hands = tuple(hand[:4] for hand in result.hands)
+        if result.primary is None:
+            prediction_mailbox.publish((None, 0, None, 0.0))
+            custom_mailbox.publish(None)
+            update_spelling(None)
         else:
-            no_hand_counter = 0
+            # The primary hand (oldest track in view) drives the single-player modes
+            prediction_mailbox.publish(result.primary[:4])
+            custom_mailbox.publish(result.primary.custom)
+            session = calibration
+            if session is not None and len(result.hands) == 1:
+                session.observe(result.primary.features)
+            update_spelling(result.primary.probs)
+        hands_mailbox.publish((hands, result.live_ids))
+    except Exception as e:
+        events.emit("error", f"Error in handle_frame_result: {e}", level="error", where="handle_frame_result")
 
-        # If only one hand is detected, always use that hand
-        if len(landmarks_ls) == 1:
-            tracked_hand_index = handedness_ls[0][0].index
-            main_hand_idx = 0
-        else:
-            # Multiple hands detected
-            # If no hand is tracked, pick the first detected hand
-            if tracked_hand_index is None:
-                tracked_hand_index = handedness_ls[0][0].index
+def update_spelling(probs):
+    """Feed one frame into the free-spelling decoder (runs on the MediaPipe callback thread)"""
+    session = spell_session
+    if game_mode != "spell" or session is None:
+        return
+    
+    decoder = session['decoder']
+    if probs is not None and len(probs) != len(decoder.trie.alphabet):
+        return  # Classified by the previous model while a hot reload swapped the label set
+    if probs is None:
+        word = decoder.step_blank()
+        if word is not None:
+            session['words'].append(word)
+    else:
+        decoder.step(probs)
+    spelling_mailbox.publish({'prefixes': decoder.hypotheses(3), 'words': tuple(session['words'])})
 
-            # Find the hand with the tracked index
-            main_hand_idx = None
-            for idx, handedness in enumerate(handedness_ls):
-                if handedness[0].index == tracked_hand_index:
-                    main_hand_idx = idx
-                    break
+def load_models():
+    """Load the letter classifier and scaler and index the lexicon over its letters (startup task)"""
+    with startup_profile.step("import joblib/sklearn"):
+        preload(joblib)
+    engine.models.on_swap = rebuild_spell_trie
+    engine.load_classifier()
 
-            # If tracked hand not found, switch to the first available hand
-            if main_hand_idx is None:
-                tracked_hand_index = handedness_ls[0][0].index
-                main_hand_idx = 0
+def rebuild_spell_trie(model):
+    """Index the lexicon over a newly active model's letters (startup, then on every hot reload)"""
+    global spell_trie
+    if spell_trie is not None and spell_trie.alphabet == [str(label).upper() for label in model.labels]:
+        return
+    spell_trie = PrefixTrie.from_file(DEFAULT_LEXICON_PATH, model.labels)
+    session = spell_session
+    if session is not None:
+        # The running decoder is sized to the old alphabet; the word in progress starts over
+        session['decoder'] = LexiconBeamDecoder(spell_trie)
 
-        if main_hand_idx is not None:
-            landmarks = np.array([[landmark.x, landmark.y, landmark.z] for landmark in landmarks_ls[main_hand_idx]]).flatten()
-            handedness = handedness_ls[main_hand_idx][0].index
-            data = scaler.transform(np.array([[handedness] + landmarks.tolist()]))
-            prediction = classifier.predict(data)
-            predictions.append(prediction[0])
+def open_camera(reprobe=False):
+    """Open the default camera with cross-platform support (startup task)"""
+    with startup_profile.step("import cv2"):
+        preload(cv2)
+    cam, camera_fps, width, height, backend_name = initialize_camera(camera_index=0, target_fps=60, reprobe=reprobe)
+    print(f"Camera configured:")
+    print(f"  Resolution: {width}x{height}")
+    print(f"  FPS: {camera_fps}")
+    print(f"  Backend: {backend_name}")
+    return cam, camera_fps
 
-            # Send prediction to main thread via queue (thread-safe)
-            try:
-                prediction_queue.put_nowait(prediction[0])
-            except queue.Full:
-                # If queue is full, remove oldest prediction and add new one
-                try:
-                    prediction_queue.get_nowait()
-                    prediction_queue.put_nowait(prediction[0])
-                except:
-                    pass
+def create_landmarker():
+    """Create the engine's HandLandmarker and run one warm-up inference on a blank frame (startup task)"""
+    with startup_profile.step("import mediapipe"):
+        preload(mp)
+    with startup_profile.step("import drawing utils"):
+        preload(utils)
+    with startup_profile.step("landmarker create + warm-up"):
+        engine.create_landmarker()
 
-            # Create a HandLandmarkerResult-like object with only the main hand
-            class SingleHandResult:
-                def __init__(self, hand_landmarks, handedness):
-                    self.hand_landmarks = [hand_landmarks]
-                    self.handedness = [handedness]
-                    self.hand_world_landmarks = []
-            main_result = SingleHandResult(result.hand_landmarks[main_hand_idx], result.handedness[main_hand_idx])
-            drawn_frame = draw_landmarks_on_image(output_image.numpy_view(), main_result, predictions)
-        else:
-            # Tracked hand not found, do not update drawn_frame
-            pass
+def load_instruction_image():
+    """Read the hand sign instruction image (startup task; shown from the main thread)"""
+    image_path = find_instruction_image()
+    if not image_path:
+        return None, None
+    try:
+        return image_path, cv2.imread(image_path)
     except Exception as e:
-        print(f"Error in print_result: {e}")
+        print(f"Could not load instruction image: {e}")
+        return image_path, None
 
-def run_camera_feed():
-    """Run the camera feed in a separate thread"""
-    global camera_running, frame_queue, camera_ready
-    
-    # Setup MediaPipe HandLandmarker
-    options = mp.tasks.vision.HandLandmarkerOptions(
-        base_options=mp.tasks.BaseOptions(model_asset_path="./models/hand_landmarker.task"),
-        running_mode=mp.tasks.vision.RunningMode.LIVE_STREAM,
-        num_hands=2,
-        result_callback=print_result,
-        min_hand_detection_confidence=0.5,
-        min_hand_presence_confidence=0.5,
-        min_tracking_confidence=0.5,
-    )
+def open_web_console():
+    """Open the web console in the browser as soon as the server is bound (startup task)"""
+    server_ready.wait(timeout=5.0)
+    if word_input_server is not None:
+        webbrowser.open(f'http://localhost:{web_console_port}')
 
-    # Initialize camera with cross-platform support
-    try:
-        cam, camera_fps, width, height, backend_name = initialize_camera(camera_index=0, target_fps=60)
-        print(f"Camera configured:")
-        print(f"  Resolution: {width}x{height}")
-        print(f"  FPS: {camera_fps}")
-        print(f"  Backend: {backend_name}")
-    except RuntimeError as e:
-        print(f"Error: {e}")
-        return
+def draw_attract_frame(frame):
+    """Dimmed, mirrored frame with a prompt, shown while the pipeline is idle"""
+    attract = cv2.flip(frame, 1) // 3
+    cv2.putText(attract, "Show a hand to start", (20, attract.shape[0] // 2), cv2.FONT_HERSHEY_SIMPLEX, 1.2,
+                (255, 255, 255), 2)
+    return attract
 
+def run_camera_feed(cam, camera_fps):
+    """Run the camera feed in a separate thread"""
+    global camera_running, camera_ready
+    
     timestamp = 0
     frame_count = 0
+    
+    # Idle mode: presence detection on a tiny frame, preallocated once
+    idle_width, idle_height = power_state.idle_size
+    idle_frame = np.empty((idle_height, idle_width, 3), dtype=np.uint8)
+    attract_shown = False
 
     # FPS measurement variables
     fps_start_time = time.time()
@@ -913,13 +1338,18 @@ def run_camera_feed():
     camera_running = True
     camera_ready.set()  # Signal that camera is ready
 
-    with HandLandmarker.create_from_options(options) as landmarker:
+    with engine:
         while cam.isOpened() and camera_running:
+            # Idle: sleep between presence polls instead of reading every frame; a hand wakes this early
+            if power_state.state == IDLE and not power_state.poll_due():
+                power_state.wait_for_poll(timeout=0.5)
+                continue
+            
             loop_start = time.time()
             
             ret, frame = cam.read()
             if not ret:
-                print("Failed to read frame from camera")
+                events.emit("camera_error", "Failed to read frame from camera", level="error")
                 break
 
             # Generate timestamp in milliseconds for MediaPipe
@@ -927,16 +1357,41 @@ def run_camera_feed():
             fps_frame_count += 1
             timestamp = int(frame_count * (1000.0 / camera_fps))
             
-            # Process every frame (no interval throttling)
-            mp_start = time.time()
-            mp_img = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            landmarker.detect_async(mp_img, timestamp)
-            mp_time = (time.time() - mp_start) * 1000  # Convert to ms
-            mediapipe_times.append(mp_time)
+            if power_state.state == IDLE:
+                # Presence-only detection; nothing is drawn or queued except the attract screen once
+                cv2.resize(frame, power_state.idle_size, dst=idle_frame, interpolation=cv2.INTER_AREA)
+                engine.submit(idle_frame, timestamp)
+                power_state.polled()
+                if not attract_shown:
+                    frame_mailbox.publish(draw_attract_frame(frame))
+                    attract_shown = True
+                    events.emit("power", "No hands for a while: idle mode", state="idle")
+                continue
+            if attract_shown:
+                # Just woke up: the gate's reference is stale
+                attract_shown = False
+                motion_gate.reset()
+                events.emit("power", "Hand detected: active mode", state="active")
+            power_state.active_frame()
+            
+            # Only frames that changed since the last detection go to MediaPipe; static ones reuse its landmarks
+            gate_start = time.perf_counter()
+            detect = motion_gate.check(frame)
+            metrics.observe("gate_ms", (time.perf_counter() - gate_start) * 1000)
+            if detect:
+                mp_start = time.time()
+                engine.submit(frame, timestamp)
+                mp_time = (time.time() - mp_start) * 1000  # Convert to ms
+                mediapipe_times.append(mp_time)
+                metrics.observe("detect_submit_ms", mp_time)
+            else:
+                engine.replay_last()
 
             # Add overlay
-            if drawn_frame.size > 0:
-                frame = add_transparent_image(frame, drawn_frame)
+            _, drawn_frame = engine.overlays.latest()
+            # Overlays drawn on idle-mode frames are smaller than the camera frame; skip them
+            if drawn_frame.shape == frame.shape:
+                frame = utils.add_transparent_image(frame, drawn_frame)
 
             # Calculate FPS every second
             current_time = time.time()
@@ -948,26 +1403,23 @@ def run_camera_feed():
                 # Print performance metrics
                 avg_mp_time = np.mean(mediapipe_times[-30:]) if mediapipe_times else 0
                 avg_total_time = np.mean(processing_times[-30:]) if processing_times else 0
-                print(f"FPS: {display_fps:.1f} | MediaPipe: {avg_mp_time:.1f}ms | Total: {avg_total_time:.1f}ms")
+                gate = motion_gate.decisions
+                events.emit("fps", f"FPS: {display_fps:.1f} | MediaPipe: {avg_mp_time:.1f}ms | Total: {avg_total_time:.1f}ms | "
+                            f"Gate: {gate['skipped']} skipped / {gate['motion'] + gate['forced']} detected",
+                            fps=round(display_fps, 1), detect_ms=round(float(avg_mp_time), 2), loop_ms=round(float(avg_total_time), 2))
+                metrics.set_gauge("camera_fps", display_fps)
             
             # Draw FPS on frame
             cv2.putText(frame, f"FPS: {display_fps:.1f}", (10, frame.shape[0] - 10), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
 
-            # Put frame in queue for main thread to display
-            try:
-                frame_queue.put_nowait(cv2.flip(frame, 1))
-            except queue.Full:
-                # If queue is full, remove oldest frame and add new one
-                try:
-                    frame_queue.get_nowait()
-                    frame_queue.put_nowait(cv2.flip(frame, 1))
-                except:
-                    pass
+            # Publish frame for main thread to display (replaces any frame not yet shown)
+            frame_mailbox.publish(cv2.flip(frame, 1))
 
             # Track total loop time
             loop_time = (time.time() - loop_start) * 1000
             processing_times.append(loop_time)
+            metrics.observe("loop_ms", loop_time)
 
     print("\n" + "="*60)
     print("CAMERA PERFORMANCE SUMMARY:")
@@ -975,40 +1427,209 @@ def run_camera_feed():
     print(f"  Avg MediaPipe time: {np.mean(mediapipe_times):.1f}ms")
     print(f"  Avg Total loop time: {np.mean(processing_times):.1f}ms")
     print(f"  Max loop time: {np.max(processing_times):.1f}ms")
+    gate = motion_gate.decisions
+    print(f"  Motion gate: {gate['skipped']} skipped, {gate['motion']} motion, {gate['forced']} forced")
     print("="*60)
 
     cam.release()
     camera_running = False
     print("Camera feed stopped")
 
+def run_camera_supervisor(sources):
+    """Feed the game from one worker process per camera instead of the in-process camera feed"""
+    global camera_running, camera_supervisor
+    
+    camera_supervisor = CameraSupervisor(sources)
+    camera_supervisor.start()
+    print(f"Starting {len(sources)} camera worker(s): {', '.join(str(source) for source in sources)}")
+    camera_running = True
+    camera_ready.set()
+    
+    # Newest hands per camera; track IDs are namespaced by camera so acceptances stay distinct
+    camera_hands = {}
+    camera_live = {}
+    # Each worker captures into its own shared-memory ring; the first camera is the one shown
+    frame_rings = {}
+    display_camera = 0
+    while camera_running and camera_supervisor.running:
+        message = camera_supervisor.poll(timeout=0.5)
+        if message is None:
+            continue
+        if message["type"] == "ready":
+            events.emit("camera_ready", f"Camera {message['source']} ready: {message['width']}x{message['height']} "
+                        f"@ {message['fps']} FPS ({message['backend']}), cores {message['cores']}",
+                        worker=message['worker'], source=str(message['source']))
+            # A restarted worker comes back with a new ring
+            if message["worker"] in frame_rings:
+                frame_rings.pop(message["worker"]).close()
+            frame_rings[message["worker"]] = SharedFrameRing.attach(message["frame_ring"])
+            continue
+        if message["type"] == "error":
+            events.emit("camera_error", f"Camera worker {message['worker']} error: {message['error']}", level="error",
+                        worker=message['worker'], error=message['error'])
+            continue
+        if message["type"] != "frame":
+            continue
+        
+        camera = message["worker"]
+        ring = frame_rings.get(camera)
+        if camera == display_camera and ring is not None:
+            latest = ring.latest()
+            if latest is not None:
+                seq, view = latest
+                # The flip is the only copy; drop it if the worker lapped the ring meanwhile
+                mirrored = cv2.flip(view, 1)
+                if ring.is_current(seq):
+                    frame_mailbox.publish(mirrored)
+        camera_hands[camera] = [
+            ((camera, hand["track_id"]), hand["accept_key"], hand["letter"], hand["confidence"], hand["probs"])
+            for hand in message["hands"]
+        ]
+        camera_live[camera] = [(camera, track_id) for track_id in message["live_ids"]]
+        hands = [hand for camera_id in sorted(camera_hands) for hand in camera_hands[camera_id]]
+        live_ids = tuple(track for camera_id in sorted(camera_live) for track in camera_live[camera_id])
+        
+        if hands:
+            primary = min(hands, key=lambda hand: hand[0])
+            update_spelling(np.array(primary[4]))
+            prediction_mailbox.publish(primary[:4])
+        else:
+            update_spelling(None)
+            prediction_mailbox.publish((None, 0, None, 0.0))
+        hands_mailbox.publish((tuple(hand[:4] for hand in hands), live_ids))
+    
+    camera_supervisor.stop()
+    for ring in frame_rings.values():
+        ring.close()
+    print("\n" + "="*60)
+    print("CAMERA WORKERS SUMMARY:")
+    for worker in camera_supervisor.summary()["workers"]:
+        print(f"  [{worker['source']}] {worker['fps']:.1f} FPS | detect {worker['detect_ms']:.1f}ms | restarts {worker['restarts']}")
+    print("="*60)
+    camera_running = False
+    print("Camera workers stopped")
+
 def create_game_interface():
     """Deprecated - now using web console"""
     pass
 
 def process_predictions():
-    """Process predictions from the queue on the main thread"""
-    global current_word, current_letter_index, completed_letters, game_active
+    """Process the newest accepted letter from the mailbox on the main thread"""
+    global current_word, current_letter_index, completed_letters, game_active, last_prediction_seq
+    global spelled_words, spelling_prefixes, last_spelling_seq
+    global last_accept, detected_letter, detected_confidence
     
-    try:
-        while not prediction_queue.empty():
-            prediction = prediction_queue.get_nowait()
+    if game_mode == "versus":
+        process_versus()
+    
+    if game_mode == "spell":
+        slot = spelling_mailbox.poll(last_spelling_seq)
+        if slot is not None:
+            last_spelling_seq, spelling = slot
+            spelling_prefixes = spelling['prefixes']
+            for word in spelling['words'][len(spelled_words):]:
+                events.emit("spelled", f"✍️  Spelled: {word}", word=word)
+            spelled_words = list(spelling['words'])
+    
+    slot = prediction_mailbox.poll(last_prediction_seq)
+    if slot is None:
+        return
+    last_prediction_seq, (track_id, accept_key, letter, confidence) = slot
+    detected_letter, detected_confidence = letter, confidence
+    
+    # Only a fresh acceptance counts; a held sign is accepted once
+    if (track_id, accept_key) == last_accept:
+        return
+    last_accept = (track_id, accept_key)
+    if game_mode != "word":
+        return
+    
+    if game_active and letter and current_letter_index < len(current_word):
+        target_letter = current_word[current_letter_index]
+        if letter == target_letter.upper():
+            # Correct letter detected
+            completed_letters.add(current_letter_index)
+            current_letter_index += 1
+            record_attempt(0, target_letter.upper(), letter)
+            engine.latency.set_target(current_word[current_letter_index] if current_letter_index < len(current_word) else None)
+            events.emit("correct", f"✅ Correct! '{letter}' detected ({confidence:.2f}). Progress: {len(completed_letters)}/{len(current_word)}",
+                        letter=letter, confidence=round(confidence, 3), progress=len(completed_letters), word=current_word)
             
-            if game_active and prediction and current_letter_index < len(current_word):
-                target_letter = current_word[current_letter_index]
-                if prediction.upper() == target_letter.upper():
-                    # Correct letter detected
-                    completed_letters.add(current_letter_index)
-                    current_letter_index += 1
-                    print(f"✅ Correct! '{prediction}' detected. Progress: {len(completed_letters)}/{len(current_word)}")
-                    
-                    if current_letter_index >= len(current_word):
-                        print(f"🎉 Congratulations! You've completed the word: {current_word}")
-                        game_active = False
-                else:
-                    # Wrong letter detected
-                    print(f"❌ Detected '{prediction}' but expected '{target_letter}'")
-    except queue.Empty:
-        pass
+            if current_letter_index >= len(current_word):
+                events.emit("word_completed", f"🎉 Congratulations! You've completed the word: {current_word}", word=current_word)
+                game_active = False
+                end_stats_sessions(winner=0)
+        else:
+            # Wrong letter accepted
+            record_attempt(0, target_letter.upper(), letter)
+            events.emit("mismatch", f"❌ Detected '{letter}' but expected '{target_letter}'",
+                        letter=letter, expected=target_letter, confidence=round(confidence, 3))
+
+def process_versus():
+    """Advance both players in two-player mode from the per-hand acceptances"""
+    global game_active, versus_winner, last_hands_seq
+    
+    slot = hands_mailbox.poll(last_hands_seq)
+    if slot is None:
+        return
+    last_hands_seq, (hands, live_ids) = slot
+    
+    # Free players whose hand left, then seat new hands in order of appearance
+    for player in range(len(player_tracks)):
+        if player_tracks[player] is not None and player_tracks[player] not in live_ids:
+            player_tracks[player] = None
+    for track_id, accept_key, letter, confidence in hands:
+        if track_id not in player_tracks and None in player_tracks:
+            player = player_tracks.index(None)
+            player_tracks[player] = track_id
+            # A letter already held when the hand is seated does not count
+            player_last_accept[player] = accept_key
+            events.emit("player_joined", f"🙋 Player {player + 1} joined", player=player + 1)
+    
+    for track_id, accept_key, letter, confidence in hands:
+        if track_id not in player_tracks:
+            continue
+        player = player_tracks.index(track_id)
+        if accept_key == player_last_accept[player]:
+            continue
+        player_last_accept[player] = accept_key
+        if not game_active or letter is None:
+            continue
+        record_attempt(player, current_word[player_progress[player]], letter)
+        if letter == current_word[player_progress[player]]:
+            player_progress[player] += 1
+            events.emit("player_correct", f"✅ Player {player + 1}: '{letter}'. Progress: {player_progress[player]}/{len(current_word)}",
+                        player=player + 1, letter=letter, progress=player_progress[player], word=current_word)
+            if player_progress[player] >= len(current_word):
+                versus_winner = player
+                game_active = False
+                end_stats_sessions(winner=player)
+                events.emit("player_won", f"🏆 Player {player + 1} wins the word: {current_word}", player=player + 1, word=current_word)
+
+def start_stats_sessions(mode, word, players):
+    """End any open statistics sessions and open one per player (only queues rows)"""
+    global stats_sessions
+    end_stats_sessions()
+    if stats is not None:
+        stats_sessions = [(stats.start_session(player, mode, word), player) for player in players]
+    letter_started_at[:] = [time.monotonic()] * len(letter_started_at)
+
+def end_stats_sessions(winner=None):
+    """Close the open statistics sessions; the winner's slot is recorded as completed"""
+    global stats_sessions
+    if stats is not None:
+        for slot, (session_id, _) in enumerate(stats_sessions):
+            stats.end_session(session_id, completed=slot == winner)
+    stats_sessions = []
+
+def record_attempt(slot, target, detected):
+    """Queue one accepted letter for the statistics store; a correct one starts the clock for the next letter"""
+    now = time.monotonic()
+    if stats is not None and slot < len(stats_sessions):
+        session_id, player = stats_sessions[slot]
+        stats.record_attempt(session_id, player, target, detected, ms=(now - letter_started_at[slot]) * 1000)
+    if target == detected:
+        letter_started_at[slot] = now
 
 def check_word_input():
     """Check if word was submitted via web console"""
@@ -1020,73 +1641,186 @@ def check_word_input():
         
         if word == 'RESET':
             reset_game()
+        elif word == 'SPELL':
+            start_spelling_game()
+        elif word.startswith('VERSUS:'):
+            start_versus_game(word[len('VERSUS:'):])
         else:
             start_custom_game(word)
-            print(f"✅ Starting game with custom word: {word}")
+            events.emit("word_submitted", f"✅ Starting game with custom word: {word}", word=word)
 
 def start_game():
     """Start a new game with a default word"""
-    global current_word, current_letter_index, completed_letters, game_active
+    global current_word, current_letter_index, completed_letters, game_active, game_mode
+    game_mode = "word"
     current_word = "HELLO"  # Default word
     current_letter_index = 0
     completed_letters = set()
     game_active = True
-    print(f"Game started! Practice the word: {current_word}")
+    start_stats_sessions("word", current_word, [player_name])
+    engine.latency.set_target(current_word[0] if current_word else None)
+    events.emit("game_started", f"Game started! Practice the word: {current_word}", mode="word", word=current_word)
 
 def start_custom_game(word):
     """Start a new game with a custom word"""
+    global current_word, current_letter_index, completed_letters, game_active, game_mode
+    game_mode = "word"
+    current_word = word.upper()
+    current_letter_index = 0
+    completed_letters = set()
+    game_active = True
+    start_stats_sessions("word", current_word, [player_name])
+    engine.latency.set_target(current_word[0] if current_word else None)
+    events.emit("game_started", f"Game started! Practice the word: {current_word}", mode="word", word=current_word)
+
+def start_spelling_game():
+    """Start free-spelling mode, decoding words from the lexicon"""
     global current_word, current_letter_index, completed_letters, game_active
+    global game_mode, spell_session, spelled_words, spelling_prefixes
+    current_word = ""
+    current_letter_index = 0
+    completed_letters = set()
+    spelled_words = []
+    spelling_prefixes = []
+    spell_session = {'decoder': LexiconBeamDecoder(spell_trie), 'words': []}
+    game_mode = "spell"
+    game_active = True
+    start_stats_sessions("spell", None, [player_name])
+    engine.latency.set_target(None)
+    events.emit("game_started", f"Free spelling started! {spell_trie.n_words} words in the lexicon. Lower your hand to finish a word.",
+                mode="spell")
+
+def start_versus_game(word):
+    """Start a two-player race to spell the same word, one hand per player"""
+    global current_word, current_letter_index, completed_letters, game_active, game_mode
+    global player_progress, versus_winner
     current_word = word.upper()
     current_letter_index = 0
     completed_letters = set()
+    player_progress = [0, 0]
+    versus_winner = None
+    game_mode = "versus"
     game_active = True
-    print(f"Game started! Practice the word: {current_word}")
+    start_stats_sessions("versus", current_word, [f"{player_name} (P1)", f"{player_name} (P2)"])
+    engine.latency.set_target(None)  # timed against the primary hand only
+    events.emit("game_started", f"Two-player game started! First to sign: {current_word}", mode="versus", word=current_word)
 
 def reset_game():
     """Reset the game"""
-    global current_word, current_letter_index, completed_letters, game_active
+    global current_word, current_letter_index, completed_letters, game_active, game_mode, spell_session
     current_word = ""
     current_letter_index = 0
     completed_letters = set()
     game_active = False
-    print("Game reset. Press 's' to start a new game.")
+    game_mode = "word"
+    spell_session = None
+    end_stats_sessions()
+    engine.latency.set_target(None)
+    events.emit("game_reset", "Game reset. Press 's' to start a new game.")
 
 def enter_word_input_mode():
     """Deprecated - now handled by web console"""
     pass
 
+def render_camera_frame():
+    """
+    Draw the game overlay on the newest camera frame and hand it to the recorder and /api/stream (main thread).
+    
+    Returns:
+        The drawn frame, or None if nothing new has been published since the last one
+    """
+    global last_display_seq
+    
+    slot = frame_mailbox.poll(last_display_seq)
+    if slot is None:
+        return None
+    last_display_seq, frame = slot
+    
+    # Add game status overlay if game is active
+    if game_active and game_mode == "word" and current_letter_index < len(current_word):
+        # Add status text to frame
+        status_text = f"Target: {current_word[current_letter_index]}"
+        cv2.putText(frame, status_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        
+        # Add progress text
+        progress_text = f"Progress: {len(completed_letters)}/{len(current_word)}"
+        cv2.putText(frame, progress_text, (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    
+    if recorder is not None:
+        # Encoded on the recorder's thread; the frame is not drawn on after this
+        recorder.offer(frame)
+    display_mailbox.publish(frame)
+    return frame
+
 def update_camera_display():
     """Update camera display from main thread"""
-    global camera_running, frame_queue
-    
     if camera_running:
-        try:
-            # Get frame from queue
-            frame = frame_queue.get_nowait()
-            
-            # Add game status overlay if game is active
-            if game_active and current_letter_index < len(current_word):
-                # Add status text to frame
-                status_text = f"Target: {current_word[current_letter_index]}"
-                cv2.putText(frame, status_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-                
-                # Add progress text
-                progress_text = f"Progress: {len(completed_letters)}/{len(current_word)}"
-                cv2.putText(frame, progress_text, (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            
+        frame = render_camera_frame()
+        if frame is not None and not headless:
             cv2.imshow("Camera", frame)
-            
-            # Check for ESC key
-            if cv2.waitKey(1) & 0xFF == 27:
-                camera_running = False
-                return False
-        except queue.Empty:
-            pass
-    
+
+def request_shutdown(signum, frame):
+    """SIGTERM/SIGINT handler: let the main loop exit and clean up"""
+    global camera_running
+    events.emit("shutdown", f"Received {signal.Signals(signum).name}, shutting down", signal=signum)
+    camera_running = False
+
+def handle_key(key):
+    """React to a key pressed in a camera window: R dumps the recent session clip; returns False for ESC"""
+    if key == 27:
+        return False
+    if key in (ord('r'), ord('R')) and recorder is not None:
+        path = recorder.dump(post_seconds=2.0)
+        events.emit("recording", f"🎬 Writing the last {recorder.seconds:.0f}s to {path}", path=path)
     return True
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="ASL fingerspelling game")
+    parser.add_argument("--cameras", nargs="+", metavar="SOURCE",
+                        help="run one detection worker process per camera index or video file")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each import and initialization step took")
+    parser.add_argument("--idle-after", type=float, default=30.0, metavar="SECONDS",
+                        help="seconds without a hand before dropping to low-rate presence polling")
+    parser.add_argument("--reprobe", action="store_true",
+                        help="measure the camera's capture modes again instead of using the cached one")
+    parser.add_argument("--shadow", type=int, metavar="VERSION",
+                        help="evaluate archive/predictor_vVERSION beside the active model without using its answers")
+    parser.add_argument("--no-model-watch", action="store_true",
+                        help="do not pick up new predictor_vN versions from archive/ while running")
+    parser.add_argument("--event-log", default="events.jsonl", metavar="PATH",
+                        help="append game and camera events to this JSON-lines file ('' to keep them in memory only)")
+    parser.add_argument("--stats-db", default="stats.db", metavar="PATH",
+                        help="SQLite database for per-player statistics ('' to keep none)")
+    parser.add_argument("--player", default="guest",
+                        help="player name recorded with the statistics")
+    parser.add_argument("--record-seconds", type=float, default=20.0, metavar="SECONDS",
+                        help="length of the rolling session clip dumped with R or /api/recording/dump (0 to disable)")
+    parser.add_argument("--no-custom-signs", action="store_true",
+                        help="do not match user-recorded signs from custom_signs.npz")
+    parser.add_argument("--headless", action="store_true",
+                        help="open no windows or browser; play, watch (/api/stream) and monitor from the web console")
+    parser.add_argument("--host", default="localhost",
+                        help="address the web console binds to (e.g. 0.0.0.0 to reach a headless server remotely)")
+    return parser.parse_args()
+
 def main():
-    global camera_running, word_input_server
+    global camera_running, word_input_server, stats, player_name, recorder, headless
+    
+    args = parse_args()
+    headless = args.headless
+    if headless:
+        # Service managers stop us with SIGTERM; finish the loop so stats, recordings and logs are flushed
+        signal.signal(signal.SIGTERM, request_shutdown)
+        signal.signal(signal.SIGINT, request_shutdown)
+    power_state.idle_after = args.idle_after
+    events.path = args.event_log or None
+    events.start()
+    player_name = args.player
+    if args.stats_db:
+        stats = StatsStore(args.stats_db, metrics=metrics, events=events).start()
+    if args.record_seconds > 0:
+        recorder = SessionRecorder(seconds=args.record_seconds, metrics=metrics).start()
     
     # Print platform information
     platform_info = get_platform_info()
@@ -1102,53 +1836,97 @@ def main():
         """Run HTTP server in background"""
         global word_input_server
         try:
-            word_input_server = HTTPServer(('localhost', web_console_port), WebConsoleHandler)
-            print(f"🌐 Web console started at http://localhost:{web_console_port}")
+            with startup_profile.step("bind web console"):
+                word_input_server = ThreadingHTTPServer((args.host, web_console_port), WebConsoleHandler)
+            print(f"🌐 Web console started at http://{args.host}:{web_console_port}")
+            server_ready.set()
             word_input_server.serve_forever()
         except Exception as e:
             print(f"Server error: {e}")
+            server_ready.set()
     
     server_thread = threading.Thread(target=run_server, daemon=True)
     server_thread.start()
-    time.sleep(0.5)  # Give server time to start
     
-    # Open web console in browser
-    webbrowser.open(f'http://localhost:{web_console_port}')
-    
-    # Display instruction image (cross-platform)
-    image_path = find_instruction_image()
-    if image_path:
+    # Independent startup steps run concurrently; the browser opens as soon as the server is bound
+    tasks = {
+        "load classifier": load_models,
+    }
+    if not headless:
+        tasks["open web console"] = open_web_console
+        tasks["load instruction image"] = load_instruction_image
+    if not args.cameras:
+        # Camera workers open their own camera and landmarker
+        tasks["open camera"] = lambda: open_camera(args.reprobe)
+        tasks["create landmarker"] = create_landmarker
+    try:
+        resources = run_parallel(tasks, startup_profile)
+    except Exception as e:
+        print(f"Error: {e}")
+        if word_input_server:
+            word_input_server.shutdown()
+        return
+    if args.shadow is not None and not args.cameras:
         try:
-            image = cv2.imread(image_path)
-            if image is not None:
-                cv2.imshow("Hand Sign Instructions", image)
-                print(f"📖 Instruction image loaded from: {image_path}")
+            engine.shadow = ShadowEvaluator(load_model(*artifact_paths(args.shadow)), metrics=metrics).start()
+            print(f"Shadow-evaluating predictor_v{args.shadow} (results at /api/shadow)")
         except Exception as e:
-            print(f"Could not load instruction image: {e}")
-    else:
-        print("⚠️  Hand sign instruction image not found")
+            print(f"Could not load shadow model v{args.shadow}: {e}")
+    if not args.cameras and not args.no_custom_signs:
+        # Loads custom_signs.npz if it exists; custom signs are recorded from the web console
+        engine.templates = TemplateStore(metrics=metrics)
+    if not args.cameras and not args.no_model_watch:
+        # New versions are loaded and warmed up in the background, then swapped in between frames
+        engine.models.watch()
     
-    # Start camera in a separate thread
-    camera_thread = threading.Thread(target=run_camera_feed, daemon=True)
+    # Display instruction image (cross-platform); windows belong to the main thread
+    if not headless:
+        image_path, image = resources["load instruction image"]
+        if image is not None:
+            cv2.imshow("Hand Sign Instructions", image)
+            print(f"📖 Instruction image loaded from: {image_path}")
+        elif not image_path:
+            print("⚠️  Hand sign instruction image not found")
+    
+    # Start camera in a separate thread (or one worker process per camera)
+    camera_start = time.perf_counter()
+    if args.cameras:
+        camera_thread = threading.Thread(target=run_camera_supervisor, args=(args.cameras,), daemon=True)
+    else:
+        cam, camera_fps = resources["open camera"]
+        camera_thread = threading.Thread(
+            target=run_camera_feed, args=(cam, camera_fps), daemon=True
+        )
     camera_thread.start()
     
     # Wait for camera to be ready
     camera_ready.wait(timeout=5.0)
+    startup_profile.record("start camera thread", camera_start)
+    if args.profile_startup:
+        startup_profile.report()
     
     print("\n" + "="*60)
     print("🤟 Sign Language Game Started!")
     print("="*60)
-    print(f"📱 Web console: http://localhost:{web_console_port}")
-    print("📸 Camera window showing hand detection")
-    print("🎮 Use the web browser to control the game")
-    print("⌨️  Press ESC in camera window to quit")
+    print(f"📱 Web console: http://{args.host}:{web_console_port}")
+    if headless:
+        print(f"📸 Camera stream at http://{args.host}:{web_console_port}/api/stream")
+        print("🎮 Use the web browser to control the game")
+        print("⌨️  Stop with Ctrl+C or SIGTERM")
+    else:
+        print("📸 Camera window showing hand detection")
+        print("🎮 Use the web browser to control the game")
+        print("⌨️  Press ESC in camera window to quit")
     print("="*60 + "\n")
     
     # Main game loop
     while camera_running:
+        if headless:
+            # Sleep until the camera publishes the next frame to render; no window events to pump
+            frame_mailbox.wait(last_display_seq, timeout=HEADLESS_WAIT_SECONDS)
+        
         # Update camera display
-        if not update_camera_display():
-            break
+        update_camera_display()
         
         # Process predictions
         process_predictions()
@@ -1156,16 +1934,32 @@ def main():
         # Check for word input from web console
         check_word_input()
         
-        # Handle keyboard input (only ESC to quit)
-        key = cv2.waitKey(1) & 0xFF
-        if key == 27:  # ESC
+        # Handle keyboard input (ESC to quit, R to save the session clip); the only HighGUI poll per iteration
+        if not headless and not handle_key(cv2.waitKey(1) & 0xFF):
             break
     
-    # Cleanup
+    # Cleanup: the camera thread tears down its own resources; wait for it while events can still be written
     camera_running = False
+    camera_thread.join(CAMERA_STOP_TIMEOUT)
+    if camera_thread.is_alive():
+        events.emit("camera_error", f"Camera thread did not stop within {CAMERA_STOP_TIMEOUT:.0f}s", level="error")
     if word_input_server:
         word_input_server.shutdown()
-    cv2.destroyAllWindows()
+    if engine.shadow is not None:
+        engine.shadow.stop()
+        path = f"shadow_v{engine.shadow.candidate.version}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        report = engine.shadow.export(path)
+        agreement = report['agreement']
+        print(f"Shadow model agreement: {agreement * 100:.1f}%" if agreement is not None else "Shadow model saw no hands")
+        print(f"Shadow report written to {path}")
+    if stats is not None:
+        end_stats_sessions()
+        stats.stop()
+    if recorder is not None:
+        recorder.stop()
+    events.stop()
+    if not headless:
+        cv2.destroyAllWindows()
     print("\n👋 Game ended. Thanks for playing!")
 
 if __name__ == "__main__":
@@ -0,0 +1,256 @@
+"""
+Dynamic-sign recognition (J, Z) over a sliding landmark window
+
+The static classifier only sees one frame, but J and Z are defined by motion: the
+pinky tip draws a hook for J and the index tip draws a Z. Each tracked hand keeps
+a preallocated window of its recent landmarks and an incrementally updated motion
+energy. The temporal model only runs while that energy is above a threshold, so a
+held static sign costs one row copy and a few additions per frame.
+
+Normalized image landmarks (``result.hand_landmarks``) are buffered rather than
+``hand_world_landmarks``: world landmarks are centred on the hand, so the path the
+hand draws through the air is not visible in them.
+"""
+import numpy as np
+
+N_LANDMARKS = 21
+INDEX_TIP = 8
+PINKY_TIP = 20
+
+
+class LandmarkWindow:
+    """
+    Fixed (window x 63) ring buffer of landmark rows with a zero-copy ordered view.
+
+    Every row is written twice, at ``head`` and ``head + window``, into a buffer of
+    twice the window length, so the last ``window`` rows in time order are always
+    one contiguous slice and reading them never copies.
+    """
+
+    def __init__(self, window=40):
+        """
+        Args:
+            window: Number of frames kept
+        """
+        self.window = window
+        self._buffer = np.zeros((2 * window, N_LANDMARKS * 3))
+        self._head = 0
+        self.count = 0
+
+    def push_landmarks(self, landmarks):
+        """
+        Append one frame of landmarks.
+
+        Args:
+            landmarks: 21 landmarks with x, y, z attributes
+
+        Returns:
+            np.ndarray: The row just written (a view into the buffer)
+        """
+        row = self._buffer[self._head]
+        for i, landmark in enumerate(landmarks):
+            row[3 * i] = landmark.x
+            row[3 * i + 1] = landmark.y
+            row[3 * i + 2] = landmark.z
+        self._buffer[self._head + self.window] = row
+        self._head = (self._head + 1) % self.window
+        if self.count < self.window:
+            self.count += 1
+        return row
+
+    def view(self):
+        """
+        Get the buffered frames, oldest first, without copying.
+
+        Returns:
+            np.ndarray: View of shape (window, 63); rows before the first push are zeros
+        """
+        return self._buffer[self._head:self._head + self.window]
+
+    def previous(self, lag=1):
+        """Get the row pushed ``lag`` frames before the newest one (a view)"""
+        return self._buffer[(self._head - 1 - lag) % self.window]
+
+
+class TrajectoryTemplateModel:
+    """
+    Small temporal model that matches fingertip paths against J and Z templates.
+
+    The moving part of the fingertip path is resampled by arc length, normalized for
+    position and size, and compared with each template and its mirror image (for the
+    other hand, or a mirrored camera).
+    """
+
+    # (label, fingertip, path) templates in image coordinates (x right, y down), as seen by a camera facing the signer
+    TEMPLATES = (
+        ("Z", INDEX_TIP, ((0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0))),
+        ("J", PINKY_TIP, ((0.0, 0.0), (0.0, 0.5), (0.0, 0.8), (-0.15, 1.0), (-0.4, 1.0), (-0.55, 0.8))),
+    )
+
+    def __init__(self, n_points=16, tolerance=0.35, min_extent=0.04):
+        """
+        Args:
+            n_points: Resampled path length
+            tolerance: Mean point distance (in normalized path units) that scores zero
+            min_extent: Smallest path size, as a fraction of the image, considered a gesture
+        """
+        self.n_points = n_points
+        self.tolerance = tolerance
+        self.min_extent = min_extent
+        self._templates = []
+        for label, tip, points in self.TEMPLATES:
+            path = _resample(np.array(points, dtype=float), n_points)
+            normalized, _ = _normalize(path)
+            mirrored = normalized * np.array([-1.0, 1.0])
+            self._templates.append((label, tip, normalized, mirrored))
+
+    def predict_window(self, window):
+        """
+        Classify a window of landmark rows.
+
+        Args:
+            window: Array of shape (frames, 63), oldest first
+
+        Returns:
+            tuple or None: (label, confidence) of the best template, or None if nothing moved enough
+        """
+        best = None
+        for label, tip, template, mirrored in self._templates:
+            path = _active_span(window[:, 3 * tip:3 * tip + 2])
+            if path is None:
+                continue
+            normalized, extent = _normalize(_resample(path, self.n_points))
+            if extent < self.min_extent:
+                continue
+            distance = min(
+                np.linalg.norm(normalized - template, axis=1).mean(),
+                np.linalg.norm(normalized - mirrored, axis=1).mean(),
+            )
+            confidence = max(0.0, 1.0 - distance / self.tolerance)
+            if best is None or confidence > best[1]:
+                best = (label, confidence)
+        return best
+
+
+class _HandState:
+    def __init__(self, window):
+        self.window = LandmarkWindow(window)
+        self.energies = np.zeros(window)
+        self.energy = 0.0
+        self.frames = 0
+        self.cooldown = 0
+        self.since_eval = 0
+        self.detections = 0
+
+
+class DynamicSignRecognizer:
+    """
+    Per-hand sliding windows with an energy-gated temporal model.
+
+    Per-frame cost for a still hand is one landmark row copy and an O(63) energy
+    update; the model runs at most every ``eval_every`` frames, and only while the
+    window's motion energy is above ``energy_threshold``.
+    """
+
+    def __init__(self, model=None, window=40, energy_threshold=3e-4, min_confidence=0.6, eval_every=4):
+        """
+        Args:
+            model: Object with ``predict_window(window) -> (label, confidence) or None``
+                (default: TrajectoryTemplateModel)
+            window: Frames per hand window
+            energy_threshold: Summed squared landmark displacement over the window that triggers the model
+            min_confidence: Confidence the model must report for a detection
+            eval_every: Minimum frames between model runs while the hand keeps moving
+        """
+        self.model = model if model is not None else TrajectoryTemplateModel()
+        self.window = window
+        self.energy_threshold = energy_threshold
+        self.min_confidence = min_confidence
+        self.eval_every = eval_every
+        self.model_calls = 0
+        self._hands = {}
+
+    def update(self, track_id, landmarks):
+        """
+        Feed one frame of a tracked hand.
+
+        Args:
+            track_id: Persistent hand ID from the tracker
+            landmarks: 21 normalized image landmarks for that hand
+
+        Returns:
+            tuple or None: (letter, confidence) when a dynamic sign completes in this frame
+        """
+        state = self._hands.get(track_id)
+        if state is None:
+            state = self._hands[track_id] = _HandState(self.window)
+        window = state.window
+        row = window.push_landmarks(landmarks)
+
+        # Incremental motion energy: mean squared x/y displacement, summed over the window
+        slot = state.frames % self.window
+        state.frames += 1
+        state.energy -= state.energies[slot]
+        if window.count > 1:
+            delta = row - window.previous()
+            energy = float(delta[0::3] @ delta[0::3] + delta[1::3] @ delta[1::3]) / N_LANDMARKS
+        else:
+            energy = 0.0
+        state.energies[slot] = energy
+        state.energy += energy
+
+        if state.cooldown > 0:
+            state.cooldown -= 1
+            return None
+        state.since_eval += 1
+        if window.count < self.window or state.energy < self.energy_threshold or state.since_eval < self.eval_every:
+            return None
+
+        state.since_eval = 0
+        self.model_calls += 1
+        result = self.model.predict_window(window.view())
+        if result is None or result[1] < self.min_confidence:
+            return None
+        # Let the gesture leave the window before looking for the next one
+        state.cooldown = self.window
+        state.detections += 1
+        return result
+
+    def detection_count(self, track_id):
+        """Number of dynamic signs detected for a hand so far"""
+        state = self._hands.get(track_id)
+        return state.detections if state is not None else 0
+
+    def drop(self, track_id):
+        """Forget a hand that is no longer tracked"""
+        self._hands.pop(track_id, None)
+
+    def tracked_ids(self):
+        """IDs of hands with a window"""
+        return list(self._hands)
+
+
+def _resample(path, n_points):
+    """Resample a polyline to n points evenly spaced by arc length"""
+    steps = np.linalg.norm(np.diff(path, axis=0), axis=1)
+    arc = np.concatenate(([0.0], np.cumsum(steps)))
+    if arc[-1] <= 0:
+        return np.repeat(path[:1], n_points, axis=0)
+    targets = np.linspace(0.0, arc[-1], n_points)
+    return np.stack([np.interp(targets, arc, path[:, 0]), np.interp(targets, arc, path[:, 1])], axis=1)
+
+
+def _normalize(path):
+    """Move a path to start at the origin and scale its larger side to 1"""
+    shifted = path - path[0]
+    extent = float(np.ptp(shifted, axis=0).max())
+    return (shifted / extent if extent > 0 else shifted), extent
+
+
+def _active_span(path, speed_eps=0.002):
+    """Trim the still frames before and after the motion in a fingertip path"""
+    speeds = np.linalg.norm(np.diff(path, axis=0), axis=1)
+    moving = np.flatnonzero(speeds > speed_eps)
+    if len(moving) < 2:
+        return None
+    return path[moving[0]:moving[-1] + 2]
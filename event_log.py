@@ -0,0 +1,197 @@
+"""
+Non-blocking structured event log
+
+Game, camera and error events are appended to a bounded ring by ``emit`` (a
+dict and a deque append; no terminal or file I/O on the caller's thread). A
+background thread flushes them in batches: one write of JSON lines to the log
+file and one write of their messages to the terminal per batch.
+
+Noisy event types get a minimum interval. Events arriving inside the interval
+are coalesced: the newest one is held back and written when the interval ends,
+with ``suppressed`` counting the ones it stands for. When the ring is full the
+oldest unwritten events are dropped and counted.
+
+Recent events stay queryable (``recent``), e.g. from the web console.
+"""
+import itertools
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+
+class EventLog:
+    """
+    Structured events, written off the hot path.
+
+    Usage:
+        events = EventLog("events.jsonl", rate_limits={"mismatch": 1.0}).start()
+        events.emit("mismatch", f"Detected '{letter}' but expected '{target}'", letter=letter, expected=target)
+        events.recent("mismatch")
+    """
+
+    def __init__(self, path=None, capacity=4096, history=1000, rate_limits=None, flush_interval=0.2,
+                 echo=True, stream=None, metrics=None):
+        """
+        Args:
+            path: JSON-lines file events are appended to (None: terminal and history only)
+            capacity: Unwritten events kept before the oldest are dropped
+            history: Most recent events kept for ``recent``
+            rate_limits: Event type -> minimum seconds between two written events of that type
+            flush_interval: Seconds between flushes when nothing wakes the writer earlier
+            echo: Also write each event's message to the terminal
+            stream: Terminal stream (default: sys.stdout at flush time)
+            metrics: Optional MetricsRegistry for events_dropped/events_suppressed gauges and event_flush_ms timings
+        """
+        self.path = path
+        self.rate_limits = dict(rate_limits or {})
+        self.flush_interval = flush_interval
+        self.echo = echo
+        self.stream = stream
+        self.metrics = metrics
+        self.dropped = 0
+        self.suppressed = 0
+        self._pending = deque(maxlen=capacity)
+        self._history = deque(maxlen=history)
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()  # guards the rate-limit state
+        self._last_written = {}  # event type -> time of the last event let through
+        self._held = {}  # event type -> (newest coalesced record, events it stands for)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def emit(self, event, message=None, level="info", **fields):
+        """
+        Record one event (any thread; never blocks on I/O).
+
+        Args:
+            event: Event type, e.g. "mismatch"
+            message: Human-readable line for the terminal (None: not echoed)
+            level: "info", "warning" or "error"
+            **fields: JSON-serializable details
+        """
+        now = time.time()
+        record = {"seq": next(self._seq), "ts": round(now, 3), "event": event, "level": level}
+        if message is not None:
+            record["message"] = message
+        record.update(fields)
+        interval = self.rate_limits.get(event)
+        if interval is not None:
+            with self._lock:
+                if now - self._last_written.get(event, 0.0) < interval:
+                    _, count = self._held.get(event, (None, 0))
+                    self._held[event] = (record, count + 1)
+                    self.suppressed += 1
+                    return
+                self._last_written[event] = now
+                held = self._held.pop(event, None)
+            if held is not None:
+                # The held-back events are superseded by this one
+                record["suppressed"] = held[1]
+        self._append(record)
+
+    def _append(self, record):
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(record)
+        self._history.append(record)
+        if record["level"] == "error":
+            self._wake.set()
+
+    def recent(self, event=None, since=0, limit=100):
+        """
+        Newest events, oldest first.
+
+        Args:
+            event: Only this event type (default: all)
+            since: Only events with a higher seq (for polling)
+            limit: Most events returned
+
+        Returns:
+            list: Event dicts
+        """
+        records = [
+            record for record in list(self._history)
+            if record["seq"] > since and (event is None or record["event"] == event)
+        ]
+        return records[-limit:] if limit else records
+
+    def start(self):
+        """Start the background writer"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Write everything still pending (including held-back events) and stop the writer"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush(release_held=True)
+
+    def flush(self, release_held=False):
+        """
+        Write pending events now (the writer thread; tests and shutdown call it directly).
+
+        Args:
+            release_held: Also write held-back events whose interval has not ended yet
+        """
+        self._release_held(force=release_held)
+        batch = []
+        while self._pending:
+            try:
+                batch.append(self._pending.popleft())
+            except IndexError:
+                break
+        if not batch:
+            return
+        start = time.perf_counter()
+        if self.path is not None:
+            # Opened per batch (a few times a second at most), so nothing is left open between flushes
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(record, default=str) + "\n" for record in batch))
+        if self.echo:
+            lines = [_terminal_line(record) for record in batch if "message" in record]
+            if lines:
+                stream = self.stream if self.stream is not None else sys.stdout
+                stream.write("\n".join(lines) + "\n")
+                stream.flush()
+        if self.metrics is not None:
+            self.metrics.observe("event_flush_ms", (time.perf_counter() - start) * 1000)
+            self.metrics.set_gauge("events_dropped", self.dropped)
+            self.metrics.set_gauge("events_suppressed", self.suppressed)
+
+    def _release_held(self, force=False):
+        now = time.time()
+        released = []
+        with self._lock:
+            for event, (record, count) in list(self._held.items()):
+                if force or now - self._last_written.get(event, 0.0) >= self.rate_limits[event]:
+                    del self._held[event]
+                    self._last_written[event] = now
+                    # The newest held event stands for itself and the others held with it
+                    released.append(dict(record, suppressed=count - 1))
+        for record in released:
+            self._append(record)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                sys.stderr.write(f"Event log error: {e}\n")
+
+
+def _terminal_line(record):
+    line = record["message"]
+    if record.get("suppressed"):
+        line += f" (+{record['suppressed']} similar)"
+    return line
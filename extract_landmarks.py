@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Offline bulk landmark extraction from videos and image folders
+
+Work units (one video file, or one folder of images) are spread over a process
+pool. Each worker holds its own HandLandmarker: an IMAGE-mode one for the life of
+the worker for image folders, and a fresh VIDEO-mode one per video so hand
+tracking never carries over between clips. Rows stream into fixed-size
+memory-mapped chunk files that each worker owns, so no process ever holds a
+whole dataset in RAM.
+
+The output directory holds the chunks plus ``index.jsonl``: one line per
+finished unit with its label and the chunk spans holding its rows. The index is
+only appended once a unit's rows are flushed, so an interrupted run is resumed
+by running the same command again; units already in the index (same size and
+modification time) are skipped.
+
+Each row has the classifier's input features (handedness then 21 world
+landmarks, as ``classification.landmark_features``) and the normalized image
+landmarks. ``LandmarkDataset`` reads a dataset back.
+
+Usage:
+    python extract_landmarks.py clips/ --output datasets/clips
+    python extract_landmarks.py asl_alphabet/ more/B.mp4 --output datasets/v2 --workers 6 --stride 2
+"""
+import argparse
+import json
+import os
+import time
+import uuid
+import multiprocessing as mp_proc
+import numpy as np
+
+MODEL_PATH = "./models/hand_landmarker.task"
+INDEX_NAME = "index.jsonl"
+VIDEO_EXTENSIONS = {".mp4", ".mov", ".avi", ".mkv", ".webm", ".m4v"}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+# frame: frame index in the video (or image index in the folder's sorted listing);
+# hand: detection order within the frame
+ROW_DTYPE = np.dtype([
+    ("frame", np.int32),
+    ("hand", np.int8),
+    ("features", np.float32, 64),
+    ("landmarks", np.float32, 63),
+])
+
+
+def discover_units(inputs, label=None):
+    """
+    Find the work units under the given paths.
+
+    Every video is a unit labelled with its parent directory's name; every directory
+    that directly contains images is a unit labelled with its own name.
+
+    Args:
+        inputs: Video files and directories (searched recursively)
+        label: Label for every unit instead of the directory names
+
+    Returns:
+        list: Unit dicts with path, kind ("video" or "images"), label, size, mtime and,
+        for image folders, the sorted image file names
+    """
+    units = []
+
+    def add_video(path):
+        stat = os.stat(path)
+        units.append({
+            "path": os.path.abspath(path), "kind": "video",
+            "label": label if label is not None else os.path.basename(os.path.dirname(os.path.abspath(path))),
+            "size": stat.st_size, "mtime": stat.st_mtime,
+        })
+
+    for root in inputs:
+        if os.path.isfile(root):
+            add_video(root)
+            continue
+        for directory, subdirectories, files in os.walk(root):
+            subdirectories.sort()
+            images = sorted(name for name in files if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS)
+            if images:
+                stats = [os.stat(os.path.join(directory, name)) for name in images]
+                units.append({
+                    "path": os.path.abspath(directory), "kind": "images",
+                    "label": label if label is not None else os.path.basename(os.path.abspath(directory)),
+                    "size": sum(stat.st_size for stat in stats), "mtime": max(stat.st_mtime for stat in stats),
+                    "images": images,
+                })
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in VIDEO_EXTENSIONS:
+                    add_video(os.path.join(directory, name))
+    return units
+
+
+def read_index(directory):
+    """
+    Read a dataset's index.
+
+    Args:
+        directory: Dataset directory
+
+    Returns:
+        list: Index entries in the order they were written (empty if there is no index yet)
+    """
+    path = os.path.join(directory, INDEX_NAME)
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A line cut short by an interrupted run; its unit is extracted again
+                continue
+    return entries
+
+
+def pending_units(units, directory):
+    """
+    Drop the units a previous run already finished.
+
+    Returns:
+        list: Units without a successful index entry of the same size and modification time
+    """
+    done = {
+        (entry["path"], entry["size"], entry["mtime"])
+        for entry in read_index(directory) if "error" not in entry
+    }
+    return [unit for unit in units if (unit["path"], unit["size"], unit["mtime"]) not in done]
+
+
+class ChunkWriter:
+    """
+    Appends rows to fixed-size memory-mapped .npy chunks owned by one process.
+
+    Chunks are created at full size and filled in place; a unit's rows may span
+    several chunks. Unused rows at the end of a chunk are never referenced by the index.
+    """
+
+    def __init__(self, directory, chunk_rows=8192):
+        """
+        Args:
+            directory: Dataset directory
+            chunk_rows: Rows per chunk file
+        """
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self._prefix = f"chunk-{uuid.uuid4().hex[:8]}"
+        self._count = 0
+        self._chunk = None
+        self._name = None
+        self._used = 0
+        self._spans = []
+
+    def append(self, rows):
+        """Append a structured array of ROW_DTYPE rows"""
+        start = 0
+        while start < len(rows):
+            if self._chunk is None or self._used == self.chunk_rows:
+                self._open_chunk()
+            n = min(len(rows) - start, self.chunk_rows - self._used)
+            self._chunk[self._used:self._used + n] = rows[start:start + n]
+            if self._spans and self._spans[-1][0] == self._name and self._spans[-1][2] == self._used:
+                self._spans[-1][2] += n
+            else:
+                self._spans.append([self._name, self._used, self._used + n])
+            self._used += n
+            start += n
+
+    def finish_unit(self):
+        """
+        Flush the rows written since the last call to disk.
+
+        Returns:
+            list: [chunk file name, start row, stop row] spans holding those rows
+        """
+        if self._chunk is not None:
+            self._chunk.flush()
+        spans, self._spans = self._spans, []
+        return spans
+
+    def close(self):
+        """Flush and release the current chunk"""
+        if self._chunk is not None:
+            self._chunk.flush()
+            self._chunk = None
+
+    def _open_chunk(self):
+        self.close()
+        self._name = f"{self._prefix}-{self._count:04d}.npy"
+        self._count += 1
+        self._chunk = np.lib.format.open_memmap(
+            os.path.join(self.directory, self._name), mode="w+", dtype=ROW_DTYPE, shape=(self.chunk_rows,)
+        )
+        self._used = 0
+
+
+class LandmarkDataset:
+    """
+    Read-only view of an extracted dataset.
+
+    Chunks are memory-mapped, so rows are only read from disk when accessed.
+    """
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory: Dataset directory written by extract_landmarks.py
+        """
+        self.directory = directory
+        # The newest successful entry per unit wins (a changed file is extracted again)
+        latest = {}
+        for entry in read_index(directory):
+            if "error" not in entry:
+                latest[entry["path"]] = entry
+        self.entries = list(latest.values())
+        self._chunks = {}
+
+    def __len__(self):
+        return sum(entry["rows"] for entry in self.entries)
+
+    def rows(self, entry):
+        """
+        All rows of one unit.
+
+        Args:
+            entry: One of ``entries``
+
+        Returns:
+            np.ndarray: Structured ROW_DTYPE array
+        """
+        parts = [self._chunk(name)[start:stop] for name, start, stop in entry["chunks"]]
+        if not parts:
+            return np.empty(0, dtype=ROW_DTYPE)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def arrays(self, first_hand_only=True):
+        """
+        Classifier training arrays for the whole dataset.
+
+        Args:
+            first_hand_only: Keep only the first detected hand of each frame
+
+        Returns:
+            tuple: (features of shape (n, 64), labels of shape (n,), unit index per row)
+        """
+        features, labels, units = [], [], []
+        for unit, entry in enumerate(self.entries):
+            rows = self.rows(entry)
+            if first_hand_only:
+                rows = rows[rows["hand"] == 0]
+            features.append(np.asarray(rows["features"]))
+            labels.append(np.full(len(rows), entry["label"], dtype=object))
+            units.append(np.full(len(rows), unit))
+        if not features:
+            return np.empty((0, 64), dtype=np.float32), np.empty(0, dtype=object), np.empty(0, dtype=int)
+        return np.concatenate(features), np.concatenate(labels), np.concatenate(units)
+
+    def _chunk(self, name):
+        chunk = self._chunks.get(name)
+        if chunk is None:
+            chunk = self._chunks[name] = np.load(os.path.join(self.directory, name), mmap_mode="r")
+        return chunk
+
+
+def detection_rows(detection, frame):
+    """
+    Turn one HandLandmarker result into dataset rows.
+
+    Args:
+        detection: HandLandmarkerResult
+        frame: Frame (or image) index
+
+    Returns:
+        np.ndarray: One ROW_DTYPE row per detected hand
+    """
+    from classification import landmark_features
+
+    n_hands = len(detection.hand_landmarks)
+    rows = np.zeros(n_hands, dtype=ROW_DTYPE)
+    if n_hands == 0:
+        return rows
+    rows["frame"] = frame
+    rows["hand"] = np.arange(n_hands)
+    rows["features"] = landmark_features(detection.handedness, detection.hand_world_landmarks)
+    rows["landmarks"] = [
+        [value for landmark in hand for value in (landmark.x, landmark.y, landmark.z)]
+        for hand in detection.hand_landmarks
+    ]
+    return rows
+
+
+# Per-process state of a pool worker, set up by _init_worker
+_worker = {}
+
+
+def _init_worker(directory, model_path, num_hands, chunk_rows):
+    """Pool initializer: imports, IMAGE-mode landmarker and this worker's chunk writer"""
+    import cv2
+    import mediapipe as mp
+
+    # One OpenCV thread per worker; parallelism comes from the processes
+    cv2.setNumThreads(1)
+    _worker.update(cv2=cv2, mp=mp, model_path=model_path, num_hands=num_hands)
+    _worker["image_landmarker"] = mp.tasks.vision.HandLandmarker.create_from_options(_landmarker_options("IMAGE"))
+    # Every unit is flushed when it finishes, so nothing is lost when the pool shuts the worker down
+    _worker["writer"] = ChunkWriter(directory, chunk_rows)
+
+
+def _landmarker_options(mode):
+    mp = _worker["mp"]
+    return mp.tasks.vision.HandLandmarkerOptions(
+        base_options=mp.tasks.BaseOptions(model_asset_path=_worker["model_path"]),
+        running_mode=getattr(mp.tasks.vision.RunningMode, mode),
+        num_hands=_worker["num_hands"],
+    )
+
+
+def _extract_unit(unit, stride=1):
+    """Extract one unit in a pool worker; returns its index entry"""
+    cv2, mp, writer = _worker["cv2"], _worker["mp"], _worker["writer"]
+    start = time.perf_counter()
+    frames = 0
+    rows = 0
+    try:
+        if unit["kind"] == "video":
+            cam = cv2.VideoCapture(unit["path"])
+            if not cam.isOpened():
+                raise RuntimeError("could not open video")
+            fps = cam.get(cv2.CAP_PROP_FPS) or 30.0
+            index = 0
+            last_timestamp = -1
+            with mp.tasks.vision.HandLandmarker.create_from_options(_landmarker_options("VIDEO")) as landmarker:
+                while True:
+                    ret, frame = cam.read()
+                    if not ret:
+                        break
+                    if index % stride == 0:
+                        timestamp = max(int(index * 1000.0 / fps), last_timestamp + 1)
+                        last_timestamp = timestamp
+                        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                        found = detection_rows(landmarker.detect_for_video(image, timestamp), index)
+                        writer.append(found)
+                        rows += len(found)
+                        frames += 1
+                    index += 1
+            cam.release()
+        else:
+            landmarker = _worker["image_landmarker"]
+            for index, name in enumerate(unit["images"]):
+                frame = cv2.imread(os.path.join(unit["path"], name))
+                if frame is None:
+                    continue
+                image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                found = detection_rows(landmarker.detect(image), index)
+                writer.append(found)
+                rows += len(found)
+                frames += 1
+        spans = writer.finish_unit()
+    except Exception as e:
+        writer.finish_unit()
+        return {"path": unit["path"], "error": repr(e)}
+    seconds = time.perf_counter() - start
+    entry = {key: unit[key] for key in ("path", "kind", "label", "size", "mtime")}
+    entry.update({
+        "frames": frames,
+        "rows": rows,
+        "chunks": spans,
+        "seconds": seconds,
+        "fps": frames / seconds if seconds > 0 else 0.0,
+        "worker": os.getpid(),
+    })
+    if unit["kind"] == "images":
+        entry["images"] = unit["images"]
+    return entry
+
+
+def extract(inputs, directory, workers=None, label=None, stride=1, num_hands=1, chunk_rows=8192, model_path=MODEL_PATH):
+    """
+    Extract landmarks for every unit under ``inputs`` that the dataset does not have yet.
+
+    Args:
+        inputs: Video files and directories
+        directory: Dataset directory (created if needed)
+        workers: Worker processes (default: one per core)
+        label: Label for every unit instead of the directory names
+        stride: Use every stride-th video frame
+        num_hands: Hands detected per frame
+        chunk_rows: Rows per chunk file
+        model_path: HandLandmarker model
+
+    Returns:
+        dict: Units found, skipped (already extracted), extracted and failed; frames and seconds
+    """
+    if not os.path.exists(model_path):
+        # Checked here: a pool whose initializer fails keeps respawning workers instead of erroring
+        raise FileNotFoundError(f"HandLandmarker model not found: {model_path}")
+    os.makedirs(directory, exist_ok=True)
+    units = discover_units(inputs, label)
+    pending = pending_units(units, directory)
+    # Largest units first, so a long video does not start last and hold up the end of the run
+    pending.sort(key=lambda unit: unit["size"], reverse=True)
+    summary = {"units": len(units), "skipped": len(units) - len(pending), "extracted": 0, "failed": 0, "frames": 0}
+    print(f"{len(units)} units found, {summary['skipped']} already extracted, {len(pending)} to go")
+    if not pending:
+        summary["seconds"] = 0.0
+        return summary
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    start = time.perf_counter()
+    ctx = mp_proc.get_context("spawn")
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(directory, model_path, num_hands, chunk_rows)) as pool, \
+            open(os.path.join(directory, INDEX_NAME), "a") as index:
+        tasks = [(unit, stride) for unit in pending]
+        for done, entry in enumerate(pool.imap_unordered(_extract_star, tasks), start=1):
+            # Only completed, flushed units reach the index, so it is always safe to resume from
+            index.write(json.dumps(entry) + "\n")
+            index.flush()
+            os.fsync(index.fileno())
+            name = os.path.relpath(entry["path"])
+            if "error" in entry:
+                summary["failed"] += 1
+                print(f"  [{done}/{len(pending)}] {name}: FAILED {entry['error']}")
+                continue
+            summary["extracted"] += 1
+            summary["frames"] += entry["frames"]
+            print(f"  [{done}/{len(pending)}] {name}: {entry['frames']} frames, {entry['rows']} hands, "
+                  f"{entry['fps']:.1f} frames/s")
+        pool.close()
+        pool.join()
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def _extract_star(task):
+    return _extract_unit(*task)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract hand landmarks from videos and image folders")
+    parser.add_argument("inputs", nargs="+", help="video files and directories (searched recursively)")
+    parser.add_argument("--output", required=True, help="dataset directory; an existing one is resumed")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--label", default=None, help="label every unit with this instead of its directory name")
+    parser.add_argument("--stride", type=int, default=1, help="use every Nth video frame")
+    parser.add_argument("--num-hands", type=int, default=1, help="hands detected per frame")
+    parser.add_argument("--chunk-rows", type=int, default=8192, help="rows per chunk file")
+    parser.add_argument("--model", default=MODEL_PATH, help="HandLandmarker model")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"LANDMARK EXTRACTION: {args.output}")
+    print("=" * 60)
+    summary = extract(args.inputs, args.output, args.workers, args.label, args.stride, args.num_hands,
+                      args.chunk_rows, args.model)
+    print("=" * 60)
+    rate = summary["frames"] / summary["seconds"] if summary["seconds"] > 0 else 0.0
+    print(f"Extracted {summary['extracted']} units ({summary['frames']} frames, {rate:.1f} frames/s overall), "
+          f"skipped {summary['skipped']}, failed {summary['failed']}")
+    print(f"Dataset: {len(LandmarkDataset(args.output))} rows in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Lexicon-constrained fingerspelling decoder
+
+Per-frame letter probabilities are decoded with a CTC-style prefix beam search:
+frames without a hand (or with a very unsure classifier) act as the blank symbol,
+repeated letters collapse into one unless a blank separates them, and every hypothesis
+is a node of a prefix trie built from a word list, so only spellings that can still
+become a word survive.
+"""
+import os
+import numpy as np
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(__file__), "resources", "words.txt")
+
+
+class PrefixTrie:
+    """
+    Array-backed prefix trie over a fixed alphabet.
+
+    Node 0 is the root. ``children[node, letter]`` holds the child node id or -1,
+    so expanding a set of nodes is a single fancy-indexing operation.
+    """
+
+    def __init__(self, words, alphabet):
+        """
+        Args:
+            words: Iterable of words; words with letters outside the alphabet are skipped
+            alphabet: Sequence of single-character labels, in classifier column order
+        """
+        self.alphabet = [letter.upper() for letter in alphabet]
+        letter_ids = {letter: i for i, letter in enumerate(self.alphabet)}
+
+        # Collect every prefix first so the node arrays can be allocated once
+        encoded = []
+        for word in words:
+            word = word.strip().upper()
+            if word and all(letter in letter_ids for letter in word):
+                encoded.append(word)
+        prefixes = {""}
+        for word in encoded:
+            for end in range(1, len(word) + 1):
+                prefixes.add(word[:end])
+        ordered = sorted(prefixes, key=lambda prefix: (len(prefix), prefix))
+        node_ids = {prefix: i for i, prefix in enumerate(ordered)}
+
+        n_nodes = len(ordered)
+        self.children = np.full((n_nodes, len(self.alphabet)), -1, dtype=np.int32)
+        self.label = np.zeros(n_nodes, dtype=np.int32)
+        self.is_word = np.zeros(n_nodes, dtype=bool)
+        self.prefixes = ordered
+        for prefix, node in node_ids.items():
+            if prefix:
+                letter = letter_ids[prefix[-1]]
+                self.label[node] = letter
+                self.children[node_ids[prefix[:-1]], letter] = node
+        for word in encoded:
+            self.is_word[node_ids[word]] = True
+
+    @classmethod
+    def from_file(cls, path, alphabet):
+        """
+        Build a trie from a word list with one word per line.
+
+        Args:
+            path: Path to the word list
+            alphabet: Sequence of single-character labels, in classifier column order
+
+        Returns:
+            PrefixTrie: Trie containing every spellable word in the file
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls((line for line in f if not line.startswith("#")), alphabet)
+
+    @property
+    def n_nodes(self):
+        return len(self.prefixes)
+
+    @property
+    def n_words(self):
+        return int(self.is_word.sum())
+
+
+class LexiconBeamDecoder:
+    """
+    Incremental CTC-style prefix beam search over a PrefixTrie.
+
+    Each frame costs O(beam_width x alphabet): the beam is a handful of trie nodes
+    with separate blank/non-blank path probabilities. The beam_width x alphabet
+    scratch buffers (children, extension probabilities, candidates) are allocated
+    up front; a frame only creates small beam-sized temporaries.
+    """
+
+    def __init__(self, trie, beam_width=16, min_confidence=0.6, commit_blank_frames=20, min_word_probability=0.3):
+        """
+        Args:
+            trie: PrefixTrie built over the classifier alphabet
+            beam_width: Number of prefixes kept after each frame
+            min_confidence: Frames whose top probability is below this count partly as blank,
+                which is what lets a brief wobble between double letters spell both
+            commit_blank_frames: Consecutive frames without a hand that commit the best word
+            min_word_probability: Posterior a complete word needs to be committed
+        """
+        self.trie = trie
+        self.beam_width = beam_width
+        self.min_confidence = min_confidence
+        self.commit_blank_frames = commit_blank_frames
+        self.min_word_probability = min_word_probability
+
+        self._nodes = np.zeros(beam_width, dtype=np.int64)
+        self._p_blank = np.zeros(beam_width)
+        self._p_letter = np.zeros(beam_width)
+        self._size = 0
+        # Per-node accumulators, kept all-zero between frames
+        self._acc_blank = np.zeros(trie.n_nodes)
+        self._acc_letter = np.zeros(trie.n_nodes)
+        self._letter_probs = np.zeros(len(trie.alphabet))
+        # Per-frame scratch, sized for a full beam expanded by every letter
+        n_letters = len(trie.alphabet)
+        self._p_total = np.zeros(beam_width)
+        self._labels = np.zeros(beam_width, dtype=trie.label.dtype)
+        self._not_root = np.zeros(beam_width, dtype=bool)
+        self._kids = np.zeros((beam_width, n_letters), dtype=trie.children.dtype)
+        self._valid = np.zeros((beam_width, n_letters), dtype=bool)
+        self._extend = np.zeros((beam_width, n_letters))
+        self._kid_nodes = np.zeros(beam_width * n_letters, dtype=trie.children.dtype)
+        self._kid_probs = np.zeros(beam_width * n_letters)
+        self._fresh = np.zeros(beam_width * n_letters, dtype=bool)
+        self._candidates = np.zeros(beam_width * (n_letters + 1), dtype=trie.children.dtype)
+        self._scores = np.zeros(beam_width * (n_letters + 1))
+        self._score_letter = np.zeros(beam_width * (n_letters + 1))
+        self._in_beam = np.zeros(trie.n_nodes, dtype=bool)
+        self._blank_run = 0
+        self.reset()
+
+    def reset(self):
+        """Start a new word from the empty prefix"""
+        self._nodes[0] = 0
+        self._p_blank[0] = 1.0
+        self._p_letter[0] = 0.0
+        self._size = 1
+        self._blank_run = 0
+
+    def step(self, probs):
+        """
+        Advance the search by one frame with a hand in view.
+
+        Args:
+            probs: Classifier probabilities for this frame, in alphabet order
+        """
+        letter_probs = self._letter_probs
+        np.copyto(letter_probs, probs)
+        total = letter_probs.sum()
+        if total <= 0:
+            self.step_blank()
+            return
+        letter_probs /= total
+        # Confident frames never leak into the blank path, so holding a letter cannot double it
+        confidence = float(letter_probs.max())
+        blank = 1.0 - confidence if confidence < self.min_confidence else 0.0
+        letter_probs *= 1.0 - blank
+        self._advance(letter_probs, blank)
+        self._blank_run = 0
+
+    def step_blank(self):
+        """
+        Advance the search by one frame without a hand in view.
+
+        Returns:
+            str or None: The committed word once the hand has been away for
+            ``commit_blank_frames`` frames and a word is likely enough
+        """
+        # A pure blank frame moves all probability mass onto the blank-ending paths
+        size = self._size
+        self._p_blank[:size] += self._p_letter[:size]
+        self._p_letter[:size] = 0.0
+        self._blank_run += 1
+        if self._blank_run < self.commit_blank_frames:
+            return None
+
+        word = self.best_word()
+        # Either way the next attempt starts from an empty prefix
+        self.reset()
+        if word is not None and word[1] >= self.min_word_probability:
+            return word[0]
+        return None
+
+    def _advance(self, letter_probs, blank):
+        trie = self.trie
+        size = self._size
+        nodes = self._nodes[:size]
+        p_blank = self._p_blank[:size]
+        p_letter = self._p_letter[:size]
+        p_total = np.add(p_blank, p_letter, out=self._p_total[:size])
+        labels = np.take(trie.label, nodes, out=self._labels[:size])
+        not_root = np.not_equal(nodes, 0, out=self._not_root[:size])
+        acc_blank, acc_letter = self._acc_blank, self._acc_letter
+
+        # Staying on the same prefix: via blank, or by repeating its last letter
+        acc_blank[nodes] += p_total * blank
+        acc_letter[nodes] += np.where(not_root, p_letter * letter_probs[labels], 0.0)
+
+        # Extending with a new letter; repeating the last letter needs a blank in between
+        kids = np.take(trie.children, nodes, axis=0, out=self._kids[:size])
+        extend = np.multiply(p_total[:, None], letter_probs[None, :], out=self._extend[:size])
+        repeat_rows = np.flatnonzero(not_root)
+        extend[repeat_rows, labels[repeat_rows]] = p_blank[repeat_rows] * letter_probs[labels[repeat_rows]]
+        valid = np.greater_equal(kids, 0, out=self._valid[:size]).ravel()
+        n_kids = int(np.count_nonzero(valid))
+        kid_nodes = np.compress(valid, kids.ravel(), out=self._kid_nodes[:n_kids])
+        # Children of distinct nodes are distinct, so plain fancy-index accumulation is safe
+        acc_letter[kid_nodes] += np.compress(valid, extend.ravel(), out=self._kid_probs[:n_kids])
+
+        # Candidates: the beam plus children that are not already in it
+        in_beam = self._in_beam
+        in_beam[nodes] = True
+        fresh = np.take(in_beam, kid_nodes, out=self._fresh[:n_kids])
+        np.logical_not(fresh, out=fresh)
+        in_beam[nodes] = False
+        n_candidates = size + int(np.count_nonzero(fresh))
+        candidates = self._candidates[:n_candidates]
+        candidates[:size] = nodes
+        np.compress(fresh, kid_nodes, out=candidates[size:])
+        scores = np.take(acc_blank, candidates, out=self._scores[:n_candidates])
+        scores += np.take(acc_letter, candidates, out=self._score_letter[:n_candidates])
+        n_alive = int(np.count_nonzero(scores))
+        if not n_alive:
+            # Nothing in the lexicon is compatible with this frame; start over
+            acc_blank[candidates] = 0.0
+            acc_letter[candidates] = 0.0
+            self.reset()
+            return
+        # Scores are never negative, so the top ``keep`` of them are all alive
+        keep = min(self.beam_width, n_alive)
+        top = np.argpartition(scores, -keep)[-keep:] if keep < n_candidates else slice(None)
+        chosen = candidates[top]
+        norm = scores[top].sum()
+
+        self._nodes[:keep] = chosen
+        self._p_blank[:keep] = acc_blank[chosen] / norm
+        self._p_letter[:keep] = acc_letter[chosen] / norm
+        self._size = keep
+        acc_blank[candidates] = 0.0
+        acc_letter[candidates] = 0.0
+
+    def hypotheses(self, limit=5):
+        """
+        Get the most likely prefixes spelled so far.
+
+        Args:
+            limit: Maximum number of prefixes to return
+
+        Returns:
+            list: (prefix, probability) tuples, best first
+        """
+        size = self._size
+        scores = self._p_blank[:size] + self._p_letter[:size]
+        order = np.argsort(-scores)[:limit]
+        return [(self.trie.prefixes[self._nodes[i]], float(scores[i])) for i in order]
+
+    def best_word(self):
+        """
+        Get the most likely complete word in the beam.
+
+        Returns:
+            tuple or None: (word, probability), or None if no hypothesis is a complete word
+        """
+        size = self._size
+        nodes = self._nodes[:size]
+        words = self.trie.is_word[nodes]
+        if not words.any():
+            return None
+        scores = np.where(words, self._p_blank[:size] + self._p_letter[:size], -1.0)
+        best = int(np.argmax(scores))
+        return self.trie.prefixes[nodes[best]], float(scores[best])
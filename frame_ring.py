@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Shared-memory frame ring for zero-copy frame handoff between processes
+
+One producer writes frames into fixed slots of a ``multiprocessing.shared_memory``
+block; any number of consumers in other processes read the newest frame as a
+NumPy view of the same memory, without pickling or copying. Every slot carries
+the sequence number of the frame it holds, and the header holds the newest
+committed sequence, so readers can check that a slot was not overwritten while
+they used it.
+
+Usage:
+    python frame_ring.py --bench    # throughput against pickled multiprocessing queues
+"""
+import argparse
+import time
+import multiprocessing as mp_proc
+from multiprocessing import shared_memory
+import numpy as np
+
+HEADER_FIELDS = 8  # n_slots, height, width, channels, latest seq, reserved...
+_LATEST = 4
+
+
+def _attach_untracked(name):
+    """Attach to an existing block without taking over its cleanup"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers the block, but processes started through
+        # multiprocessing share one resource tracker, so the extra registration is a no-op
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedFrameRing:
+    """
+    Single-producer/multi-consumer ring of fixed-size frames in shared memory.
+
+    The producer either copies a frame in with ``write`` or fills a slot in place
+    (e.g. ``cam.read(view)``) between ``begin_write`` and ``commit``. Consumers call
+    ``latest`` for a zero-copy view and ``is_current`` to confirm it was not
+    overwritten, or ``read_latest`` for a checked copy.
+    """
+
+    def __init__(self, shm, owner):
+        self._shm = shm
+        self._owner = owner
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        n_slots, height, width, channels = (int(value) for value in header[:4])
+        self._header = header
+        self._slot_seq = np.ndarray((n_slots,), dtype=np.int64, buffer=shm.buf, offset=HEADER_FIELDS * 8)
+        self._frames = np.ndarray(
+            (n_slots, height, width, channels), dtype=np.uint8, buffer=shm.buf, offset=(HEADER_FIELDS + n_slots) * 8
+        )
+        self.n_slots = n_slots
+        self.shape = (height, width, channels)
+        self._next_seq = int(header[_LATEST]) + 1
+
+    @classmethod
+    def create(cls, width, height, channels=3, n_slots=8, name=None):
+        """
+        Allocate a new ring (the caller becomes the producer and owner).
+
+        Args:
+            width: Frame width, as reported by ``initialize_camera``
+            height: Frame height, as reported by ``initialize_camera``
+            channels: Channels per pixel
+            n_slots: Number of frame slots; more slots give slow readers longer to finish with a view
+            name: Optional shared-memory name (default: generated)
+
+        Returns:
+            SharedFrameRing: The ring; pass ``ring.name`` to consumers
+        """
+        size = (HEADER_FIELDS + n_slots) * 8 + n_slots * height * width * channels
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[:4] = (n_slots, height, width, channels)
+        np.ndarray((n_slots,), dtype=np.int64, buffer=shm.buf, offset=HEADER_FIELDS * 8)[:] = 0
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Open an existing ring as a consumer.
+
+        Args:
+            name: ``name`` of the producer's ring
+
+        Returns:
+            SharedFrameRing: Read-side handle
+        """
+        return cls(_attach_untracked(name), owner=False)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def latest_seq(self):
+        """Sequence number of the newest committed frame (0 if none)"""
+        return int(self._header[_LATEST])
+
+    def begin_write(self):
+        """
+        Claim the next slot for writing in place.
+
+        Returns:
+            tuple: (seq, writable view of shape (height, width, channels))
+        """
+        seq = self._next_seq
+        slot = seq % self.n_slots
+        # Mark the slot as being rewritten so readers holding its old frame can tell
+        self._slot_seq[slot] = -seq
+        return seq, self._frames[slot]
+
+    def commit(self, seq):
+        """Publish the slot filled since ``begin_write``"""
+        self._slot_seq[seq % self.n_slots] = seq
+        self._header[_LATEST] = seq
+        self._next_seq = seq + 1
+
+    def write(self, frame):
+        """
+        Copy a frame into the next slot and publish it.
+
+        Args:
+            frame: Array of the ring's frame shape
+
+        Returns:
+            int: Sequence number of the frame
+        """
+        seq, view = self.begin_write()
+        np.copyto(view, frame)
+        self.commit(seq)
+        return seq
+
+    def latest(self, last_seq=0):
+        """
+        Get the newest frame as a zero-copy view.
+
+        Args:
+            last_seq: Sequence number the caller already has; older or equal frames return None
+
+        Returns:
+            tuple or None: (seq, read-only view), or None if nothing newer is available
+        """
+        seq = int(self._header[_LATEST])
+        if seq <= last_seq:
+            return None
+        slot = seq % self.n_slots
+        if self._slot_seq[slot] != seq:
+            return None
+        view = self._frames[slot]
+        view.flags.writeable = False
+        return seq, view
+
+    def is_current(self, seq):
+        """True if the slot for ``seq`` still holds that frame (check after using a view)"""
+        return self._slot_seq[seq % self.n_slots] == seq
+
+    def read_latest(self, out=None, last_seq=0):
+        """
+        Copy the newest frame out, retrying if the producer overwrote it mid-copy.
+
+        Args:
+            out: Optional preallocated array to copy into
+            last_seq: Sequence number the caller already has
+
+        Returns:
+            tuple or None: (seq, frame copy), or None if nothing newer is available
+        """
+        for _ in range(4):
+            latest = self.latest(last_seq)
+            if latest is None:
+                return None
+            seq, view = latest
+            if out is None:
+                out = np.empty(self.shape, dtype=np.uint8)
+            np.copyto(out, view)
+            if self.is_current(seq):
+                return seq, out
+        return None
+
+    def close(self):
+        """Release this process's mapping (the owner also removes the block)"""
+        # Drop array views first; the mapping cannot close while they are alive
+        self._header = self._slot_seq = self._frames = None
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _produce_ring(name, n_frames, ready):
+    ring = SharedFrameRing.attach(name)
+    frame = np.random.default_rng(0).integers(0, 255, ring.shape, dtype=np.uint8)
+    ready.wait()
+    for i in range(n_frames):
+        seq, view = ring.begin_write()
+        np.copyto(view, frame)
+        view[0, 0, 0] = i & 0xFF
+        ring.commit(seq)
+    ring.close()
+
+
+def _produce_queue(channel, shape, n_frames, ready):
+    frame = np.random.default_rng(0).integers(0, 255, shape, dtype=np.uint8)
+    ready.wait()
+    for i in range(n_frames):
+        frame[0, 0, 0] = i & 0xFF
+        channel.put(frame)
+    channel.put(None)
+
+
+def benchmark(width=1280, height=720, n_frames=600):
+    """
+    Compare delivering frames between processes through the ring and through a pickled queue.
+
+    Returns:
+        dict: Per transport, producer-side frames per second, wall time per frame, frames the
+        consumer saw, and consumer CPU time per frame seen
+    """
+    ctx = mp_proc.get_context("spawn")
+    shape = (height, width, 3)
+    results = {}
+
+    # Shared-memory ring: the producer in a child process, the consumer here
+    ring = SharedFrameRing.create(width, height)
+    ready = ctx.Event()
+    producer = ctx.Process(target=_produce_ring, args=(ring.name, n_frames, ready))
+    producer.start()
+    ready.set()
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    last_seq, received, checksum = 0, 0, 0
+    while last_seq < n_frames:
+        latest = ring.latest(last_seq)
+        if latest is None:
+            continue
+        seq, view = latest
+        checksum += int(view[0, 0, 0])
+        if ring.is_current(seq):
+            received += 1
+        last_seq = seq
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    producer.join()
+    ring.close()
+    # The ring consumer busy-polls, so its CPU time is an upper bound
+    results["shared_memory_ring"] = {"frames": received, "fps": n_frames / elapsed, "ms_per_frame": elapsed * 1000 / n_frames,
+                                     "consumer_cpu_ms": cpu * 1000 / max(received, 1)}
+
+    # Pickled queue: every frame is serialized, pushed through a pipe and rebuilt
+    channel = ctx.Queue(maxsize=8)
+    ready = ctx.Event()
+    producer = ctx.Process(target=_produce_queue, args=(channel, shape, n_frames, ready))
+    producer.start()
+    ready.set()
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    received = 0
+    while channel.get() is not None:
+        received += 1
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    producer.join()
+    results["pickled_queue"] = {"frames": received, "fps": n_frames / elapsed, "ms_per_frame": elapsed * 1000 / n_frames,
+                                "consumer_cpu_ms": cpu * 1000 / max(received, 1)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared-memory frame ring")
+    parser.add_argument("--bench", action="store_true", help="benchmark against pickled multiprocessing queues")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args()
+    if not args.bench:
+        parser.print_help()
+        return
+
+    print("=" * 60)
+    print(f"FRAME HANDOFF BENCHMARK: {args.frames} frames at {args.width}x{args.height}")
+    print("=" * 60)
+    for transport, result in benchmark(args.width, args.height, args.frames).items():
+        print(f"  {transport:20s} {result['fps']:8.1f} FPS | {result['ms_per_frame']:.2f}ms/frame | "
+              f"{result['frames']} frames seen | consumer CPU {result['consumer_cpu_ms']:.2f}ms/frame")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
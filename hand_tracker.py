@@ -0,0 +1,128 @@
+"""
+Multi-hand tracker with persistent IDs
+
+MediaPipe returns hands in arbitrary order and its handedness label can flip
+between frames, so neither is a stable identity. The tracker matches detections
+to existing tracks by centroid distance and bounding-box overlap in normalized
+image coordinates and keeps an ID per physical hand for as long as it stays in view.
+"""
+import itertools
+import numpy as np
+
+
+class HandTracker:
+    """
+    Frame-to-frame hand association with persistent track IDs.
+
+    With at most ``max_hands`` candidates the optimal assignment is found by
+    scoring every permutation of a padded cost matrix at once, which for 2-4
+    hands is a handful of vectorized operations.
+    """
+
+    def __init__(self, max_hands=2, max_cost=0.35, max_missed=5, iou_weight=0.5):
+        """
+        Args:
+            max_hands: Maximum number of hands tracked at once (MediaPipe's num_hands)
+            max_cost: Match cost above which a detection starts a new track instead
+            max_missed: Consecutive frames a track may go undetected before it is dropped
+            iou_weight: Weight of (1 - bounding-box IoU) relative to centroid distance
+        """
+        self.max_hands = max_hands
+        self.max_cost = max_cost
+        self.max_missed = max_missed
+        self.iou_weight = iou_weight
+
+        # Track state lives in fixed-size arrays indexed by slot
+        self.ids = np.full(max_hands, -1, dtype=np.int64)
+        self.centroids = np.zeros((max_hands, 2))
+        self.boxes = np.zeros((max_hands, 4))
+        self.missed = np.zeros(max_hands, dtype=np.int64)
+        self._next_id = 0
+        self._perms = {n: np.array(list(itertools.permutations(range(n))), dtype=np.int64) for n in range(1, max_hands + 1)}
+
+    @property
+    def active_ids(self):
+        """IDs of all live tracks, oldest first"""
+        return sorted(int(track_id) for track_id in self.ids if track_id >= 0)
+
+    def reset(self):
+        """Drop all tracks"""
+        self.ids.fill(-1)
+        self.missed.fill(0)
+
+    def update(self, hand_landmarks):
+        """
+        Associate this frame's detections with tracks.
+
+        Args:
+            hand_landmarks: Per-hand normalized landmark lists (``result.hand_landmarks``)
+
+        Returns:
+            list: Track ID (always >= 0) for each detection, in detection order
+        """
+        n_detections = min(len(hand_landmarks), self.max_hands)
+        if n_detections == 0:
+            self._age_unmatched(np.zeros(self.max_hands, dtype=bool))
+            return []
+
+        points = np.array([[(lm.x, lm.y) for lm in hand] for hand in hand_landmarks[:n_detections]])
+        centroids = points.mean(axis=1)
+        boxes = np.concatenate((points.min(axis=1), points.max(axis=1)), axis=1)
+
+        # Padded square cost matrix: rows are track slots, columns are detections
+        size = self.max_hands
+        cost = np.full((size, size), self.max_cost)
+        live = self.ids >= 0
+        if live.any():
+            slots = np.flatnonzero(live)
+            distance = np.linalg.norm(self.centroids[slots, None, :] - centroids[None, :, :], axis=2)
+            cost[slots[:, None], np.arange(n_detections)[None, :]] = distance + self.iou_weight * (1.0 - _iou(self.boxes[slots], boxes))
+
+        perms = self._perms[size]
+        totals = cost[np.arange(size)[None, :], perms].sum(axis=1)
+        assignment = perms[np.argmin(totals)]
+
+        track_ids = [-1] * n_detections
+        matched = np.zeros(size, dtype=bool)
+        for slot, detection in enumerate(assignment):
+            if detection < n_detections and live[slot] and cost[slot, detection] < self.max_cost:
+                track_ids[detection] = int(self.ids[slot])
+                self._assign(slot, centroids[detection], boxes[detection])
+                matched[slot] = True
+        self._age_unmatched(matched)
+
+        # Unmatched detections start new tracks in free slots, or replace the stalest unmatched track.
+        # There are never more detections than slots, so every detection gets a slot.
+        for detection in range(n_detections):
+            if track_ids[detection] >= 0:
+                continue
+            unmatched = np.flatnonzero(~matched)
+            free = unmatched[self.ids[unmatched] < 0]
+            slot = free[0] if len(free) else unmatched[np.argmax(self.missed[unmatched])]
+            matched[slot] = True
+            self.ids[slot] = self._next_id
+            self._next_id += 1
+            self._assign(slot, centroids[detection], boxes[detection])
+            track_ids[detection] = int(self.ids[slot])
+        return track_ids
+
+    def _assign(self, slot, centroid, box):
+        self.centroids[slot] = centroid
+        self.boxes[slot] = box
+        self.missed[slot] = 0
+
+    def _age_unmatched(self, matched):
+        aging = (self.ids >= 0) & ~matched
+        self.missed[aging] += 1
+        self.ids[aging & (self.missed > self.max_missed)] = -1
+
+
+def _iou(boxes_a, boxes_b):
+    """Pairwise IoU between (n, 4) and (m, 4) boxes given as (x1, y1, x2, y2)"""
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0.0, None), axis=2)
+    area_a = np.prod(boxes_a[:, 2:] - boxes_a[:, :2], axis=1)
+    area_b = np.prod(boxes_b[:, 2:] - boxes_b[:, :2], axis=1)
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return np.where(union > 0, intersection / np.maximum(union, 1e-12), 0.0)
@@ -0,0 +1,88 @@
+"""
+Latest-value mailbox for handing data between the MediaPipe callback thread and the render loop
+"""
+import threading
+
+
+class LatestValueMailbox:
+    """
+    Sequence-numbered single-slot mailbox.
+
+    Producers overwrite the slot with a new value and a strictly increasing
+    sequence number; consumers always see the newest value and never a backlog.
+    The slot is a single immutable ``(seq, value)`` tuple that is replaced with
+    one reference assignment, so readers never take a lock and can never observe
+    a sequence number paired with another publish's value.
+    """
+
+    def __init__(self, initial=None):
+        """
+        Args:
+            initial: Value returned before anything has been published (seq 0)
+        """
+        self._slot = (0, initial)
+        # Only producers (and waiting consumers) touch the condition; plain reads stay lock-free
+        self._cond = threading.Condition(threading.Lock())
+
+    @property
+    def seq(self):
+        """Sequence number of the newest value (0 until the first publish)"""
+        return self._slot[0]
+
+    def publish(self, value):
+        """
+        Replace the slot with a new value.
+
+        Args:
+            value: Object to publish. Consumers share it, so it must not be mutated afterwards.
+
+        Returns:
+            int: Sequence number assigned to the value
+        """
+        with self._cond:
+            seq = self._slot[0] + 1
+            self._slot = (seq, value)
+            self._cond.notify_all()
+        return seq
+
+    def latest(self):
+        """
+        Get the newest value in O(1) without locking.
+
+        Returns:
+            tuple: (seq, value)
+        """
+        return self._slot
+
+    def poll(self, last_seq):
+        """
+        Get the newest value only if it is newer than the one already consumed.
+
+        Args:
+            last_seq: Sequence number the caller saw last
+
+        Returns:
+            tuple or None: (seq, value) if something newer was published, None otherwise
+        """
+        slot = self._slot
+        if slot[0] == last_seq:
+            return None
+        return slot
+
+    def wait(self, last_seq, timeout=None):
+        """
+        Block until a value newer than ``last_seq`` is published.
+
+        Args:
+            last_seq: Sequence number the caller saw last
+            timeout: Maximum time to wait in seconds (None waits forever)
+
+        Returns:
+            tuple or None: (seq, value), or None if the timeout expired first
+        """
+        slot = self._slot
+        if slot[0] != last_seq:
+            return slot
+        with self._cond:
+            self._cond.wait_for(lambda: self._slot[0] != last_seq, timeout)
+        return self.poll(last_seq)
@@ -0,0 +1,144 @@
+"""
+Per-letter recognition latency
+
+For each target letter the game asks for, ``LetterLatency`` measures how long
+the user and the model take: from the letter becoming the target to the first
+frame the classifier's top class is that letter (time to first hit), and to its
+acceptance (time to accept). Frames whose top class is another letter are
+counted per (target, predicted) pair, and so are wrong acceptances.
+
+Everything lives in fixed-size arrays (26 letters x a few histogram bins), and
+``observe`` does a constant amount of work per frame: a dict lookup, a
+comparison and at most a bisect over the bin edges and two increments.
+"""
+import bisect
+import string
+import threading
+import time
+import numpy as np
+
+LETTERS = string.ascii_uppercase
+# Upper bin edges in milliseconds; the last bin holds everything slower
+DEFAULT_EDGES_MS = (250, 500, 750, 1000, 1500, 2000, 3000, 5000, 8000)
+
+
+class LetterLatency:
+    """
+    Fixed-memory histograms of time to first hit and time to accept, per target letter.
+
+    Usage:
+        engine.latency = LetterLatency()
+        engine.latency.set_target("H")   # game thread, whenever the target changes
+        engine.latency.snapshot()        # per-letter histograms and wrong-class counts
+    """
+
+    def __init__(self, edges_ms=DEFAULT_EDGES_MS, clock=time.monotonic):
+        """
+        Args:
+            edges_ms: Ascending upper edges of the histogram bins, in milliseconds
+            clock: Seconds clock shared by set_target and observe
+        """
+        self.edges_ms = tuple(edges_ms)
+        self.clock = clock
+        self._index = {letter: row for row, letter in enumerate(LETTERS)}
+        n_bins = len(self.edges_ms) + 1
+        self.targets = np.zeros(len(LETTERS), dtype=np.int64)
+        self.first_hit = np.zeros((len(LETTERS), n_bins), dtype=np.int64)
+        self.accept = np.zeros((len(LETTERS), n_bins), dtype=np.int64)
+        self.wrong_frames = np.zeros((len(LETTERS), len(LETTERS)), dtype=np.int64)  # target x predicted
+        self.wrong_accepts = np.zeros(len(LETTERS), dtype=np.int64)
+        self._lock = threading.Lock()  # between observe (callback thread) and snapshot/reset
+        # [target row, start time, first hit seen] for the active target, or None
+        self._target = None
+        self._last_key = None
+
+    def set_target(self, letter):
+        """
+        Start timing a target letter (None: no target, e.g. between games).
+
+        Args:
+            letter: Target letter
+        """
+        row = self._index.get(letter.upper()) if letter else None
+        with self._lock:
+            if row is None:
+                self._target = None
+                return
+            self.targets[row] += 1
+            self._target = [row, self.clock(), False]
+
+    def observe(self, predicted, accepted, accept_key):
+        """
+        Account one frame of the hand being timed (callback thread, O(1)).
+
+        Args:
+            predicted: Top class this frame
+            accepted: Accepted letter (held between acceptances), or None
+            accept_key: Changes on every fresh acceptance (e.g. (track ID, HandPrediction.accept_key))
+        """
+        fresh = accept_key != self._last_key and accepted is not None
+        self._last_key = accept_key
+        target = self._target
+        if target is None:
+            return
+        row, started, hit = target
+        predicted_row = self._index.get(str(predicted).upper())
+        with self._lock:
+            if predicted_row == row:
+                if not hit:
+                    target[2] = True
+                    self.first_hit[row, self._bin(started)] += 1
+            elif predicted_row is not None:
+                self.wrong_frames[row, predicted_row] += 1
+            if fresh:
+                if self._index.get(str(accepted).upper()) == row:
+                    self.accept[row, self._bin(started)] += 1
+                    # Timed once; the game sets the next target (unless it already has)
+                    if self._target is target:
+                        self._target = None
+                else:
+                    self.wrong_accepts[row] += 1
+
+    def _bin(self, started):
+        return bisect.bisect_left(self.edges_ms, (self.clock() - started) * 1000)
+
+    def reset(self):
+        """Clear all counts"""
+        with self._lock:
+            for array in (self.targets, self.first_hit, self.accept, self.wrong_frames, self.wrong_accepts):
+                array[:] = 0
+
+    def snapshot(self, top=3):
+        """
+        JSON-serializable histograms for letters that have been a target.
+
+        Args:
+            top: Most frequent wrong classes listed per letter
+
+        Returns:
+            dict: edges_ms, and per letter: targets, first_hit and accept histograms, approximate median
+            time to accept (upper edge of the median bin; the last edge when it is the overflow bin),
+            wrong_accepts and the top wrong classes
+        """
+        with self._lock:
+            targets, first_hit, accept = self.targets.copy(), self.first_hit.copy(), self.accept.copy()
+            wrong_frames, wrong_accepts = self.wrong_frames.copy(), self.wrong_accepts.copy()
+        letters = {}
+        for row in np.flatnonzero(targets):
+            wrong = np.argsort(wrong_frames[row])[::-1][:top]
+            letters[LETTERS[row]] = {
+                "targets": int(targets[row]),
+                "first_hit": first_hit[row].tolist(),
+                "accept": accept[row].tolist(),
+                "median_accept_ms": self._median_edge(accept[row]),
+                "wrong_accepts": int(wrong_accepts[row]),
+                "wrong_classes": {LETTERS[column]: int(wrong_frames[row, column]) for column in wrong if wrong_frames[row, column]},
+            }
+        return {"edges_ms": list(self.edges_ms), "letters": letters}
+
+    def _median_edge(self, counts):
+        total = counts.sum()
+        if not total:
+            return None
+        median_bin = int(np.searchsorted(np.cumsum(counts), (total + 1) / 2))
+        return self.edges_ms[min(median_bin, len(self.edges_ms) - 1)]
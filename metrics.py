@@ -0,0 +1,75 @@
+"""
+Thread-safe runtime metrics: counters, gauges and timing summaries
+"""
+import threading
+
+
+class MetricsRegistry:
+    """
+    Named counters, gauges and timings shared by the camera thread, the MediaPipe
+    callback and the web console.
+
+    Updates take one short lock; ``snapshot`` returns plain dicts that can be sent
+    as JSON.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._timings = {}  # name -> [count, total, max]
+
+    def increment(self, name, amount=1):
+        """Add to a counter (created at zero)"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def set_gauge(self, name, value):
+        """Set a gauge to its current value"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name, value):
+        """
+        Record one measurement, e.g. a duration in milliseconds.
+
+        Args:
+            name: Timing name
+            value: Measured value
+        """
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                self._timings[name] = [1, value, value]
+            else:
+                timing[0] += 1
+                timing[1] += value
+                timing[2] = max(timing[2], value)
+
+    def counter(self, name):
+        """Current value of a counter (0 if never incremented)"""
+        return self._counters.get(name, 0)
+
+    def snapshot(self):
+        """
+        Copy every metric.
+
+        Returns:
+            dict: ``counters``, ``gauges`` and ``timings`` (count, mean and max per name)
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": {
+                    name: {"count": count, "mean": total / count, "max": peak}
+                    for name, (count, total, peak) in self._timings.items()
+                },
+            }
+
+    def reset(self):
+        """Clear every metric"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
@@ -0,0 +1,289 @@
+"""
+Hot-reloadable classifier artifacts
+
+``ModelHolder`` keeps the active classifier, scaler and labels as one immutable
+``LoadedModel``. Readers take ``holder.current`` once per frame and use only
+that object, so a swap can never hand them a classifier from one version and a
+scaler from another. New versions are loaded, validated and warmed up on a
+background thread; only a model that passed all three replaces the current one,
+with a single reference assignment.
+
+Reloads are requested explicitly (``request_reload``, e.g. from the web console)
+or found by ``watch``, which polls ``archive/`` for a higher
+``predictor_vN.pkl``/``scaler_vN.pkl`` pair.
+"""
+import json
+import os
+import queue
+import re
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+from startup import lazy_import
+from classification import FEATURE_COLUMNS, classifier_letters, predict_proba
+
+joblib = lazy_import("joblib")
+
+ARCHIVE_DIR = "archive"
+
+# version is None for artifacts that do not follow the predictor_vN naming;
+# manifest is the predictor_vN.json written by train_model.py, or None
+LoadedModel = namedtuple("LoadedModel", ["version", "classifier", "scaler", "labels", "manifest"])
+
+_VERSION_PATTERN = re.compile(r"predictor_v(\d+)\.pkl")
+
+
+def artifact_paths(version, archive_dir=ARCHIVE_DIR):
+    """
+    Artifact file names of one version.
+
+    Returns:
+        tuple: (predictor path, scaler path, manifest path)
+    """
+    return (
+        os.path.join(archive_dir, f"predictor_v{version}.pkl"),
+        os.path.join(archive_dir, f"scaler_v{version}.pkl"),
+        os.path.join(archive_dir, f"predictor_v{version}.json"),
+    )
+
+
+def available_versions(archive_dir=ARCHIVE_DIR):
+    """
+    Versions with both a predictor and a scaler in the archive.
+
+    Returns:
+        list: Version numbers, ascending
+    """
+    if not os.path.isdir(archive_dir):
+        return []
+    names = set(os.listdir(archive_dir))
+    versions = []
+    for name in names:
+        match = _VERSION_PATTERN.fullmatch(name)
+        if match and f"scaler_v{match.group(1)}.pkl" in names:
+            versions.append(int(match.group(1)))
+    return sorted(versions)
+
+
+def load_model(classifier_path, scaler_path, manifest_path=None, samples=None):
+    """
+    Load, validate and warm up one classifier/scaler pair.
+
+    Args:
+        classifier_path: Pickled classifier
+        scaler_path: Pickled scaler
+        manifest_path: Optional manifest whose feature schema must match this app's
+        samples: Optional unscaled feature rows to warm up on (default: zeros)
+
+    Returns:
+        LoadedModel
+
+    Raises:
+        ValueError: If the artifacts do not fit the app's features or produce bad probabilities
+    """
+    manifest = None
+    if manifest_path is not None and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        columns = manifest.get("feature_schema", {}).get("columns")
+        if columns is not None and columns != FEATURE_COLUMNS:
+            raise ValueError(f"feature schema mismatch: model expects {len(columns)} columns {columns[:3]}...")
+
+    with open(classifier_path, "rb") as f:
+        classifier = joblib.load(f)
+    with open(scaler_path, "rb") as f:
+        scaler = joblib.load(f)
+
+    n_features = getattr(scaler, "n_features_in_", len(FEATURE_COLUMNS))
+    if n_features != len(FEATURE_COLUMNS):
+        raise ValueError(f"scaler expects {n_features} features, the app produces {len(FEATURE_COLUMNS)}")
+    labels = classifier_letters(classifier)
+    if not labels:
+        raise ValueError("classifier has no classes")
+
+    # Warm up on the shapes the app uses (one hand, two hands); the first calls pay for lazy setup
+    if samples is None or len(samples) == 0:
+        samples = np.zeros((2, len(FEATURE_COLUMNS)))
+    for data in (samples[:1], samples[:2], samples):
+        probs = predict_proba(classifier, scaler.transform(data))
+        if probs.shape != (len(data), len(labels)) or not np.all(np.isfinite(probs)):
+            raise ValueError(f"classifier returned probabilities of shape {probs.shape} for {len(data)} rows")
+
+    match = _VERSION_PATTERN.fullmatch(os.path.basename(classifier_path))
+    version = int(match.group(1)) if match else None
+    return LoadedModel(version, classifier, scaler, labels, manifest)
+
+
+class ModelHolder:
+    """
+    The active LoadedModel plus a background loader that replaces it.
+
+    ``current`` is read without a lock: replacing it is one reference assignment,
+    and every reader works on the object it read.
+    """
+
+    def __init__(self, archive_dir=ARCHIVE_DIR, metrics=None, on_swap=None, n_samples=32):
+        """
+        Args:
+            archive_dir: Directory holding versioned artifacts
+            metrics: Optional MetricsRegistry for load/swap timings, reload counts and the model version
+            on_swap: Optional callable receiving each newly active LoadedModel (on the loader thread)
+            n_samples: Recent feature rows kept for warming up new versions
+        """
+        self.archive_dir = archive_dir
+        self.metrics = metrics
+        self.on_swap = on_swap
+        self.current = None
+        self.last_error = None
+        self._samples = np.zeros((n_samples, len(FEATURE_COLUMNS)))
+        self._n_samples = 0
+        self._sample_pos = 0
+        self._requests = queue.Queue()
+        self._loader = None
+        self._loader_lock = threading.Lock()
+        self._reload_lock = threading.Lock()  # one load at a time, from requests or the watcher
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def load(self, classifier_path, scaler_path):
+        """Load artifacts synchronously and make them current (startup)"""
+        manifest_path = os.path.splitext(classifier_path)[0] + ".json"
+        start = time.perf_counter()
+        model = load_model(classifier_path, scaler_path, manifest_path)
+        if self.metrics is not None:
+            self.metrics.observe("model_load_ms", (time.perf_counter() - start) * 1000)
+        self.swap(model)
+        return model
+
+    def swap(self, model):
+        """Make a loaded model current"""
+        start = time.perf_counter()
+        self.current = model
+        swap_ms = (time.perf_counter() - start) * 1000
+        if self.metrics is not None:
+            self.metrics.observe("model_swap_ms", swap_ms)
+            self.metrics.set_gauge("model_version", model.version)
+        if self.on_swap is not None:
+            self.on_swap(model)
+
+    def record_samples(self, features):
+        """Keep recent unscaled feature rows for warming up the next version (cheap; called per frame)"""
+        for row in features:
+            self._samples[self._sample_pos] = row
+            self._sample_pos = (self._sample_pos + 1) % len(self._samples)
+            self._n_samples = min(self._n_samples + 1, len(self._samples))
+
+    def request_reload(self, version=None):
+        """
+        Load a version in the background and swap it in if it validates.
+
+        Args:
+            version: Version number (default: the highest in the archive)
+        """
+        with self._loader_lock:
+            self._requests.put(version)
+            if self._loader is None:
+                self._loader = threading.Thread(target=self._load_requests, daemon=True)
+                self._loader.start()
+
+    def watch(self, interval=2.0):
+        """Poll the archive in the background and reload when a higher version appears"""
+        if self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, args=(interval,), daemon=True)
+            self._watcher.start()
+
+    def stop(self):
+        """Stop watching"""
+        self._stop.set()
+
+    def status(self):
+        """
+        JSON-serializable description of the current model.
+
+        Returns:
+            dict: version, labels, accuracy and latency from the manifest (if any), available versions, last error
+        """
+        model = self.current
+        status = {
+            "version": model.version if model else None,
+            "labels": model.labels if model else [],
+            "available": available_versions(self.archive_dir),
+            "last_error": self.last_error,
+        }
+        if model is not None and hasattr(model.classifier, "stats"):
+            # Early-exit cascade: live fraction of rows answered by the cheap stages
+            status["cascade"] = model.classifier.stats()
+        if model is not None and model.manifest is not None:
+            status["model"] = model.manifest.get("model")
+            status["accuracy"] = model.manifest.get("accuracy")
+            status["latency"] = model.manifest.get("latency")
+        return status
+
+    def _load_requests(self):
+        while True:
+            # Checked under the lock, so a request made while this thread exits starts a new one
+            with self._loader_lock:
+                try:
+                    version = self._requests.get_nowait()
+                except queue.Empty:
+                    self._loader = None
+                    return
+            self._reload(version)
+
+    def _reload(self, version):
+        with self._reload_lock:
+            return self._reload_locked(version)
+
+    def _reload_locked(self, version):
+        if version is None:
+            versions = available_versions(self.archive_dir)
+            if not versions:
+                self._failed("no versions in archive")
+                return False
+            version = versions[-1]
+        classifier_path, scaler_path, manifest_path = artifact_paths(version, self.archive_dir)
+        samples = self._samples[:self._n_samples].copy() if self._n_samples else None
+        start = time.perf_counter()
+        try:
+            model = load_model(classifier_path, scaler_path, manifest_path, samples)
+        except Exception as e:
+            self._failed(f"v{version}: {e!r}")
+            return False
+        if self.metrics is not None:
+            self.metrics.observe("model_load_ms", (time.perf_counter() - start) * 1000)
+            self.metrics.increment("model_reloads")
+        self.last_error = None
+        self.swap(model)
+        print(f"Model v{version} active (loaded and warmed up in {(time.perf_counter() - start) * 1000:.0f}ms)")
+        return True
+
+    def _failed(self, error):
+        self.last_error = error
+        if self.metrics is not None:
+            self.metrics.increment("model_reload_failures")
+        print(f"Model reload failed: {error}")
+
+    def _watch(self, interval):
+        # A version is loaded once its manifest exists (train_model.py writes it last), or, for
+        # hand-copied pickles, once their sizes and modification times held still for one poll
+        seen = {}
+        failed = set()
+        while not self._stop.wait(interval):
+            versions = available_versions(self.archive_dir)
+            if not versions:
+                continue
+            version = versions[-1]
+            current = self.current.version if self.current is not None else None
+            if (current is not None and version <= current) or version in failed:
+                continue
+            classifier_path, scaler_path, manifest_path = artifact_paths(version, self.archive_dir)
+            try:
+                signature = tuple((os.path.getsize(path), os.path.getmtime(path)) for path in (classifier_path, scaler_path))
+            except OSError:
+                continue
+            stable = os.path.exists(manifest_path) or seen.get(version) == signature
+            seen[version] = signature
+            if stable and not self._reload(version):
+                # Do not retry a broken version every poll; a higher one will still be picked up
+                failed.add(version)
@@ -0,0 +1,90 @@
+"""
+Frame-difference gate that skips hand detection on static scenes
+
+Each frame is shrunk to a tiny grayscale thumbnail and compared with the
+thumbnail of the last frame that went through detection. Below the change
+threshold the caller reuses the previous landmarks instead of running
+MediaPipe; a full detection is still forced every ``force_every`` frames so a
+missed change cannot leave stale landmarks in place for long.
+"""
+import numpy as np
+from startup import lazy_import
+
+cv2 = lazy_import("cv2")
+
+
+class MotionGate:
+    """
+    Decides per frame whether detection needs to run.
+
+    All thumbnails live in buffers allocated once. The frame is first subsampled by
+    striding (a view, no copy) to about four times the thumbnail size, so the area
+    resize that averages out sensor noise touches only a small fraction of the pixels.
+    """
+
+    def __init__(self, thumb_size=(32, 24), threshold=2.5, force_every=15, metrics=None):
+        """
+        Args:
+            thumb_size: (width, height) of the comparison thumbnail
+            threshold: Mean absolute gray-level change (0-255) that counts as motion
+            force_every: Run detection at least once per this many frames
+            metrics: Optional MetricsRegistry that receives gate_motion/gate_forced/gate_skipped counts
+        """
+        width, height = thumb_size
+        self.thumb_size = thumb_size
+        self.threshold = threshold
+        self.force_every = force_every
+        self.metrics = metrics
+        self.score = 0.0
+        self.decisions = {"motion": 0, "forced": 0, "skipped": 0}
+        self._small = np.empty((height, width, 3), dtype=np.uint8)
+        self._gray = np.empty((height, width), dtype=np.uint8)
+        self._reference = np.empty((height, width), dtype=np.uint8)
+        self._diff = np.empty((height, width), dtype=np.uint8)
+        self._has_reference = False
+        self._since_detection = 0
+
+    def check(self, frame):
+        """
+        Score a frame against the last detected one.
+
+        Args:
+            frame: BGR frame
+
+        Returns:
+            bool: True if detection should run on this frame, False to reuse the previous landmarks
+        """
+        width, height = self.thumb_size
+        step = max(1, min(frame.shape[0] // (4 * height), frame.shape[1] // (4 * width)))
+        cv2.resize(frame[::step, ::step], self.thumb_size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        if self._has_reference:
+            cv2.absdiff(self._gray, self._reference, dst=self._diff)
+            self.score = float(self._diff.mean())
+        else:
+            self.score = float("inf")
+
+        if self.score >= self.threshold:
+            decision = "motion"
+        elif self._since_detection + 1 >= self.force_every:
+            decision = "forced"
+        else:
+            decision = "skipped"
+        self.decisions[decision] += 1
+        if self.metrics is not None:
+            self.metrics.increment(f"gate_{decision}")
+            self.metrics.set_gauge("gate_score", self.score if self._has_reference else None)
+
+        if decision == "skipped":
+            self._since_detection += 1
+            return False
+        # This frame becomes the reference; swap buffers rather than copy
+        self._reference, self._gray = self._gray, self._reference
+        self._has_reference = True
+        self._since_detection = 0
+        return True
+
+    def reset(self):
+        """Forget the reference so the next frame is always detected"""
+        self._has_reference = False
+        self._since_detection = 0
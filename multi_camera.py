@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Multi-camera capture with one detection worker process per camera
+
+Each worker owns its capture and a SignRecognizer engine (VIDEO mode: landmarker,
+classifier, hand tracker and letter acceptors), pinned to its own share of the CPU cores. Results
+(hand letters, landmarks and per-stage timings) flow back through one shared
+queue; the frames themselves are captured straight into a per-worker
+SharedFrameRing, whose name arrives in the "ready" message, so they are never
+pickled. The supervisor restarts workers that die, with exponential backoff.
+
+Usage:
+    python multi_camera.py --sources 0 1               # live webcams
+    python multi_camera.py --sources a.mp4 b.mp4       # video files, report throughput
+    python multi_camera.py --bench clip.mp4 --max-workers 4
+"""
+import argparse
+import os
+import queue
+import threading
+import time
+import multiprocessing as mp_proc
+
+MODEL_PATH = "./models/hand_landmarker.task"
+CLASSIFIER_PATH = "archive/predictor_v1.pkl"
+SCALER_PATH = "archive/scaler_v1.pkl"
+# How long a worker waits for room in the result queue for a "ready", "done" or "error" message
+CONTROL_TIMEOUT = 5.0
+
+
+def parse_source(source):
+    """Interpret a source argument as a camera index when it is an integer, else as a file path"""
+    return int(source) if str(source).isdigit() else source
+
+
+def assign_cores(n_workers, reserve_main=True):
+    """
+    Split the cores this process may run on into one contiguous group per worker.
+
+    Args:
+        n_workers: Number of worker processes
+        reserve_main: Keep the first core for the main (game/render) process when there are enough cores
+
+    Returns:
+        list: One list of core IDs per worker, or Nones where affinity is unsupported
+    """
+    if not hasattr(os, "sched_getaffinity"):
+        return [None] * n_workers
+    cores = sorted(os.sched_getaffinity(0))
+    if reserve_main and len(cores) > n_workers:
+        cores = cores[1:]
+    if len(cores) < n_workers:
+        # Fewer cores than workers: share them round-robin
+        return [[cores[i % len(cores)]] for i in range(n_workers)]
+    per_worker = len(cores) // n_workers
+    return [cores[i * per_worker:(i + 1) * per_worker] for i in range(n_workers)]
+
+
+def camera_worker(worker_id, source, result_queue, stop_event, cores, loop_video):
+    """
+    Capture, detect and classify frames from one source until stopped (runs in its own process).
+
+    Messages put on ``result_queue`` are dicts with a ``type`` of "ready", "frame",
+    "done" (a video file ended) or "error". A camera that stops delivering frames is an
+    error: the worker exits nonzero so the supervisor restarts it.
+    """
+    # Heavy imports happen in the worker so the supervisor process stays light
+    import cv2
+    from platform_utils import initialize_camera
+    from sign_engine import SignRecognizer, EngineOptions, VIDEO
+    from frame_ring import SharedFrameRing
+
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    # One OpenCV thread per worker; parallelism comes from the processes
+    cv2.setNumThreads(1)
+    # Results are replaceable: never hold up process exit to flush them
+    result_queue.cancel_join_thread()
+
+    def send(message):
+        try:
+            if message["type"] == "frame":
+                result_queue.put_nowait(message)
+            else:
+                # Control messages are not replaceable: a lost "ready" would leave the game on a dead ring
+                result_queue.put(message, timeout=CONTROL_TIMEOUT)
+            return True
+        except queue.Full:
+            return False
+
+    ring = None
+    try:
+        engine = SignRecognizer(EngineOptions(
+            model_path=MODEL_PATH,
+            classifier_path=CLASSIFIER_PATH,
+            scaler_path=SCALER_PATH,
+            running_mode=VIDEO,
+            overlay=None,  # the game draws from the frame ring, not from worker overlays
+            warm_up=False,
+        ))
+        engine.load_classifier()
+
+        if isinstance(source, int):
+            cam, fps, width, height, backend_name = initialize_camera(camera_index=source, target_fps=60)
+            # Some backends report 0 FPS; timestamps only need to increase
+            fps = fps or 30.0
+        else:
+            cam = cv2.VideoCapture(source)
+            if not cam.isOpened():
+                raise RuntimeError(f"Could not open video {source}")
+            fps = cam.get(cv2.CAP_PROP_FPS) or 30.0
+            width = int(cam.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cam.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            backend_name = "file"
+
+        engine.create_landmarker()
+        ring = SharedFrameRing.create(width, height)
+        send({"type": "ready", "worker": worker_id, "source": source, "width": width, "height": height,
+              "fps": fps, "backend": backend_name, "cores": cores, "pid": os.getpid(), "frame_ring": ring.name})
+
+        frame_index = 0
+        dropped = 0
+        with engine:
+            while not stop_event.is_set():
+                read_start = time.perf_counter()
+                # Decode straight into the next ring slot; it is published once the frame is complete
+                seq, slot = ring.begin_write()
+                ret, frame = cam.read(slot)
+                if not ret:
+                    if isinstance(source, int):
+                        raise RuntimeError(f"Camera {source} stopped delivering frames")
+                    if loop_video:
+                        cam.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        continue
+                    break
+                if frame is not slot:
+                    # OpenCV reallocated because the source size differs from what it reported
+                    cv2.resize(frame, (ring.shape[1], ring.shape[0]), dst=slot)
+                ring.commit(seq)
+                detect_start = time.perf_counter()
+                # VIDEO mode only needs monotonically increasing timestamps
+                result = engine.process(frame, int(frame_index * 1000.0 / fps))
+                hands = [
+                    {
+                        "track_id": hand.track_id,
+                        "accept_key": hand.accept_key,
+                        "letter": hand.letter,
+                        "confidence": hand.confidence,
+                        "raw": str(hand.raw).upper(),
+                        "probs": hand.probs.tolist(),
+                        "landmarks": hand.features[1:].tolist(),
+                    }
+                    for hand in result.hands
+                ]
+                done = time.perf_counter()
+
+                frame_index += 1
+                if not send({
+                    "type": "frame",
+                    "worker": worker_id,
+                    "frame": frame_index,
+                    "frame_seq": seq,
+                    "time": done,
+                    "hands": hands,
+                    "live_ids": list(result.live_ids),
+                    "dropped": dropped,
+                    "timings": {
+                        "read_ms": (detect_start - read_start) * 1000,
+                        "detect_ms": result.timings["detect_ms"],
+                        "classify_ms": result.timings["classify_ms"],
+                    },
+                }):
+                    # The consumer is behind; results are replaceable, so drop rather than block capture
+                    dropped += 1
+        cam.release()
+        send({"type": "done", "worker": worker_id, "frames": frame_index, "dropped": dropped})
+    except Exception as e:
+        send({"type": "error", "worker": worker_id, "error": repr(e)})
+        raise
+    finally:
+        if ring is not None:
+            ring.close()
+
+
+class CameraSupervisor:
+    """
+    Starts one worker process per source, restarts failed workers and collects their results.
+    """
+
+    def __init__(self, sources, loop_video=False, max_restarts=5, queue_size=512, worker=camera_worker):
+        """
+        Args:
+            sources: Camera indices and/or video file paths
+            loop_video: Rewind video files instead of finishing at the end
+            max_restarts: Restarts allowed per worker before it is given up on
+            queue_size: Capacity of the shared result queue
+            worker: Picklable process target with camera_worker's signature; exit code 0 means finished
+        """
+        self.sources = [parse_source(source) for source in sources]
+        self.loop_video = loop_video
+        self.max_restarts = max_restarts
+        self.worker = worker
+        # Spawn, not fork: the parent may already run MediaPipe/OpenCV threads
+        self._ctx = mp_proc.get_context("spawn")
+        self.results = self._ctx.Queue(maxsize=queue_size)
+        self._stop = self._ctx.Event()
+        self._cores = assign_cores(len(self.sources))
+        self._processes = [None] * len(self.sources)
+        self._restarts = [0] * len(self.sources)
+        self._next_start = [0.0] * len(self.sources)
+        self._finished = [False] * len(self.sources)
+        self._stats = [{"frames": 0, "detect_ms": 0.0, "classify_ms": 0.0, "dropped": 0, "started": None, "last": None}
+                       for _ in self.sources]
+        self._lock = threading.Lock()
+        self._monitor = None
+
+    def start(self):
+        """Start all workers and the restart monitor"""
+        for worker_id in range(len(self.sources)):
+            self._spawn(worker_id)
+        self._monitor = threading.Thread(target=self._watch, daemon=True)
+        self._monitor.start()
+
+    def stop(self, timeout=5.0):
+        """Ask all workers to stop and wait for them"""
+        self._stop.set()
+        for process in self._processes:
+            if process is not None:
+                process.join(timeout)
+                if process.is_alive():
+                    process.terminate()
+
+    @property
+    def running(self):
+        """True while any worker is alive or due for a restart"""
+        return not self._stop.is_set() and not all(self._finished)
+
+    def _spawn(self, worker_id):
+        process = self._ctx.Process(
+            target=self.worker,
+            args=(worker_id, self.sources[worker_id], self.results, self._stop, self._cores[worker_id], self.loop_video),
+            daemon=True,
+            name=f"camera-worker-{worker_id}",
+        )
+        process.start()
+        self._processes[worker_id] = process
+
+    def _watch(self):
+        while not self._stop.is_set():
+            for worker_id, process in enumerate(self._processes):
+                if self._finished[worker_id] or process is None or process.is_alive():
+                    continue
+                if process.exitcode == 0:
+                    self._finished[worker_id] = True
+                    continue
+                now = time.monotonic()
+                if self._restarts[worker_id] >= self.max_restarts:
+                    print(f"Camera worker {worker_id} failed {self._restarts[worker_id]} times, giving up")
+                    self._finished[worker_id] = True
+                    continue
+                if self._next_start[worker_id] == 0.0:
+                    # Exponential backoff so a camera that keeps failing does not spin
+                    self._next_start[worker_id] = now + min(30.0, 0.5 * 2 ** self._restarts[worker_id])
+                elif now >= self._next_start[worker_id]:
+                    self._restarts[worker_id] += 1
+                    self._next_start[worker_id] = 0.0
+                    print(f"Restarting camera worker {worker_id} (attempt {self._restarts[worker_id]})")
+                    self._spawn(worker_id)
+            time.sleep(0.1)
+
+    def poll(self, timeout=None):
+        """
+        Get the next message from any worker and fold it into the statistics.
+
+        Args:
+            timeout: Seconds to wait (None blocks)
+
+        Returns:
+            dict or None: The message, or None on timeout
+        """
+        try:
+            message = self.results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if message["type"] == "frame":
+            with self._lock:
+                stats = self._stats[message["worker"]]
+                if stats["started"] is None:
+                    stats["started"] = message["time"]
+                stats["frames"] += 1
+                stats["detect_ms"] += message["timings"]["detect_ms"]
+                stats["classify_ms"] += message["timings"]["classify_ms"]
+                stats["dropped"] = message["dropped"]
+                stats["last"] = message["time"]
+        return message
+
+    def summary(self):
+        """
+        Per-worker and aggregate throughput.
+
+        Returns:
+            dict: ``workers`` list (source, frames, fps, mean detect/classify ms, dropped, restarts,
+            cores) and ``total_fps``
+        """
+        workers = []
+        with self._lock:
+            for worker_id, stats in enumerate(self._stats):
+                frames = stats["frames"]
+                span = (stats["last"] - stats["started"]) if frames > 1 else 0.0
+                workers.append({
+                    "source": str(self.sources[worker_id]),
+                    "frames": frames,
+                    "fps": (frames - 1) / span if span > 0 else 0.0,
+                    "detect_ms": stats["detect_ms"] / frames if frames else 0.0,
+                    "classify_ms": stats["classify_ms"] / frames if frames else 0.0,
+                    "dropped": stats["dropped"],
+                    "restarts": self._restarts[worker_id],
+                    "cores": self._cores[worker_id],
+                    "alive": self._processes[worker_id] is not None and self._processes[worker_id].is_alive(),
+                })
+        return {"workers": workers, "total_fps": sum(worker["fps"] for worker in workers)}
+
+
+def run(sources, duration, loop_video=False):
+    """Run a supervisor over the sources for a while and return its summary"""
+    supervisor = CameraSupervisor(sources, loop_video=loop_video)
+    supervisor.start()
+    deadline = time.monotonic() + duration
+    try:
+        while supervisor.running and time.monotonic() < deadline:
+            message = supervisor.poll(timeout=0.5)
+            if message is not None and message["type"] == "error":
+                print(f"Worker {message['worker']} error: {message['error']}")
+    finally:
+        supervisor.stop()
+    return supervisor.summary()
+
+
+def print_summary(summary):
+    for worker in summary["workers"]:
+        print(f"  [{worker['source']}] {worker['fps']:.1f} FPS | detect {worker['detect_ms']:.1f}ms | "
+              f"classify {worker['classify_ms']:.2f}ms | frames {worker['frames']} | dropped {worker['dropped']} | "
+              f"restarts {worker['restarts']} | cores {worker['cores']}")
+    print(f"  Total: {summary['total_fps']:.1f} FPS")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one hand-detection worker process per camera or video file")
+    parser.add_argument("--sources", nargs="+", default=["0"], help="camera indices and/or video file paths")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--loop", action="store_true", help="rewind video files at the end")
+    parser.add_argument("--bench", metavar="VIDEO", help="measure scaling with 1..N workers on one video file")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="largest worker count for --bench")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    if args.bench:
+        print(f"MULTI-CAMERA SCALING: {args.bench}")
+        print("=" * 60)
+        baseline = None
+        for n_workers in range(1, args.max_workers + 1):
+            summary = run([args.bench] * n_workers, args.duration, loop_video=True)
+            baseline = baseline or summary["total_fps"]
+            scaling = summary["total_fps"] / baseline if baseline else 0.0
+            print(f"{n_workers} worker(s): {summary['total_fps']:.1f} FPS total ({scaling:.2f}x)")
+    else:
+        print(f"MULTI-CAMERA: {', '.join(args.sources)}")
+        print("=" * 60)
+        print_summary(run(args.sources, args.duration, loop_video=args.loop))
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,21 @@
 """
 Cross-platform utilities for camera and system operations
 """
-import cv2
+import json
 import platform
 import os
+import time
+from startup import lazy_import
+
+# Imported on first use so callers can open the camera while other startup work runs
+cv2 = lazy_import("cv2")
+
+# Best measured capture mode per device, written by probe_camera
+CAMERA_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "camera_cache.json")
+
+# Modes tried by probe_camera, most common first; drivers snap FPS to their nearest supported rate
+CANDIDATE_RESOLUTIONS = [(640, 480), (1280, 720), (960, 540)]
+CANDIDATE_FOURCCS = ["MJPG", "YUYV"]
 
 
 def get_camera_backend():
@@ -25,13 +37,187 @@ def get_camera_backend():
         return cv2.CAP_ANY  # Auto-detect
 
 
-def initialize_camera(camera_index=0, target_fps=60):
+def camera_identity(camera_index, backend):
+    """
+    Build a cache key that follows the physical device rather than its index where possible.
+    
+    On Linux the V4L2 name and USB vendor/product/serial are read from sysfs, so a
+    camera keeps its cached mode when it moves to another index; elsewhere the key
+    falls back to platform, backend and index.
+    
+    Args:
+        camera_index: Camera device index
+        backend: OpenCV backend constant the camera was opened with
+    
+    Returns:
+        str: Device identity
+    """
+    parts = [platform.system().lower(), str(backend)]
+    sysfs = f"/sys/class/video4linux/video{camera_index}"
+    details = []
+    for relative in ("name", "device/../idVendor", "device/../idProduct", "device/../serial"):
+        try:
+            with open(os.path.join(sysfs, relative)) as f:
+                details.append(f.read().strip())
+        except OSError:
+            pass
+    parts.extend(details if details else [f"index{camera_index}"])
+    return ":".join(parts)
+
+
+def load_camera_cache(cache_path=CAMERA_CACHE_PATH):
+    """
+    Read the per-device capture mode cache.
+    
+    Args:
+        cache_path: JSON file written by save_camera_config
+    
+    Returns:
+        dict: Device identity to config dict (empty if missing or unreadable)
+    """
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_camera_config(identity, config, cache_path=CAMERA_CACHE_PATH):
+    """
+    Store the chosen capture mode for a device, replacing the cache file atomically.
+    
+    Args:
+        identity: Key from camera_identity
+        config: Config dict from probe_camera
+        cache_path: JSON cache file
+    """
+    cache = load_camera_cache(cache_path)
+    cache[identity] = config
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Could not save camera cache: {e}")
+
+
+def apply_camera_config(cam, config):
+    """
+    Request a capture mode.
+    
+    FOURCC is set before the frame size because V4L2 drivers pick the size list per format.
+    
+    Args:
+        cam: Open cv2.VideoCapture
+        config: Dict with fourcc, width, height and fps
+    
+    Returns:
+        tuple: (fourcc, width, height, fps) the driver actually applied
+    """
+    cam.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config["fourcc"]))
+    cam.set(cv2.CAP_PROP_FRAME_WIDTH, config["width"])
+    cam.set(cv2.CAP_PROP_FRAME_HEIGHT, config["height"])
+    cam.set(cv2.CAP_PROP_FPS, config["fps"])
+    cam.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Minimize latency
+    return (
+        decode_fourcc(cam.get(cv2.CAP_PROP_FOURCC)),
+        int(cam.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(cam.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        cam.get(cv2.CAP_PROP_FPS),
+    )
+
+
+def measure_capture(cam, n_frames=20, warmup=3):
+    """
+    Measure the frame rate a camera really delivers.
+    
+    Args:
+        cam: Open cv2.VideoCapture in the mode to measure
+        n_frames: Frames to time
+        warmup: Frames read and discarded first (mode switches often stall the first reads)
+    
+    Returns:
+        dict or None: measured_fps and read_ms (mean blocking time of read()), or None if reads fail
+    """
+    for _ in range(warmup):
+        if not cam.read()[0]:
+            return None
+    read_total = 0.0
+    start = time.perf_counter()
+    for _ in range(n_frames):
+        read_start = time.perf_counter()
+        if not cam.read()[0]:
+            return None
+        read_total += time.perf_counter() - read_start
+    elapsed = time.perf_counter() - start
+    return {"measured_fps": n_frames / elapsed, "read_ms": read_total * 1000 / n_frames}
+
+
+def probe_camera(cam, target_fps=60, resolutions=None, fourccs=None, n_frames=20):
+    """
+    Try candidate resolution/FOURCC/FPS combinations and measure each one.
+    
+    Combinations the driver maps onto a mode that was already measured are skipped.
+    
+    Args:
+        cam: Open cv2.VideoCapture
+        target_fps: FPS requested for every combination
+        resolutions: (width, height) candidates (default: CANDIDATE_RESOLUTIONS)
+        fourccs: FOURCC candidates (default: CANDIDATE_FOURCCS)
+        n_frames: Frames timed per mode
+    
+    Returns:
+        list: Config dicts (fourcc, width, height, fps, measured_fps, read_ms), best first
+    """
+    results = []
+    seen = set()
+    for fourcc in fourccs or CANDIDATE_FOURCCS:
+        for width, height in resolutions or CANDIDATE_RESOLUTIONS:
+            applied = apply_camera_config(cam, {"fourcc": fourcc, "width": width, "height": height, "fps": target_fps})
+            if applied in seen:
+                continue
+            seen.add(applied)
+            measurement = measure_capture(cam, n_frames=n_frames)
+            if measurement is None:
+                continue
+            actual_fourcc, actual_width, actual_height, _ = applied
+            results.append({
+                "fourcc": actual_fourcc or fourcc,
+                "width": actual_width,
+                "height": actual_height,
+                "fps": target_fps,
+                **measurement,
+            })
+    results.sort(key=lambda config: _config_rank(config, target_fps))
+    return results
+
+
+def _config_rank(config, target_fps):
+    """Sort key: delivered FPS up to the target first, then the least time blocked in read()"""
+    return (-round(min(config["measured_fps"], target_fps)), config["read_ms"])
+
+
+def decode_fourcc(value):
+    """Turn CAP_PROP_FOURCC's float back into its four characters"""
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ")
+
+
+def initialize_camera(camera_index=0, target_fps=60, reprobe=False, probe=True, cache_path=CAMERA_CACHE_PATH):
     """
     Initialize camera with platform-specific optimizations.
     
+    The first start on a device probes its capture modes and caches the best one
+    per device identity; later starts apply the cached mode directly.
+    
     Args:
         camera_index: Camera device index (default: 0)
         target_fps: Target frames per second (default: 60)
+        reprobe: Ignore the cached mode and probe again
+        probe: Probe devices without a cached mode (False requests target_fps and MJPG blindly)
+        cache_path: JSON file holding the per-device modes
     
     Returns:
         tuple: (camera_object, actual_fps, width, height, backend_name)
@@ -54,18 +240,37 @@ def initialize_camera(camera_index=0, target_fps=60):
     if not cam.isOpened():
         raise RuntimeError(f"Could not open camera {camera_index}")
     
-    # Set camera properties with platform-specific handling
-    cam.set(cv2.CAP_PROP_FPS, target_fps)
-    cam.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Minimize latency
-    
-    # Try MJPG codec for better performance (may not work on all platforms)
-    try:
-        cam.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
-    except:
-        pass  # Ignore if not supported
+    identity = camera_identity(camera_index, backend)
+    cached = None if reprobe else load_camera_cache(cache_path).get(identity)
+    if cached is not None:
+        applied = apply_camera_config(cam, cached)
+        if applied[1:3] != (cached["width"], cached["height"]):
+            # The device no longer offers the cached mode
+            print(f"Cached camera mode {cached['width']}x{cached['height']} no longer applies, probing again")
+            cached = None
+    if cached is None and probe:
+        print("Probing camera modes (once per device)...")
+        results = probe_camera(cam, target_fps=target_fps)
+        if results:
+            cached = results[0]
+            cached["probed_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            save_camera_config(identity, cached, cache_path)
+            apply_camera_config(cam, cached)
+            print(f"Camera mode: {cached['fourcc']} {cached['width']}x{cached['height']} "
+                  f"@ {cached['measured_fps']:.1f} FPS measured, read {cached['read_ms']:.1f}ms")
+    if cached is None:
+        # Set camera properties with platform-specific handling
+        cam.set(cv2.CAP_PROP_FPS, target_fps)
+        cam.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Minimize latency
+        
+        # Try MJPG codec for better performance (may not work on all platforms)
+        try:
+            cam.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        except (cv2.error, OSError):
+            pass  # Ignore if not supported
     
-    # Get actual camera properties
-    actual_fps = cam.get(cv2.CAP_PROP_FPS)
+    # Get actual camera properties; a probed mode reports the rate it really delivered
+    actual_fps = round(cached["measured_fps"], 1) if cached is not None else cam.get(cv2.CAP_PROP_FPS)
     width = int(cam.get(cv2.CAP_PROP_FRAME_WIDTH))
     height = int(cam.get(cv2.CAP_PROP_FRAME_HEIGHT))
     backend_name = backend_names.get(backend, "Unknown")
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Idle/attract power state for the camera pipeline
+
+While hands are in view (and for ``idle_after`` seconds after the last one) the
+pipeline runs at full rate and resolution. After that it switches to IDLE: the
+camera is polled a few times per second, each polled frame is shrunk to a tiny
+resolution for presence-only detection, and nothing is rendered or queued for
+display. The first detection that sees a hand switches back to ACTIVE and wakes
+the capture loop immediately, so the next frame is processed at full rate.
+
+``--session`` replays a recorded video through the state machine on the video's
+own timeline and reports wake-up latency and detection CPU per state, against
+always running the full pipeline.
+
+Usage:
+    python power_state.py --session recordings/kiosk.mp4 --idle-after 5 --poll-interval 0.25
+"""
+import argparse
+import threading
+import time
+import numpy as np
+from startup import lazy_import
+
+cv2 = lazy_import("cv2")
+mp = lazy_import("mediapipe")
+
+ACTIVE = "active"
+IDLE = "idle"
+
+MODEL_PATH = "./models/hand_landmarker.task"
+
+
+class PowerStateMachine:
+    """
+    ACTIVE/IDLE state driven by hand presence.
+
+    ``observe`` is called with each detection's outcome (from the MediaPipe callback
+    thread); the capture loop asks ``state`` which pipeline to run and calls
+    ``wait_for_poll`` while idle. Times come from ``clock`` unless passed in, so
+    recorded sessions can be replayed on their own timeline.
+    """
+
+    def __init__(self, idle_after=10.0, poll_interval=0.25, idle_size=(320, 180), clock=time.monotonic, metrics=None):
+        """
+        Args:
+            idle_after: Seconds without a hand before going idle
+            poll_interval: Seconds between presence checks while idle
+            idle_size: (width, height) frames are shrunk to for presence detection while idle
+            clock: Time source in seconds
+            metrics: Optional MetricsRegistry for transitions and wake-up latency
+        """
+        self.idle_after = idle_after
+        self.poll_interval = poll_interval
+        self.idle_size = idle_size
+        self.clock = clock
+        self.metrics = metrics
+        now = clock()
+        self.state = ACTIVE
+        self.time_in_state = {ACTIVE: 0.0, IDLE: 0.0}
+        self.wake_latencies = []
+        self._state_since = now
+        self._last_hand = now
+        self._next_poll = now
+        self._woke_at = None
+        self._wake = threading.Event()
+
+    def observe(self, hand_present, now=None):
+        """
+        Feed the outcome of one detection.
+
+        Args:
+            hand_present: True if the detection found at least one hand
+            now: Time of the detection (default: clock())
+
+        Returns:
+            str: The state after this observation
+        """
+        now = self.clock() if now is None else now
+        if hand_present:
+            self._last_hand = now
+            if self.state == IDLE:
+                self._enter(ACTIVE, now)
+                self._woke_at = now
+                self._wake.set()
+        elif self.state == ACTIVE and now - self._last_hand >= self.idle_after:
+            self._enter(IDLE, now)
+            self._next_poll = now + self.poll_interval
+        return self.state
+
+    def poll_due(self, now=None):
+        """True if an idle presence check is due (always True while active)"""
+        if self.state == ACTIVE:
+            return True
+        now = self.clock() if now is None else now
+        return now >= self._next_poll
+
+    def polled(self, now=None):
+        """Record that an idle presence check was submitted"""
+        now = self.clock() if now is None else now
+        self._next_poll = now + self.poll_interval
+        if self.metrics is not None:
+            self.metrics.increment("power_idle_polls")
+
+    def wait_for_poll(self, timeout=None):
+        """
+        Sleep until the next idle presence check is due, or until a hand wakes the pipeline.
+
+        Returns:
+            bool: True if woken by a hand
+        """
+        delay = self._next_poll - self.clock()
+        if timeout is not None:
+            delay = min(delay, timeout)
+        if delay <= 0:
+            return self.state == ACTIVE
+        self._wake.clear()
+        if self.state == ACTIVE:
+            return True
+        return self._wake.wait(delay)
+
+    def active_frame(self, now=None):
+        """
+        Record that a frame went through the full pipeline; the first one after a wake-up sets its latency.
+
+        Returns:
+            float or None: Wake-up latency in seconds if this frame completed a wake-up
+        """
+        if self._woke_at is None:
+            return None
+        now = self.clock() if now is None else now
+        latency = now - self._woke_at
+        self._woke_at = None
+        self.wake_latencies.append(latency)
+        if self.metrics is not None:
+            self.metrics.observe("power_wake_ms", latency * 1000)
+        return latency
+
+    def durations(self, now=None):
+        """
+        Seconds spent in each state so far.
+
+        Returns:
+            dict: {"active": seconds, "idle": seconds}
+        """
+        now = self.clock() if now is None else now
+        durations = dict(self.time_in_state)
+        durations[self.state] += now - self._state_since
+        return durations
+
+    def _enter(self, state, now):
+        self.time_in_state[self.state] += now - self._state_since
+        self._state_since = now
+        self.state = state
+        if self.metrics is not None:
+            self.metrics.increment(f"power_{state}")
+            self.metrics.set_gauge("power_state", state)
+
+
+def replay_session(path, idle_after=5.0, poll_interval=0.25, idle_size=(320, 180)):
+    """
+    Run a recorded session through the power state machine on the video's own timeline.
+
+    Every frame is first detected at full resolution as the reference for when hands
+    are really in view. The state machine then processes the frames it would have
+    processed live, with its CPU time measured per state.
+
+    Args:
+        path: Video file
+        idle_after: Seconds without a hand before going idle
+        poll_interval: Seconds between idle presence checks
+        idle_size: Idle detection resolution
+
+    Returns:
+        dict: Session length, reference and gated detection CPU, per-state time and CPU,
+        and wake-up latencies (seconds from a hand appearing to its first full-rate frame)
+    """
+    cam = cv2.VideoCapture(path)
+    if not cam.isOpened():
+        raise RuntimeError(f"Could not open video {path}")
+    fps = cam.get(cv2.CAP_PROP_FPS) or 30.0
+    options = mp.tasks.vision.HandLandmarkerOptions(
+        base_options=mp.tasks.BaseOptions(model_asset_path=MODEL_PATH),
+        running_mode=mp.tasks.vision.RunningMode.IMAGE,
+        num_hands=2,
+    )
+    reference = mp.tasks.vision.HandLandmarker.create_from_options(options)
+    gated = mp.tasks.vision.HandLandmarker.create_from_options(options)
+
+    power = PowerStateMachine(idle_after, poll_interval, idle_size, clock=lambda: 0.0)
+    small = np.empty((idle_size[1], idle_size[0], 3), dtype=np.uint8)
+    cpu = {ACTIVE: 0.0, IDLE: 0.0}
+    processed = {ACTIVE: 0, IDLE: 0}
+    reference_cpu = 0.0
+    hand_onsets = []
+    wakes = []
+    previous_present = False
+    index = 0
+    while True:
+        ret, frame = cam.read()
+        if not ret:
+            break
+        now = index / fps
+        index += 1
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+        start = time.process_time()
+        present = bool(reference.detect(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)).hand_landmarks)
+        reference_cpu += time.process_time() - start
+        if present and not previous_present:
+            hand_onsets.append(now)
+        previous_present = present
+
+        state = power.state
+        if not power.poll_due(now):
+            continue
+        start = time.process_time()
+        if state == IDLE:
+            cv2.resize(rgb, idle_size, dst=small, interpolation=cv2.INTER_AREA)
+            result = gated.detect(mp.Image(image_format=mp.ImageFormat.SRGB, data=small))
+            power.polled(now)
+        else:
+            result = gated.detect(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb))
+            if power.active_frame(now) is not None:
+                wakes.append(now)
+        cpu[state] += time.process_time() - start
+        processed[state] += 1
+        power.observe(bool(result.hand_landmarks), now)
+
+    cam.release()
+    reference.close()
+    gated.close()
+    duration = index / fps
+    # A wake-up belongs to the latest hand appearance before it
+    latencies = []
+    for woke in wakes:
+        onsets = [onset for onset in hand_onsets if onset <= woke]
+        if onsets:
+            latencies.append(woke - onsets[-1])
+    return {
+        "duration_s": duration,
+        "frames": index,
+        "reference_cpu_s": reference_cpu,
+        "gated_cpu_s": cpu[ACTIVE] + cpu[IDLE],
+        "time_s": power.durations(duration),
+        "cpu_s": cpu,
+        "processed": processed,
+        "wake_latencies_s": latencies,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure idle CPU and wake-up latency on a recorded session")
+    parser.add_argument("--session", required=True, help="recorded video")
+    parser.add_argument("--idle-after", type=float, default=5.0, help="seconds without a hand before going idle")
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="seconds between idle presence checks")
+    args = parser.parse_args()
+
+    report = replay_session(args.session, args.idle_after, args.poll_interval)
+    print("=" * 60)
+    print(f"POWER STATE REPLAY: {args.session} ({report['duration_s']:.1f}s, {report['frames']} frames)")
+    print("=" * 60)
+    for state in (ACTIVE, IDLE):
+        seconds = report["time_s"][state]
+        share = report["cpu_s"][state] / seconds * 100 if seconds > 0 else 0.0
+        print(f"  {state:6s} {seconds:7.1f}s | {report['processed'][state]:5d} detections | "
+              f"detection CPU {share:.1f}% of one core")
+    print(f"  Detection CPU: {report['gated_cpu_s']:.1f}s with idle mode vs {report['reference_cpu_s']:.1f}s always active")
+    latencies = report["wake_latencies_s"]
+    if latencies:
+        print(f"  Wake-ups: {len(latencies)} | latency mean {np.mean(latencies) * 1000:.0f}ms, "
+              f"max {np.max(latencies) * 1000:.0f}ms")
+    else:
+        print("  Wake-ups: none")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Background session recorder with a rolling pre-trigger buffer
+
+The display path hands every finished frame (overlays included) to
+``SessionRecorder.offer``, which only appends a reference to a small bounded
+queue. An encoder thread JPEG-compresses the frames into a ring holding the
+last ``seconds`` of video. When the encoder falls behind, the queue drops its
+oldest frames (counted in ``dropped``) instead of slowing capture down.
+
+``dump`` (hotkey or web console) writes the ring to a video file on a separate
+thread, optionally after waiting ``post_seconds`` so the clip also shows what
+happened after the trigger. Dumps never stop the encoder.
+"""
+import os
+import threading
+import time
+from collections import deque
+import numpy as np
+from startup import lazy_import
+
+cv2 = lazy_import("cv2")
+
+DEFAULT_RECORDING_DIR = "recordings"
+
+
+class SessionRecorder:
+    """
+    Keeps the last seconds of displayed frames, compressed, and dumps them to video on demand.
+
+    Usage:
+        recorder = SessionRecorder(seconds=20).start()
+        recorder.offer(frame)            # display path, every frame
+        recorder.dump(post_seconds=2)    # writes recordings/session_<time>.mp4 in the background
+    """
+
+    def __init__(self, seconds=20.0, directory=DEFAULT_RECORDING_DIR, max_pending=8, jpeg_quality=80,
+                 max_frames=3000, metrics=None):
+        """
+        Args:
+            seconds: Length of the rolling buffer (pre-trigger plus any post-trigger time)
+            directory: Where dumped clips are written
+            max_pending: Frames waiting for the encoder before the oldest are dropped
+            jpeg_quality: JPEG quality of the buffered frames
+            max_frames: Hard cap on buffered frames, whatever the frame rate
+            metrics: Optional MetricsRegistry for recorder_encode_ms timings and the recorder_dropped gauge
+        """
+        self.seconds = seconds
+        self.directory = directory
+        self.jpeg_quality = jpeg_quality
+        self.metrics = metrics
+        self.offered = 0
+        self.dropped = 0
+        self.last_dump = None
+        self.last_error = None
+        self._pending = deque(maxlen=max_pending)
+        self._ring = deque(maxlen=max_frames)  # (monotonic time, JPEG bytes)
+        self._lock = threading.Lock()  # guards the ring against copies taken by dumps and status()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._dumps = 0  # dumps in progress
+
+    def offer(self, frame):
+        """
+        Queue one displayed frame (capture thread; never blocks).
+
+        Args:
+            frame: BGR image; must not be modified afterwards
+        """
+        self.offered += 1
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append((time.monotonic(), frame))
+        self._ready.set()
+
+    def start(self):
+        """Start the encoder thread"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Stop the encoder after the frame it is on"""
+        self._stop.set()
+        self._ready.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def drain(self):
+        """Encode every queued frame on the calling thread (tests)"""
+        while self._pending:
+            self._encode(*self._pending.popleft())
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._ready.wait()
+            self._ready.clear()
+            while self._pending and not self._stop.is_set():
+                try:
+                    item = self._pending.popleft()
+                except IndexError:
+                    break
+                try:
+                    self._encode(*item)
+                except Exception as e:
+                    self.last_error = f"encode failed: {e}"
+
+    def _encode(self, timestamp, frame):
+        start = time.perf_counter()
+        ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            return
+        jpeg = jpeg.tobytes()
+        with self._lock:
+            self._ring.append((timestamp, jpeg))
+            # Forget frames older than the buffer length
+            while self._ring and self._ring[0][0] < timestamp - self.seconds:
+                self._ring.popleft()
+        if self.metrics is not None:
+            self.metrics.observe("recorder_encode_ms", (time.perf_counter() - start) * 1000)
+            self.metrics.set_gauge("recorder_dropped", self.dropped)
+
+    def dump(self, path=None, post_seconds=0.0, wait=False):
+        """
+        Write the buffered frames to a video file in the background.
+
+        Args:
+            path: Output file (default: <directory>/session_<date>_<time>.mp4)
+            post_seconds: Keep recording this long after the trigger before writing
+            wait: Block until the file is written (tests, shutdown)
+
+        Returns:
+            str: Path the clip is (being) written to
+        """
+        if path is None:
+            path = os.path.join(self.directory, f"session_{time.strftime('%Y%m%d_%H%M%S')}.mp4")
+        with self._lock:
+            self._dumps += 1
+        thread = threading.Thread(target=self._dump, args=(path, post_seconds), daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        return path
+
+    def _dump(self, path, post_seconds):
+        try:
+            if post_seconds > 0:
+                time.sleep(post_seconds)
+            with self._lock:
+                frames = list(self._ring)
+            if not frames:
+                raise ValueError("no frames buffered")
+            self.last_dump = write_clip(path, frames)
+        except Exception as e:
+            self.last_error = f"dump failed: {e}"
+        finally:
+            with self._lock:
+                self._dumps -= 1
+
+    def status(self):
+        """
+        Returns:
+            dict: JSON-serializable buffer length, frame counts, last dump and last error
+        """
+        with self._lock:
+            ring = list(self._ring)
+        return {
+            "buffered_frames": len(ring),
+            "buffered_seconds": round(ring[-1][0] - ring[0][0], 2) if len(ring) > 1 else 0.0,
+            "buffered_mb": round(sum(len(jpeg) for _, jpeg in ring) / 1e6, 1),
+            "offered": self.offered,
+            "dropped": self.dropped,
+            "dumping": self._dumps > 0,
+            "last_dump": self.last_dump,
+            "last_error": self.last_error,
+        }
+
+
+def write_clip(path, frames):
+    """
+    Decode buffered JPEG frames and write them as one video that keeps their capture timing.
+
+    The clip runs at the frames' typical (median) rate. Each frame is written for as long as it was
+    on screen, repeated across gaps such as idle mode or a throttled display, and skipped when
+    frames arrived faster than the clip rate.
+
+    Args:
+        path: Output video file
+        frames: (monotonic time, JPEG bytes) pairs, oldest first
+
+    Returns:
+        dict: path, buffered frames, video frames written, seconds covered and frame rate
+    """
+    times = np.array([timestamp for timestamp, _ in frames])
+    intervals = np.diff(times)
+    intervals = intervals[intervals > 0]
+    # Whole frames per second: MPEG-4 cannot represent arbitrary fractional rates
+    fps = max(1, round(1.0 / float(np.median(intervals)))) if len(intervals) else 30
+    # Frame i is shown until frame i + 1 arrives; the last one for one clip frame
+    ends = np.append(times[1:] - times[0], times[-1] - times[0] + 1.0 / fps)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    writer = None
+    written = 0
+    try:
+        for (_, jpeg), end in zip(frames, ends):
+            repeats = round(end * fps) - written
+            if repeats <= 0:
+                continue
+            image = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if writer is None:
+                height, width = image.shape[:2]
+                writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+                if not writer.isOpened():
+                    raise OSError(f"could not open {path} for writing")
+            if image.shape[:2] != (height, width):
+                continue
+            for _ in range(repeats):
+                writer.write(image)
+            written += repeats
+    finally:
+        if writer is not None:
+            writer.release()
+    return {"path": path, "frames": len(frames), "written": written, "seconds": round(float(times[-1] - times[0]), 2), "fps": fps}
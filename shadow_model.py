@@ -0,0 +1,178 @@
+"""
+Shadow evaluation of a candidate classifier on live traffic
+
+The production callback hands each frame's unscaled features and production
+predictions to ``ShadowEvaluator.offer``, which only appends them to a bounded
+deque and sets an event: a few microseconds, no locks held across inference.
+When the worker falls behind, the oldest frames are dropped (and counted)
+rather than slowing production down. A background thread runs the candidate on
+what it gets and records agreement with production, per-class disagreements
+and the candidate's own latency.
+"""
+import json
+import threading
+import time
+from collections import deque
+import numpy as np
+from classification import predict_proba
+
+
+class ShadowEvaluator:
+    """
+    Runs a candidate LoadedModel beside production, off the hot path.
+
+    Usage:
+        shadow = ShadowEvaluator(load_model(*artifact_paths(2)[:2]))
+        shadow.start()
+        shadow.offer(features, production_labels)   # per frame, from the callback
+        shadow.report()
+    """
+
+    def __init__(self, candidate, metrics=None, max_pending=64, latency_window=2000):
+        """
+        Args:
+            candidate: LoadedModel to evaluate
+            metrics: Optional MetricsRegistry for shadow_ms timings and shadow_frames/shadow_dropped counts
+            max_pending: Frames queued for the worker before the oldest are dropped
+            latency_window: Most recent candidate latencies kept for percentiles
+        """
+        self.candidate = candidate
+        self.metrics = metrics
+        self._pending = deque(maxlen=max_pending)
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()  # guards the statistics between the worker and report()
+        self.offered = 0
+        self.dropped = 0
+        self.frames = 0
+        self.hands = 0
+        self.agreements = 0
+        self._per_class = {}  # production label -> [hands, agreements]
+        self._confusions = {}  # (production, candidate) -> count
+        self._latencies = np.zeros(latency_window)
+        self._n_latencies = 0
+
+    def offer(self, features, production_labels):
+        """
+        Queue one frame for the candidate (production thread; never blocks).
+
+        Args:
+            features: Unscaled feature rows of shape (n_hands, 64); must not be modified afterwards
+            production_labels: Production's top label per row
+        """
+        self.offered += 1
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append((features, production_labels))
+        self._ready.set()
+
+    def start(self):
+        """Start the background worker"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Stop the worker after the frame it is on"""
+        self._stop.set()
+        self._ready.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def drain(self):
+        """Evaluate every queued frame on the calling thread (tests, and exports on shutdown)"""
+        while self._pending:
+            self._evaluate(*self._pending.popleft())
+
+    def report(self, top=10):
+        """
+        Current comparison against production.
+
+        Args:
+            top: Most frequent disagreements listed
+
+        Returns:
+            dict: JSON-serializable agreement, per-class agreement, disagreements, candidate latency
+            and queue counts
+        """
+        with self._lock:
+            latencies = self._latencies[:min(self._n_latencies, len(self._latencies))]
+            per_class = {
+                label: {"hands": hands, "agreement": agreements / hands}
+                for label, (hands, agreements) in sorted(self._per_class.items())
+            }
+            confusions = sorted(self._confusions.items(), key=lambda item: item[1], reverse=True)[:top]
+            report = {
+                "candidate_version": self.candidate.version,
+                "frames": self.frames,
+                "hands": self.hands,
+                "offered": self.offered,
+                "dropped": self.dropped,
+                "agreement": self.agreements / self.hands if self.hands else None,
+                "per_class": per_class,
+                "disagreements": [
+                    {"production": production, "candidate": candidate, "count": count}
+                    for (production, candidate), count in confusions
+                ],
+            }
+        if len(latencies):
+            p50, p99 = np.percentile(latencies, [50, 99])
+            report["latency_ms"] = {"mean": float(latencies.mean()), "p50": float(p50), "p99": float(p99)}
+        else:
+            report["latency_ms"] = None
+        return report
+
+    def export(self, path):
+        """
+        Write the report as JSON.
+
+        Returns:
+            dict: The report written
+        """
+        report = self.report(top=None)
+        report["exported"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        return report
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._ready.wait()
+            self._ready.clear()
+            while self._pending and not self._stop.is_set():
+                try:
+                    item = self._pending.popleft()
+                except IndexError:
+                    break
+                try:
+                    self._evaluate(*item)
+                except Exception as e:
+                    print(f"Shadow model error: {e}")
+
+    def _evaluate(self, features, production_labels):
+        candidate = self.candidate
+        start = time.perf_counter()
+        probs = predict_proba(candidate.classifier, candidate.scaler.transform(features))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        labels = [candidate.labels[index] for index in np.argmax(probs, axis=1)]
+        with self._lock:
+            self.frames += 1
+            self._latencies[self._n_latencies % len(self._latencies)] = elapsed_ms
+            self._n_latencies += 1
+            for production, label in zip(production_labels, labels):
+                production = str(production).upper()
+                counts = self._per_class.setdefault(production, [0, 0])
+                counts[0] += 1
+                self.hands += 1
+                if production == label:
+                    counts[1] += 1
+                    self.agreements += 1
+                else:
+                    self._confusions[(production, label)] = self._confusions.get((production, label), 0) + 1
+        if self.metrics is not None:
+            self.metrics.observe("shadow_ms", elapsed_ms)
+            self.metrics.increment("shadow_frames")
+            self.metrics.set_gauge("shadow_dropped", self.dropped)
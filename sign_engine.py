@@ -0,0 +1,454 @@
+"""
+Reusable fingerspelling recognition engine
+
+``SignRecognizer`` owns everything between a camera frame and accepted letters:
+the MediaPipe HandLandmarker, the letter classifier and scaler, the multi-hand
+tracker, per-hand letter acceptors, the dynamic-sign (J, Z) recognizer and the
+landmark overlay. It is configured by one ``EngineOptions`` object and has no
+module-level state, so several engines can run in one process.
+
+Three ways to feed it:
+
+- ``process(frame)``: synchronous, one frame (IMAGE or VIDEO running mode)
+- ``process_batch(frames)``: synchronous, detection per frame but one classifier call for all hands
+- ``submit(frame)``: asynchronous (LIVE_STREAM mode); results arrive on ``on_result`` and in ``results``
+
+Every path returns or delivers a ``FrameResult``.
+"""
+import os
+import threading
+import time
+from collections import namedtuple
+from dataclasses import dataclass
+import numpy as np
+from startup import lazy_import, preload
+from latest_value import LatestValueMailbox
+from classification import predict_proba, landmark_features
+from model_store import ModelHolder
+from acceptance import LetterAcceptor
+from hand_tracker import HandTracker
+from dynamic_signs import DynamicSignRecognizer
+
+cv2 = lazy_import("cv2")
+mp = lazy_import("mediapipe")
+utils = lazy_import("utils")
+
+IMAGE = "image"
+VIDEO = "video"
+LIVE_STREAM = "live_stream"
+
+# One tracked hand in one frame. accept_key changes on every fresh acceptance
+# (static acceptances, dynamic detections); letter is the letter accepted at that key, held
+# until the next acceptance, so a consumer that skips frames still pairs them correctly,
+# and None until a letter is accepted.
+# raw is the classifier's top class, features the unscaled classifier input row, custom
+# the closest user-recorded sign as (label, distance) or None (engine.templates).
+HandPrediction = namedtuple(
+    "HandPrediction", ["track_id", "accept_key", "letter", "confidence", "raw", "probs", "features", "custom"]
+)
+
+# Everything the engine produced for one frame. primary is the oldest track in view
+# (None without hands); overlay is None when nothing was drawn for this frame. timings
+# holds detect_ms (synchronous calls only) and classify_ms (tracking, classification
+# and acceptance; a batch's classifier call is shared evenly among its frames).
+FrameResult = namedtuple("FrameResult", ["timestamp_ms", "hands", "live_ids", "primary", "overlay", "detection", "timings"])
+
+
+@dataclass
+class EngineOptions:
+    """Configuration for a SignRecognizer"""
+
+    model_path: str = "./models/hand_landmarker.task"
+    classifier_path: str = "archive/predictor_v1.pkl"
+    scaler_path: str = "archive/scaler_v1.pkl"
+    running_mode: str = LIVE_STREAM  # IMAGE, VIDEO or LIVE_STREAM
+    num_hands: int = 2
+    min_hand_detection_confidence: float = 0.5
+    min_hand_presence_confidence: float = 0.5
+    min_tracking_confidence: float = 0.5
+    overlay: str | None = "all"  # "all" tracked hands, only the "primary" hand, or None
+    dynamic_signs: bool = True  # recognize J and Z from motion
+    warm_up: bool = True  # run one inference on a blank frame when the landmarker is created
+    no_hand_threshold: int = 1  # frames without hands before the overlay is cleared
+
+
+class _SingleHandResult:
+    """HandLandmarkerResult-like view of one hand, for drawing only that hand"""
+
+    def __init__(self, result, index):
+        self.hand_landmarks = [result.hand_landmarks[index]]
+        self.handedness = [result.handedness[index]]
+        self.hand_world_landmarks = []
+
+
+class SignRecognizer:
+    """
+    Frames in, tracked hands with smoothed letters out.
+
+    Usage:
+        engine = SignRecognizer(EngineOptions(running_mode=VIDEO))
+        engine.load()
+        result = engine.process(frame)
+        engine.close()
+    """
+
+    def __init__(self, options=None, on_result=None, metrics=None, events=None):
+        """
+        Args:
+            options: EngineOptions (default: EngineOptions())
+            on_result: Optional callable receiving every FrameResult. In LIVE_STREAM mode it runs
+                on MediaPipe's callback thread and should return quickly.
+            metrics: Optional MetricsRegistry; receives engine_detect_ms and engine_classify_ms timings
+            events: Optional EventLog for callback errors (default: printed)
+        """
+        self.options = options if options is not None else EngineOptions()
+        self.on_result = on_result
+        self.metrics = metrics
+        self.events = events
+        # Classifier, scaler and labels as one swappable unit (hot reload: models.watch / request_reload)
+        self.models = ModelHolder(os.path.dirname(self.options.classifier_path) or ".", metrics=metrics)
+        self.landmarker = None
+        # Optional ShadowEvaluator fed every classified frame (a candidate model run off the hot path)
+        self.shadow = None
+        # Optional TemplateStore of user-recorded custom signs, matched beside the classifier
+        self.templates = None
+        # Optional UserAdapter from a calibration session; only applied to the model it was fitted on
+        self.adapter = None
+        # Optional LetterLatency timing the primary hand against the game's target letter
+        self.latency = None
+        self.tracker = HandTracker(max_hands=self.options.num_hands)
+        self.dynamic = DynamicSignRecognizer() if self.options.dynamic_signs else None
+        self.acceptors = {}
+        # Track ID -> (static accept_count, letter, confidence) of the latest dynamic detection,
+        # reported as the hand's letter until the static acceptor accepts again
+        self._dynamic_letters = {}
+        # Newest FrameResult and newest overlay, for render loops that poll
+        self.results = LatestValueMailbox()
+        self.overlays = LatestValueMailbox(np.array([]))
+        self._lock = threading.Lock()
+        self._last_detection = None
+        self._no_hand_frames = 0
+        self._last_timestamp = -1
+        self._clock_origin = time.monotonic()
+        self._warm = threading.Event()
+        self._model = None  # model used for the previous frame
+
+    # --- Setup -----------------------------------------------------------------------------
+
+    def load(self):
+        """Load the classifier and create the landmarker (both can also be called separately, e.g. in parallel)"""
+        self.load_classifier()
+        self.create_landmarker()
+        return self
+
+    def load_classifier(self):
+        """Load, validate and warm up the letter classifier and scaler"""
+        self.models.load(self.options.classifier_path, self.options.scaler_path)
+
+    @property
+    def classifier(self):
+        """The current classifier"""
+        return self.models.current.classifier
+
+    @property
+    def scaler(self):
+        """The current scaler"""
+        return self.models.current.scaler
+
+    @property
+    def labels(self):
+        """The current classifier's letters, in output column order"""
+        return self.models.current.labels if self.models.current is not None else []
+
+    def create_landmarker(self):
+        """Create the HandLandmarker for the configured running mode, warmed up on a blank frame"""
+        options = self.options
+        modes = {
+            IMAGE: mp.tasks.vision.RunningMode.IMAGE,
+            VIDEO: mp.tasks.vision.RunningMode.VIDEO,
+            LIVE_STREAM: mp.tasks.vision.RunningMode.LIVE_STREAM,
+        }
+        landmarker_options = mp.tasks.vision.HandLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=options.model_path),
+            running_mode=modes[options.running_mode],
+            num_hands=options.num_hands,
+            min_hand_detection_confidence=options.min_hand_detection_confidence,
+            min_hand_presence_confidence=options.min_hand_presence_confidence,
+            min_tracking_confidence=options.min_tracking_confidence,
+        )
+        if options.running_mode == LIVE_STREAM:
+            landmarker_options.result_callback = self._on_detection
+        if options.overlay is not None:
+            preload(utils)  # import the drawing stack now, not on the first hand
+        self.landmarker = mp.tasks.vision.HandLandmarker.create_from_options(landmarker_options)
+
+        if options.warm_up:
+            # The first inference initializes the graph; pay for it now rather than on the first camera frame.
+            # The warm-up bypasses tracking, so it leaves no state behind; timestamp 0 keeps
+            # the caller's timestamps (from one frame interval on) increasing.
+            blank = mp.Image(image_format=mp.ImageFormat.SRGB, data=np.zeros((480, 640, 3), dtype=np.uint8))
+            timestamp = self._next_timestamp(0)
+            if options.running_mode == LIVE_STREAM:
+                self.landmarker.detect_async(blank, timestamp)
+                self._warm.wait(timeout=5.0)
+            elif options.running_mode == VIDEO:
+                self.landmarker.detect_for_video(blank, timestamp)
+            else:
+                self.landmarker.detect(blank)
+        self._warm.set()
+
+    def close(self):
+        """Release the landmarker"""
+        if self.landmarker is not None:
+            self.landmarker.close()
+            self.landmarker = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # --- Feeding frames --------------------------------------------------------------------
+
+    def process(self, frame, timestamp_ms=None, bgr=True):
+        """
+        Detect, track and classify the hands in one frame (IMAGE or VIDEO mode).
+
+        Args:
+            frame: Camera frame
+            timestamp_ms: Frame time in ms, strictly increasing in VIDEO mode (default: engine clock)
+            bgr: True for OpenCV's BGR frames, False if the frame is already RGB
+
+        Returns:
+            FrameResult
+        """
+        start = time.perf_counter()
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) if bgr else frame
+        timestamp_ms = self._next_timestamp(timestamp_ms)
+        detection = self._detect(rgb, timestamp_ms)
+        timings = {"detect_ms": (time.perf_counter() - start) * 1000}
+        with self._lock:
+            return self._handle(detection, rgb, timestamp_ms, timings)
+
+    def process_batch(self, frames, timestamps_ms=None, bgr=True):
+        """
+        Process several frames in order with a single classifier call for all their hands.
+
+        Detection still runs frame by frame (MediaPipe has no batch input), but scaling and
+        classification, the parts that pay per-call overhead, run once for the whole batch.
+
+        Args:
+            frames: Sequence of camera frames, oldest first
+            timestamps_ms: Optional matching frame times in ms
+            bgr: True for OpenCV's BGR frames
+
+        Returns:
+            list: One FrameResult per frame
+        """
+        images, detections, stamps, timings = [], [], [], []
+        for index, frame in enumerate(frames):
+            start = time.perf_counter()
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) if bgr else frame
+            timestamp_ms = self._next_timestamp(timestamps_ms[index] if timestamps_ms is not None else None)
+            images.append(rgb)
+            detections.append(self._detect(rgb, timestamp_ms))
+            stamps.append(timestamp_ms)
+            timings.append({"detect_ms": (time.perf_counter() - start) * 1000})
+
+        # One model for the whole batch, even if a reload swaps in a new one meanwhile
+        model = self.models.current
+        counts = [len(detection.hand_landmarks[:self.options.num_hands]) for detection in detections]
+        probs = None
+        if sum(counts):
+            start = time.perf_counter()
+            features = np.concatenate([
+                landmark_features(detection.handedness[:count], detection.hand_world_landmarks[:count])
+                for detection, count in zip(detections, counts) if count
+            ])
+            probs = self._classify(model, features)
+            shared_ms = (time.perf_counter() - start) * 1000 / len(frames)
+        else:
+            shared_ms = 0.0
+
+        results = []
+        row = 0
+        with self._lock:
+            for detection, rgb, timestamp_ms, count, frame_timings in zip(detections, images, stamps, counts, timings):
+                frame_probs = probs[row:row + count] if count else None
+                results.append(self._handle(detection, rgb, timestamp_ms, frame_timings, frame_probs, shared_ms, model))
+                row += count
+        return results
+
+    def submit(self, frame, timestamp_ms=None, bgr=True):
+        """
+        Hand a frame to the landmarker without waiting (LIVE_STREAM mode).
+
+        The FrameResult is delivered to ``on_result`` and published to ``results``.
+
+        Args:
+            frame: Camera frame
+            timestamp_ms: Frame time in ms, strictly increasing (default: engine clock)
+            bgr: True for OpenCV's BGR frames
+        """
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) if bgr else frame
+        self.landmarker.detect_async(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb), self._next_timestamp(timestamp_ms))
+
+    def replay_last(self):
+        """
+        Run the newest detection through tracking and acceptance again, without redrawing.
+
+        For frames a caller chose not to detect (e.g. a static scene): acceptors and the
+        dynamic-sign windows keep advancing one step per frame.
+
+        Returns:
+            FrameResult or None: None if nothing has been detected yet
+        """
+        with self._lock:
+            if self._last_detection is None:
+                return None
+            detection, timestamp_ms = self._last_detection
+            return self._handle(detection, None, timestamp_ms, {})
+
+    @property
+    def warm(self):
+        """True once the first inference has completed"""
+        return self._warm.is_set()
+
+    # --- Internals -------------------------------------------------------------------------
+
+    def _next_timestamp(self, timestamp_ms):
+        if timestamp_ms is None:
+            timestamp_ms = int((time.monotonic() - self._clock_origin) * 1000)
+        # MediaPipe rejects timestamps that do not increase
+        timestamp_ms = max(int(timestamp_ms), self._last_timestamp + 1)
+        self._last_timestamp = timestamp_ms
+        return timestamp_ms
+
+    def _detect(self, rgb, timestamp_ms):
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        if self.options.running_mode == VIDEO:
+            return self.landmarker.detect_for_video(image, timestamp_ms)
+        return self.landmarker.detect(image)
+
+    def _on_detection(self, detection, output_image, timestamp_ms):
+        if not self._warm.is_set():
+            # The warm-up frame's result
+            self._warm.set()
+            return
+        try:
+            with self._lock:
+                self._handle(detection, output_image.numpy_view(), timestamp_ms, {})
+        except Exception as e:
+            if self.events is not None:
+                self.events.emit("error", f"Error in sign engine callback: {e}", level="error", where="sign_engine")
+            else:
+                print(f"Error in sign engine callback: {e}")
+
+    def _classify(self, model, features):
+        scaled = model.scaler.transform(features)
+        probs = predict_proba(model.classifier, scaled)
+        adapter = self.adapter
+        if adapter is not None and adapter.model is model:
+            probs = adapter.adjust(scaled, probs)
+        return probs
+
+    def _handle(self, detection, image, timestamp_ms, timings, probs=None, classify_ms=0.0, model=None):
+        """Track, classify and accept letters for every hand in a detection (caller holds the lock)"""
+        start = time.perf_counter()
+        # Read the current model once: a hot reload swapping it mid-frame cannot mix versions
+        model = model if model is not None else self.models.current
+        if model is not self._model:
+            if self._model is not None and model.labels != self._model.labels:
+                # Acceptors are sized to the old label set
+                self.acceptors.clear()
+                self._dynamic_letters.clear()
+            self._model = model
+        if image is not None:
+            self._last_detection = (detection, timestamp_ms)
+
+        # Match detections to persistent hand IDs; forget per-hand state of hands that left
+        track_ids = self.tracker.update(detection.hand_landmarks)
+        live_ids = tuple(self.tracker.active_ids)
+        for track_id in [track_id for track_id in self.acceptors if track_id not in live_ids]:
+            del self.acceptors[track_id]
+        for track_id in [track_id for track_id in self._dynamic_letters if track_id not in live_ids]:
+            del self._dynamic_letters[track_id]
+        if self.dynamic is not None:
+            for track_id in self.dynamic.tracked_ids():
+                if track_id not in live_ids:
+                    self.dynamic.drop(track_id)
+
+        overlay = None
+        if not track_ids:
+            self._no_hand_frames += 1
+            for acceptor in self.acceptors.values():
+                acceptor.update_absent()
+            if image is not None and self.options.overlay is not None and self._no_hand_frames >= self.options.no_hand_threshold:
+                overlay = np.zeros_like(image)
+            timings["classify_ms"] = classify_ms + (time.perf_counter() - start) * 1000
+            return self._publish(FrameResult(timestamp_ms, (), live_ids, None, overlay, detection, timings))
+        self._no_hand_frames = 0
+
+        # Classify every tracked hand in one batched call
+        n_hands = len(track_ids)
+        features = landmark_features(detection.handedness[:n_hands], detection.hand_world_landmarks[:n_hands])
+        if probs is None:
+            probs = self._classify(model, features)
+        self.models.record_samples(features)
+        top = model.classifier.classes_[np.argmax(probs, axis=1)]
+        if self.shadow is not None:
+            # Only a deque append; the candidate runs on the shadow worker
+            self.shadow.offer(features, top)
+        predictions = list(top)
+        custom = self.templates.observe(features) if self.templates is not None else [None] * n_hands
+
+        hands = []
+        for row, track_id in enumerate(track_ids):
+            acceptor = self.acceptors.get(track_id)
+            if acceptor is None:
+                acceptor = self.acceptors[track_id] = LetterAcceptor(model.labels)
+            letter, confidence = acceptor.update(probs[row])
+            dynamic_count = 0
+            if self.dynamic is not None:
+                # A completed motion letter takes precedence over the static handshape
+                dynamic = self.dynamic.update(track_id, detection.hand_landmarks[row])
+                if dynamic is not None:
+                    self._dynamic_letters[track_id] = (acceptor.accept_count, *dynamic)
+                    predictions[row] = dynamic[0]
+                held = self._dynamic_letters.get(track_id)
+                if held is not None and held[0] == acceptor.accept_count:
+                    letter, confidence = held[1:]
+                dynamic_count = self.dynamic.detection_count(track_id)
+            hands.append(HandPrediction(
+                track_id, (acceptor.accept_count, dynamic_count), letter, confidence,
+                predictions[row], probs[row], features[row], custom[row],
+            ))
+        for track_id, acceptor in self.acceptors.items():
+            if track_id not in track_ids:
+                acceptor.update_absent()
+
+        timings["classify_ms"] = classify_ms + (time.perf_counter() - start) * 1000
+
+        # The primary hand (oldest track in view) drives single-hand front-ends
+        primary_row = int(np.argmin(track_ids))
+        if self.latency is not None:
+            primary = hands[primary_row]
+            self.latency.observe(primary.raw, primary.letter, (primary.track_id, primary.accept_key))
+        if image is not None and self.options.overlay == "all":
+            overlay = utils.draw_landmarks_on_image(image, detection, predictions)
+        elif image is not None and self.options.overlay == "primary":
+            overlay = utils.draw_landmarks_on_image(image, _SingleHandResult(detection, primary_row), [predictions[primary_row]])
+        return self._publish(FrameResult(timestamp_ms, tuple(hands), live_ids, hands[primary_row], overlay, detection, timings))
+
+    def _publish(self, result):
+        if self.metrics is not None:
+            for name, value in result.timings.items():
+                self.metrics.observe(f"engine_{name}", value)
+        self.results.publish(result)
+        if result.overlay is not None:
+            self.overlays.publish(result.overlay)
+        if self.on_result is not None:
+            self.on_result(result)
+        return result
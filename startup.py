@@ -0,0 +1,186 @@
+"""
+Startup helpers: deferred imports, concurrent initialization and a per-step timing report
+"""
+import importlib
+import threading
+import time
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Heavy dependencies (mediapipe, OpenCV, scikit-learn) can be named at the top of
+    a file without paying for them at import time; ``preload`` imports them up
+    front, e.g. from a startup thread. Once loaded, the module's namespace is
+    copied onto the proxy, so later attribute lookups are ordinary instance lookups.
+    """
+
+    def __init__(self, name):
+        """
+        Args:
+            name: Dotted module name
+        """
+        self.__dict__["_lazy_name"] = name
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    # Underscore names only: anything public could shadow the module's own attributes
+    def _lazy_load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is not None:
+            return module
+        with self.__dict__["_lazy_lock"]:
+            module = self.__dict__["_lazy_module"]
+            if module is None:
+                module = importlib.import_module(self.__dict__["_lazy_name"])
+                self.__dict__.update(module.__dict__)
+                self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        # Only reached for names not copied yet (before loading, or submodules imported later)
+        return getattr(self._lazy_load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._lazy_load(), attr, value)
+        self.__dict__[attr] = value
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_lazy_name']}' ({state})>"
+
+
+def lazy_import(name):
+    """
+    Name a module without importing it yet.
+
+    Args:
+        name: Dotted module name
+
+    Returns:
+        LazyModule: Proxy that imports the module on first use
+    """
+    return LazyModule(name)
+
+
+def preload(module):
+    """
+    Import a lazily named module now (safe to call from several threads).
+
+    Args:
+        module: LazyModule, or an already imported module
+
+    Returns:
+        module: The real module
+    """
+    if isinstance(module, LazyModule):
+        return module._lazy_load()
+    return module
+
+
+class StartupProfiler:
+    """
+    Records how long each import and initialization step takes, and when it ran.
+
+    Steps may run on several threads at once; the report lists them by start time
+    relative to ``origin`` so overlapping steps are visible.
+    """
+
+    def __init__(self, origin=None):
+        """
+        Args:
+            origin: ``time.perf_counter()`` value the report is relative to (default: now)
+        """
+        self.origin = time.perf_counter() if origin is None else origin
+        self._steps = []
+        self._lock = threading.Lock()
+
+    def record(self, name, start, end=None):
+        """Add a step that ran from ``start`` to ``end`` (default: now)"""
+        end = time.perf_counter() if end is None else end
+        with self._lock:
+            self._steps.append((name, start, end, threading.current_thread().name))
+
+    def step(self, name):
+        """
+        Time a block of code.
+
+        Usage:
+            with profiler.step("load classifier"):
+                ...
+        """
+        return _Step(self, name)
+
+    def steps(self):
+        """
+        Recorded steps, earliest first.
+
+        Returns:
+            list: (name, start offset ms, duration ms, thread name) tuples
+        """
+        with self._lock:
+            steps = sorted(self._steps, key=lambda step: step[1])
+        return [(name, (start - self.origin) * 1000, (end - start) * 1000, thread) for name, start, end, thread in steps]
+
+    def report(self):
+        """Print the per-step timings and the overall wall time"""
+        steps = self.steps()
+        total = (time.perf_counter() - self.origin) * 1000
+        print("\n" + "=" * 60)
+        print("STARTUP PROFILE:")
+        for name, offset, duration, thread in steps:
+            print(f"  +{offset:7.1f}ms {duration:8.1f}ms  {name} [{thread}]")
+        print(f"  Total: {total:.1f}ms wall, {sum(step[2] for step in steps):.1f}ms of steps")
+        print("=" * 60 + "\n")
+
+
+class _Step:
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler.record(self._name, self._start)
+        return False
+
+
+def run_parallel(tasks, profiler=None):
+    """
+    Run independent startup tasks on their own threads and wait for all of them.
+
+    Args:
+        tasks: Dict of step name to zero-argument callable
+        profiler: Optional StartupProfiler that records each task as a step
+
+    Returns:
+        dict: Step name to the callable's return value
+
+    Raises:
+        Exception: The first task's exception, after every task has finished
+    """
+    results = {}
+    errors = []
+
+    def run(name, task):
+        start = time.perf_counter()
+        try:
+            results[name] = task()
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            if profiler is not None:
+                profiler.record(name, start)
+
+    threads = [threading.Thread(target=run, args=(name, task), name=name, daemon=True) for name, task in tasks.items()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
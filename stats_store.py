@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Persistent player and session statistics (SQLite, write-behind)
+
+The game records sessions (one word, or one spelling/two-player game) and
+attempts (every accepted letter, right or wrong, with the time since that
+letter became the target). ``record_*`` calls only append to an in-memory
+queue; a background thread commits them in batches to a WAL-mode SQLite
+database, so the game loop never touches the disk. Aggregates per letter, per
+player and per day are read over separate connections, which WAL lets run
+while the writer commits.
+
+Usage:
+    python stats_store.py --bench               # sustained ingestion benchmark
+    python stats_store.py --db stats.db         # print the aggregates
+"""
+import argparse
+import contextlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+
+DEFAULT_STATS_PATH = "stats.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    player TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    word TEXT,
+    started REAL NOT NULL,
+    ended REAL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    day TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT,
+    player TEXT NOT NULL,
+    letter TEXT NOT NULL,
+    detected TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    ms REAL,
+    ts REAL NOT NULL,
+    day TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_letter ON attempts (letter, correct, ms);
+CREATE INDEX IF NOT EXISTS attempts_player ON attempts (player, correct);
+CREATE INDEX IF NOT EXISTS attempts_day ON attempts (day);
+CREATE INDEX IF NOT EXISTS sessions_player ON sessions (player);
+CREATE INDEX IF NOT EXISTS sessions_day ON sessions (day);
+"""
+
+_INSERT_SESSION = "INSERT INTO sessions (id, player, mode, word, started, day) VALUES (?, ?, ?, ?, ?, ?)"
+_END_SESSION = "UPDATE sessions SET ended = ?, completed = ? WHERE id = ?"
+_INSERT_ATTEMPT = (
+    "INSERT INTO attempts (session_id, player, letter, detected, correct, ms, ts, day) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _day(timestamp):
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+def _rows(cursor):
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+class StatsStore:
+    """
+    Write-behind SQLite store for sessions and letter attempts.
+
+    Usage:
+        stats = StatsStore("stats.db").start()
+        session = stats.start_session("ana", "word", "HELLO")
+        stats.record_attempt(session, "ana", "H", "H", ms=850.0)
+        stats.end_session(session, completed=True)
+        stats.per_letter()
+    """
+
+    def __init__(self, path=DEFAULT_STATS_PATH, batch_size=500, flush_interval=0.5, max_pending=100000, metrics=None,
+                 events=None):
+        """
+        Args:
+            path: SQLite database file (created with the schema if missing)
+            batch_size: Most rows committed in one transaction
+            flush_interval: Seconds the writer waits for more rows before committing what it has
+            max_pending: Rows queued before new ones are dropped (and counted)
+            metrics: Optional MetricsRegistry for stats_commit_ms timings and stats_rows/stats_dropped counts
+            events: Optional EventLog for write errors (default: printed)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.metrics = metrics
+        self.events = events
+        self.dropped = 0
+        self.committed = 0
+        self._pending = deque()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread = None
+        # sqlite3's own context manager only commits; closing() also releases the connection
+        with contextlib.closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=5.0)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    # --- Recording (game thread; never blocks on disk) --------------------------------------
+
+    def _enqueue(self, statement, params):
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._idle.clear()
+        self._pending.append((statement, params))
+        if len(self._pending) >= self.batch_size:
+            self._ready.set()
+
+    def start_session(self, player, mode, word=None):
+        """
+        Record the start of a game.
+
+        Returns:
+            str: Session ID for record_attempt and end_session
+        """
+        session_id = uuid.uuid4().hex
+        now = time.time()
+        self._enqueue(_INSERT_SESSION, (session_id, player, mode, word, now, _day(now)))
+        return session_id
+
+    def end_session(self, session_id, completed=False):
+        """Record the end of a game (completed: the word was finished)"""
+        self._enqueue(_END_SESSION, (time.time(), int(completed), session_id))
+
+    def record_attempt(self, session_id, player, letter, detected, ms=None):
+        """
+        Record one accepted letter.
+
+        Args:
+            session_id: From start_session (or None)
+            player: Player name
+            letter: Target letter
+            detected: Letter accepted by the recognizer
+            ms: Milliseconds since the target letter became active
+        """
+        now = time.time()
+        self._enqueue(_INSERT_ATTEMPT, (session_id, player, letter, detected, int(letter == detected), ms, now, _day(now)))
+
+    # --- Writer ---------------------------------------------------------------------------
+
+    def start(self):
+        """Start the background writer"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        """Commit everything queued and stop the writer"""
+        self._stop.set()
+        self._ready.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def wait_idle(self, timeout=None):
+        """Block until every queued row is committed (tests and benchmarks)"""
+        return self._idle.wait(timeout)
+
+    def flush(self, connection=None):
+        """Commit every queued row on the calling thread (the writer; stop() calls it too)"""
+        own = connection is None
+        connection = connection or self._connect()
+        try:
+            while self._pending:
+                self._commit_batch(connection)
+        finally:
+            if own:
+                connection.close()
+        if not self._pending:
+            self._idle.set()
+
+    def _commit_batch(self, connection):
+        batch = []
+        while self._pending and len(batch) < self.batch_size:
+            try:
+                batch.append(self._pending.popleft())
+            except IndexError:
+                break
+        if not batch:
+            return
+        start = time.perf_counter()
+        try:
+            with connection:
+                # Consecutive rows for the same statement go in one executemany
+                index = 0
+                while index < len(batch):
+                    statement = batch[index][0]
+                    end = index
+                    while end < len(batch) and batch[end][0] == statement:
+                        end += 1
+                    connection.executemany(statement, [params for _, params in batch[index:end]])
+                    index = end
+        except sqlite3.Error as e:
+            # The transaction was rolled back and its rows are gone: count them with the other drops
+            self.dropped += len(batch)
+            self._report(f"Stats store error: {e} ({len(batch)} rows dropped)", rows=len(batch))
+            if self.metrics is not None:
+                self.metrics.set_gauge("stats_dropped", self.dropped)
+            return
+        self.committed += len(batch)
+        if self.metrics is not None:
+            self.metrics.observe("stats_commit_ms", (time.perf_counter() - start) * 1000)
+            self.metrics.increment("stats_rows", len(batch))
+            self.metrics.set_gauge("stats_dropped", self.dropped)
+
+    def _run(self):
+        connection = self._connect()
+        try:
+            while not self._stop.is_set():
+                self._ready.wait(self.flush_interval)
+                self._ready.clear()
+                try:
+                    self.flush(connection)
+                except sqlite3.Error as e:
+                    self._report(f"Stats store error: {e}")
+        finally:
+            connection.close()
+
+    def _report(self, message, **fields):
+        if self.events is not None:
+            self.events.emit("error", message, level="error", where="stats_store", **fields)
+        else:
+            print(message)
+
+    # --- Aggregates (any thread) ----------------------------------------------------------
+
+    def _query(self, sql, params=()):
+        connection = self._connect()
+        try:
+            return _rows(connection.execute(sql, params))
+        finally:
+            connection.close()
+
+    def per_letter(self, player=None):
+        """
+        Returns:
+            list: One dict per target letter: attempts, correct, accuracy, mean and max ms to a correct acceptance
+        """
+        where, params = ("WHERE player = ?", (player,)) if player is not None else ("", ())
+        return self._query(
+            f"""
+            SELECT letter, COUNT(*) AS attempts, SUM(correct) AS correct,
+                   ROUND(AVG(correct), 3) AS accuracy,
+                   ROUND(AVG(CASE WHEN correct THEN ms END), 1) AS mean_ms_to_correct,
+                   ROUND(MAX(CASE WHEN correct THEN ms END), 1) AS max_ms_to_correct
+            FROM attempts {where} GROUP BY letter ORDER BY letter
+            """,
+            params,
+        )
+
+    def per_player(self):
+        """
+        Returns:
+            list: One dict per player: sessions, completed words, attempts and accuracy
+        """
+        return self._query(
+            """
+            SELECT s.player, s.sessions, s.completed, COALESCE(a.attempts, 0) AS attempts, a.accuracy
+            FROM (SELECT player, COUNT(*) AS sessions, SUM(completed) AS completed FROM sessions GROUP BY player) AS s
+            LEFT JOIN (SELECT player, COUNT(*) AS attempts, ROUND(AVG(correct), 3) AS accuracy
+                       FROM attempts GROUP BY player) AS a ON a.player = s.player
+            ORDER BY s.player
+            """
+        )
+
+    def per_day(self, days=30):
+        """
+        Returns:
+            list: One dict per day (newest first, at most ``days``): sessions, completed words, attempts and accuracy
+        """
+        return self._query(
+            """
+            SELECT s.day, s.sessions, s.completed, COALESCE(a.attempts, 0) AS attempts, a.accuracy
+            FROM (SELECT day, COUNT(*) AS sessions, SUM(completed) AS completed FROM sessions GROUP BY day) AS s
+            LEFT JOIN (SELECT day, COUNT(*) AS attempts, ROUND(AVG(correct), 3) AS accuracy
+                       FROM attempts GROUP BY day) AS a ON a.day = s.day
+            ORDER BY s.day DESC LIMIT ?
+            """,
+            (days,),
+        )
+
+
+def benchmark(n_attempts=200000, batch_size=500, path=None):
+    """
+    Sustained ingestion: record attempts as fast as possible while the writer commits.
+
+    Returns:
+        dict: record() cost, end-to-end rows/s, commit count and the time one per-letter aggregate takes
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        store = StatsStore(path or os.path.join(directory, "bench.db"), batch_size=batch_size,
+                           max_pending=n_attempts + 1).start()
+        session = store.start_session("bench", "word", "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+        letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        start = time.perf_counter()
+        worst = 0.0
+        for index in range(n_attempts):
+            call = time.perf_counter()
+            letter = letters[index % 26]
+            store.record_attempt(session, "bench", letter, letter if index % 5 else "X", ms=float(index % 2000))
+            worst = max(worst, time.perf_counter() - call)
+        enqueued = time.perf_counter() - start
+        store.wait_idle()
+        total = time.perf_counter() - start
+        query_start = time.perf_counter()
+        store.per_letter()
+        query_ms = (time.perf_counter() - query_start) * 1000
+        store.stop()
+    return {
+        "rows": n_attempts,
+        "record_us": enqueued / n_attempts * 1e6,
+        "record_max_us": worst * 1e6,
+        "rows_per_s": n_attempts / total,
+        "per_letter_ms": query_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Player and session statistics")
+    parser.add_argument("--db", default=DEFAULT_STATS_PATH, help="statistics database")
+    parser.add_argument("--bench", action="store_true", help="benchmark sustained ingestion into a temporary database")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    if args.bench:
+        print("=" * 60)
+        print(f"STATS INGESTION BENCHMARK: {args.rows} attempts, batches of {args.batch_size}")
+        print("=" * 60)
+        result = benchmark(args.rows, args.batch_size)
+        print(f"  record():   {result['record_us']:.2f}µs mean, {result['record_max_us']:.0f}µs max on the caller")
+        print(f"  committed:  {result['rows_per_s']:,.0f} rows/s end to end")
+        print(f"  per-letter: {result['per_letter_ms']:.1f}ms over {result['rows']} rows")
+        print("=" * 60)
+        return
+
+    if not os.path.exists(args.db):
+        print(f"No statistics yet ({args.db} not found)")
+        return
+    store = StatsStore(args.db)
+    for title, rows in (("PER LETTER", store.per_letter()), ("PER PLAYER", store.per_player()), ("PER DAY", store.per_day())):
+        print(title)
+        for row in rows:
+            print("  " + " | ".join(f"{key}: {value}" for key, value in row.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Custom signs matched against recorded templates
+
+Users add their own signs by holding a handshape for a few seconds
+(``start_recording``); every recorded frame becomes one template. Templates are
+the 21 world landmarks made wrist-relative, scaled to unit palm length and
+mirrored to right-hand orientation, so a template matches either hand at any
+distance from the camera.
+
+``observe`` runs on the MediaPipe callback thread beside the letter classifier
+and never waits for index maintenance. Indexed templates sit in a KD-tree;
+templates added since the last build sit in a small buffer searched by brute
+force. Once the buffer reaches ``rebuild_every`` rows a background thread builds
+a tree over everything, saves the store and swaps the new state in with one
+reference assignment.
+"""
+import os
+import threading
+import time
+from collections import Counter, namedtuple
+import numpy as np
+from startup import lazy_import
+
+spatial = lazy_import("scipy.spatial")
+
+DEFAULT_TEMPLATE_PATH = "custom_signs.npz"
+
+WRIST = 0
+MIDDLE_MCP = 9  # wrist to middle-finger knuckle is the palm length used for scale
+
+# Immutable snapshot read once per lookup: a KD-tree over the indexed templates (or None)
+# with their labels, plus the rows added since that tree was built
+_State = namedtuple("_State", ["tree", "labels", "buffer", "buffer_labels"])
+
+_EMPTY = np.empty((0, 63), dtype=np.float32)
+_NO_LABELS = np.empty(0, dtype=str)
+
+
+def normalize_landmarks(features):
+    """
+    Template rows from classifier feature rows.
+
+    Args:
+        features: Unscaled feature rows of shape (n, 64) (handedness index, then x, y, z per landmark)
+
+    Returns:
+        np.ndarray: float32 rows of shape (n, 63), wrist at the origin, unit palm length, left hands mirrored
+    """
+    features = np.asarray(features, dtype=np.float32).reshape(-1, 64)
+    points = features[:, 1:].reshape(-1, 21, 3)
+    points = points - points[:, WRIST:WRIST + 1]
+    scale = np.linalg.norm(points[:, MIDDLE_MCP], axis=1)
+    points = points / np.maximum(scale, 1e-6)[:, None, None]
+    points[features[:, 0] == 1, :, 0] *= -1
+    return points.reshape(-1, 63)
+
+
+class TemplateStore:
+    """
+    Nearest-neighbour lookup of user-recorded signs.
+
+    Usage:
+        store = TemplateStore("custom_signs.npz")
+        engine.templates = store
+        store.start_recording("HELLO")      # hold the sign for a few seconds
+        hand.custom                          # ("HELLO", distance) while it is shown
+    """
+
+    def __init__(self, path=DEFAULT_TEMPLATE_PATH, k=5, max_distance=0.5, rebuild_every=256, metrics=None):
+        """
+        Args:
+            path: .npz file the store is loaded from (if it exists) and saved to; None keeps it in memory
+            k: Neighbours that vote on the label
+            max_distance: Neighbours further away than this (in palm lengths) are ignored
+            rebuild_every: Buffered templates that trigger a background rebuild of the tree
+            metrics: Optional MetricsRegistry for template_match_ms and template_rebuild_ms timings
+        """
+        self.path = path
+        self.k = k
+        self.max_distance = max_distance
+        self.rebuild_every = rebuild_every
+        self.metrics = metrics
+        self.last_error = None
+        self._state = _State(None, _NO_LABELS, _EMPTY, _NO_LABELS)
+        self._lock = threading.Lock()  # serializes writers of _state; readers never take it
+        self._build_lock = threading.Lock()  # held by rebuild() and remove(); add() only appends
+        self._rebuild_lock = threading.Lock()
+        self._rebuilder = None
+        self._rebuild_pending = False
+        self._drops = set()  # labels removed since the last rebuild
+        self._recording = None  # (label, end time, rows)
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        state = self._state
+        return len(state.labels) + len(state.buffer_labels)
+
+    # --- Templates -------------------------------------------------------------------------
+
+    def add(self, label, features):
+        """
+        Add templates for a label; they are searchable immediately.
+
+        Args:
+            label: Sign name
+            features: Unscaled feature rows of shape (n, 64)
+        """
+        rows = normalize_landmarks(features)
+        with self._lock:
+            state = self._state
+            self._state = state._replace(
+                buffer=np.concatenate([state.buffer, rows]),
+                buffer_labels=np.concatenate([state.buffer_labels, np.full(len(rows), str(label))]),
+            )
+            buffered = len(self._state.buffer)
+        if buffered >= self.rebuild_every:
+            self.request_rebuild()
+
+    def remove(self, label):
+        """Delete every template of a label (rebuilds in the background)"""
+        with self._build_lock, self._lock:
+            state = self._state
+            keep = state.buffer_labels != label
+            self._state = state._replace(buffer=state.buffer[keep], buffer_labels=state.buffer_labels[keep])
+        self.request_rebuild(drop=label)
+
+    def labels(self):
+        """
+        Returns:
+            dict: Template count per label
+        """
+        state = self._state
+        return dict(sorted(Counter(state.labels.tolist() + state.buffer_labels.tolist()).items()))
+
+    def request_rebuild(self, drop=None):
+        """
+        Rebuild the tree over all templates in the background, then save.
+
+        Args:
+            drop: Optional label whose indexed templates are left out
+        """
+        with self._rebuild_lock:
+            self._rebuild_pending = True
+            if drop is not None:
+                self._drops.add(drop)
+            if self._rebuilder is None:
+                self._rebuilder = threading.Thread(target=self._rebuild_loop, daemon=True)
+                self._rebuilder.start()
+
+    def rebuild(self, drop=()):
+        """Rebuild the tree on the calling thread (tests, and saving on shutdown)"""
+        with self._build_lock:
+            self._rebuild(drop)
+
+    def _rebuild(self, drop):
+        start = time.perf_counter()
+        state = self._state
+        indexed = state.tree.data if state.tree is not None else _EMPTY
+        keep = ~np.isin(state.labels, list(drop))
+        rows = np.concatenate([indexed[keep], state.buffer]).astype(np.float32)
+        labels = np.concatenate([state.labels[keep], state.buffer_labels])
+        tree = spatial.cKDTree(rows) if len(rows) else None
+        merged = len(state.buffer)
+        with self._lock:
+            # Rows added while the tree was being built stay in the buffer
+            current = self._state
+            self._state = _State(tree, labels, current.buffer[merged:], current.buffer_labels[merged:])
+        if self.metrics is not None:
+            self.metrics.observe("template_rebuild_ms", (time.perf_counter() - start) * 1000)
+        if self.path is not None:
+            self.save(self.path)
+
+    def _rebuild_loop(self):
+        while True:
+            with self._rebuild_lock:
+                if not self._rebuild_pending:
+                    self._rebuilder = None
+                    return
+                self._rebuild_pending = False
+                drops, self._drops = self._drops, set()
+            try:
+                self.rebuild(drops)
+            except Exception as e:
+                self.last_error = f"rebuild failed: {e}"
+
+    # --- Persistence -----------------------------------------------------------------------
+
+    def save(self, path):
+        """Write all templates and labels to an .npz file (atomically replaced)"""
+        state = self._state
+        indexed = state.tree.data if state.tree is not None else _EMPTY
+        temporary = f"{path}.tmp.npz"
+        np.savez(
+            temporary,
+            templates=np.concatenate([indexed, state.buffer]).astype(np.float32),
+            labels=np.concatenate([state.labels, state.buffer_labels]),
+        )
+        os.replace(temporary, path)
+
+    def load(self, path):
+        """Replace the templates with those in an .npz file and index them"""
+        with np.load(path) as data:
+            rows, labels = data["templates"].astype(np.float32), data["labels"].astype(str)
+        tree = spatial.cKDTree(rows) if len(rows) else None
+        with self._lock:
+            self._state = _State(tree, labels, _EMPTY, _NO_LABELS)
+
+    # --- Per frame -------------------------------------------------------------------------
+
+    def match(self, features):
+        """
+        Closest custom sign for each hand.
+
+        Args:
+            features: Unscaled feature rows of shape (n_hands, 64)
+
+        Returns:
+            list: (label, distance) per row, or None where no template is within max_distance
+        """
+        start = time.perf_counter()
+        state = self._state
+        rows = normalize_landmarks(features)
+        distances = np.full((len(rows), 0), np.inf)
+        labels = np.empty((len(rows), 0), dtype=state.labels.dtype)
+        if state.tree is not None:
+            k = min(self.k, len(state.labels))
+            found, index = state.tree.query(rows, k=k, distance_upper_bound=self.max_distance)
+            found, index = found.reshape(len(rows), k), index.reshape(len(rows), k)
+            distances = found
+            # Missing neighbours come back with index == n; give them a placeholder label
+            labels = np.append(state.labels, "")[index]
+        if len(state.buffer):
+            brute = np.linalg.norm(rows[:, None, :] - state.buffer[None, :, :], axis=2)
+            distances = np.concatenate([distances, brute], axis=1)
+            labels = np.concatenate([labels, np.broadcast_to(state.buffer_labels, brute.shape)], axis=1)
+        matches = [self._vote(row_distances, row_labels) for row_distances, row_labels in zip(distances, labels)]
+        if self.metrics is not None:
+            self.metrics.observe("template_match_ms", (time.perf_counter() - start) * 1000)
+        return matches
+
+    def _vote(self, distances, labels):
+        order = np.argsort(distances)[:self.k]
+        order = order[distances[order] <= self.max_distance]
+        if not len(order):
+            return None
+        votes = Counter(labels[order].tolist())
+        label = max(votes, key=lambda name: (votes[name], -distances[order][labels[order] == name].min()))
+        return label, float(distances[order][labels[order] == label].min())
+
+    # --- Recording -------------------------------------------------------------------------
+
+    def start_recording(self, label, seconds=3.0):
+        """
+        Record templates for a label from the next frames that show exactly one hand.
+
+        Args:
+            label: Sign name
+            seconds: Recording length
+        """
+        self._recording = (str(label), time.monotonic() + seconds, [])
+
+    @property
+    def recording(self):
+        """Label being recorded, or None"""
+        recording = self._recording
+        return recording[0] if recording is not None else None
+
+    def observe(self, features):
+        """
+        Per-frame hook: record while a recording is running, then match.
+
+        Args:
+            features: Unscaled feature rows of shape (n_hands, 64)
+
+        Returns:
+            list: match() result per row
+        """
+        recording = self._recording
+        if recording is not None:
+            label, end, rows = recording
+            if time.monotonic() < end:
+                if len(features) == 1:
+                    rows.append(np.array(features[0]))
+            else:
+                self._recording = None
+                if rows:
+                    self.add(label, np.stack(rows))
+                    # Save the new sign right away rather than at the next rebuild
+                    self.request_rebuild()
+                else:
+                    self.last_error = f"no single hand seen while recording {label}"
+        return self.match(features)
+
+    def status(self):
+        """
+        Returns:
+            dict: JSON-serializable labels with template counts, recording label, last error
+        """
+        state = self._state
+        return {
+            "labels": self.labels(),
+            "templates": len(self),
+            "indexed": len(state.labels),
+            "recording": self.recording,
+            "last_error": self.last_error,
+        }
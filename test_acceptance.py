@@ -0,0 +1,102 @@
+"""
+Replay tests for the smoothed letter acceptor
+"""
+import string
+import unittest
+import numpy as np
+from acceptance import LetterAcceptor, replay
+
+LABELS = list(string.ascii_uppercase)
+
+
+def synthetic_session(word, rng, frames_per_letter=30, gap_frames=10, flicker=0.15):
+    """
+    Build a noisy stream of a user signing a word, one letter at a time.
+
+    Each letter ramps up from uncertain to confident; with probability ``flicker``
+    a frame is dominated by a random wrong letter, as raw classifiers do while a
+    hand shape is forming. Letters are separated by frames without a hand.
+    """
+    frames, truth = [], []
+    for letter in word:
+        target = LABELS.index(letter)
+        for i in range(frames_per_letter):
+            probs = rng.dirichlet(np.ones(len(LABELS)))
+            confidence = min(0.9, 0.3 + 0.06 * i)
+            if rng.random() < flicker:
+                probs = probs * 0.3
+                probs[rng.integers(len(LABELS))] += 0.7
+            else:
+                probs = probs * (1.0 - confidence)
+                probs[target] += confidence
+            frames.append(probs)
+            truth.append(letter)
+        for _ in range(gap_frames):
+            frames.append(None)
+            truth.append(None)
+    return frames, truth
+
+
+class TestLetterAcceptor(unittest.TestCase):
+    """Test acceptance state transitions"""
+
+    def test_single_spike_is_not_accepted(self):
+        """Test that one confident frame does not accept a letter"""
+        acceptor = LetterAcceptor(LABELS)
+        probs = np.zeros(len(LABELS))
+        probs[LABELS.index("A")] = 1.0
+        letter, _ = acceptor.update(probs)
+        self.assertIsNone(letter)
+        self.assertEqual(acceptor.accept_count, 0)
+
+    def test_held_sign_is_accepted_once(self):
+        """Test hysteresis: a held sign is accepted once and released when the hand drops"""
+        acceptor = LetterAcceptor(LABELS)
+        probs = np.zeros(len(LABELS))
+        probs[LABELS.index("B")] = 0.95
+        for _ in range(60):
+            letter, confidence = acceptor.update(probs)
+        self.assertEqual(letter, "B")
+        self.assertGreater(confidence, 0.9)
+        self.assertEqual(acceptor.accept_count, 1)
+        for _ in range(20):
+            letter, _ = acceptor.update_absent()
+        self.assertIsNone(letter)
+
+    def test_per_class_thresholds(self):
+        """Test that a per-class enter threshold can make a letter harder to accept"""
+        acceptor = LetterAcceptor(LABELS, thresholds={"C": (0.99, 0.5)})
+        probs = np.zeros(len(LABELS))
+        probs[LABELS.index("C")] = 0.9
+        for _ in range(60):
+            letter, _ = acceptor.update(probs)
+        self.assertIsNone(letter)
+
+
+class TestReplay(unittest.TestCase):
+    """Replay noisy sessions and report accept latency and false-accept rate"""
+
+    def test_replay_against_single_frame_baseline(self):
+        """Test that smoothing removes false and duplicate accepts at a bounded latency cost"""
+        rng = np.random.default_rng(42)
+        frames, truth = synthetic_session("HELLOWORLDSIGNID", rng)
+
+        smoothed = replay(LetterAcceptor(LABELS), frames, truth)
+        # Single-frame acceptance, equivalent to comparing each raw prediction
+        baseline = replay(LetterAcceptor(LABELS, window=1, alpha=1.0, enter_threshold=0.0, exit_threshold=0.0), frames, truth)
+
+        print(
+            f"\n  smoothed: {smoothed['accepts']} accepts, false-accept rate {smoothed['false_accept_rate']:.2%}, "
+            f"latency {smoothed['mean_latency_frames']:.1f} frames (max {smoothed['max_latency_frames']})"
+            f"\n  baseline: {baseline['accepts']} accepts, false-accept rate {baseline['false_accept_rate']:.2%}, "
+            f"latency {baseline['mean_latency_frames']:.1f} frames (max {baseline['max_latency_frames']})"
+        )
+        self.assertEqual(smoothed["missed_segments"], 0)
+        self.assertEqual(smoothed["false_accepts"], 0)
+        self.assertEqual(smoothed["duplicate_accepts"], 0)
+        self.assertGreater(baseline["false_accept_rate"], 0.3)
+        self.assertLessEqual(smoothed["max_latency_frames"], 20)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,77 @@
+"""
+Test suite for the camera characterization tool
+"""
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from camera_characterize import characterize, summarize
+
+
+def sample(t, frame_id, pos_msec=0.0, monotonic_ms=0.0):
+    """Build one capture sample at time t (seconds) showing frame frame_id"""
+    return {"time": t, "monotonic_ms": monotonic_ms, "read_ms": 1.0, "retrieve_ms": 0.0,
+            "hash": bytes([frame_id]), "pos_msec": pos_msec}
+
+
+class TestSummarize(unittest.TestCase):
+    """Test the metrics computed from per-frame samples"""
+
+    def test_steady_capture(self):
+        """Test that an even 50 FPS stream has no jitter, drops or duplicates"""
+        samples = [sample(i * 0.02, i) for i in range(50)]
+        metrics = summarize(samples)
+        self.assertAlmostEqual(metrics["fps"], 50.0, places=3)
+        self.assertAlmostEqual(metrics["interval_ms"]["p99"], 20.0, places=3)
+        self.assertEqual(metrics["dropped"], 0)
+        self.assertEqual(metrics["duplicates"], 0)
+        self.assertIsNone(metrics["retrieve_ms"])
+
+    def test_gaps_count_as_dropped_frames(self):
+        """Test that a gap of three periods counts two missing frames"""
+        times = [i * 0.02 for i in range(20)] + [0.38 + 0.06 + i * 0.02 for i in range(20)]
+        metrics = summarize([sample(t, i) for i, t in enumerate(times)])
+        self.assertEqual(metrics["dropped"], 2)
+        self.assertAlmostEqual(metrics["interval_ms"]["max"], 60.0, places=3)
+
+    def test_repeated_image_is_a_duplicate(self):
+        """Test that consecutive frames with the same hash are counted"""
+        samples = [sample(i * 0.02, 42 if i in (4, 5, 6) else i) for i in range(10)]
+        self.assertEqual(summarize(samples)["duplicates"], 2)
+
+    def test_age_needs_monotonic_timestamps(self):
+        """Test that ages are reported only when driver timestamps are on the monotonic clock"""
+        plausible = [sample(i * 0.02, i, pos_msec=1000.0 + 20 * i, monotonic_ms=1030.0 + 20 * i) for i in range(10)]
+        self.assertAlmostEqual(summarize(plausible)["age_ms"]["p50"], 30.0)
+        # Video files report their playback position instead
+        other_base = [sample(i * 0.02, i, pos_msec=20.0 * i, monotonic_ms=9e6 + 20 * i) for i in range(10)]
+        self.assertIsNone(summarize(other_base)["age_ms"])
+
+
+class TestCharacterize(unittest.TestCase):
+    """Test a full sweep on a video file"""
+
+    def test_sweep_over_video(self):
+        """Test that every buffer size and read mode produces a run with the video's frames"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "clip.avi")
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+            if not writer.isOpened():
+                self.skipTest("No video encoder available")
+            for i in range(30):
+                # Frames 10 and 11 are identical
+                writer.write(np.full((48, 64, 3), (10 if i == 11 else i) * 8, dtype=np.uint8))
+            writer.release()
+
+            report = characterize(path, buffer_sizes=(1,), n_frames=25, warmup=2)
+        self.assertEqual([run["read_mode"] for run in report["runs"]], ["read", "grab_retrieve"])
+        for run in report["runs"]:
+            self.assertEqual(run["frames"], 25)
+            self.assertEqual(run["duplicates"], 1)
+            self.assertEqual(run["settings"]["width"], 64)
+        self.assertIsNotNone(report["runs"][1]["retrieve_ms"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,115 @@
+"""
+Test suite for the early-exit classifier cascade
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import numpy as np
+from sklearn.neighbors import KNeighborsClassifier
+from cascade import CascadeClassifier, CentroidStage, LinearStage, build_cascade, calibrate_thresholds, margins
+from model_store import artifact_paths, load_model
+from test_train_model import write_dataset
+from train_model import train
+
+
+def blobs(n_per_class=100, spread=1.0, seed=0):
+    """Three Gaussian classes in 8 dimensions, close enough to overlap a little"""
+    rng = np.random.default_rng(seed)
+    centers = np.eye(3, 8) * 3.0
+    data = np.concatenate([rng.normal(center, spread, (n_per_class, 8)) for center in centers])
+    labels = np.repeat(np.array(["a", "b", "c"]), n_per_class)
+    return data, labels
+
+
+class TestStages(unittest.TestCase):
+    """Test the cheap stages"""
+
+    def test_stages_learn_blobs(self):
+        """Test that both cheap stages classify well-separated classes"""
+        data, labels = blobs(spread=0.5)
+        for stage in (LinearStage.fit(data, labels), CentroidStage.fit(data, labels)):
+            probs = stage.predict_proba(data)
+            np.testing.assert_allclose(probs.sum(axis=1), 1.0)
+            self.assertGreater(np.mean(stage.classes_[np.argmax(probs, axis=1)] == labels), 0.98)
+
+    def test_margins(self):
+        """Test the top-two probability margin"""
+        np.testing.assert_allclose(margins(np.array([[0.7, 0.2, 0.1], [0.4, 0.4, 0.2]])), [0.5, 0.0])
+
+
+class TestCascade(unittest.TestCase):
+    """Test early exit and calibration"""
+
+    def setUp(self):
+        self.data, self.labels = blobs()
+        self.full = KNeighborsClassifier(5).fit(self.data, self.labels)
+
+    def test_uncertain_rows_reach_full_model(self):
+        """Test that rows below the threshold get exactly the full model's probabilities"""
+        stage = CentroidStage.fit(self.data, self.labels)
+        cascade = CascadeClassifier([stage], [0.9], self.full)
+        probs = cascade.predict_proba(self.data)
+        exited = margins(stage.predict_proba(self.data)) >= 0.9
+        self.assertTrue(exited.any() and not exited.all())
+        np.testing.assert_allclose(probs[~exited], self.full.predict_proba(self.data[~exited]))
+        self.assertEqual(cascade.exits, [int(exited.sum()), int((~exited).sum())])
+        self.assertAlmostEqual(cascade.stats()["early_exit"], exited.mean())
+
+    def test_stage_with_fewer_classes(self):
+        """Test that a stage's columns land in the full model's class order"""
+        keep = self.labels != "a"
+        stage = LinearStage.fit(self.data[keep], self.labels[keep])
+        cascade = CascadeClassifier([stage], [0.0], self.full)
+        probs = cascade.predict_proba(self.data[keep][:5])
+        self.assertTrue(np.all(probs[:, 0] == 0.0))
+        np.testing.assert_allclose(probs[:, 1:], stage.predict_proba(self.data[keep][:5]))
+
+    def test_calibration_keeps_accuracy(self):
+        """Test that calibrated thresholds keep accuracy within tolerance while exiting most rows early"""
+        calibration, calibration_labels = blobs(seed=1)
+        stages = [CentroidStage.fit(self.data, self.labels), LinearStage.fit(self.data, self.labels)]
+        thresholds, full_accuracy, cascade_accuracy = calibrate_thresholds(
+            stages, self.full, calibration, calibration_labels, tolerance=0.0
+        )
+        self.assertGreaterEqual(cascade_accuracy, full_accuracy)
+        cascade = CascadeClassifier(stages, thresholds, self.full)
+        predicted = cascade.predict(calibration)
+        self.assertAlmostEqual(np.mean(predicted == calibration_labels), cascade_accuracy)
+        self.assertGreater(cascade.stats()["early_exit"], 0.5)
+
+    def test_build_writes_loadable_version(self):
+        """Test that a cascade over an archived predictor is written as the next version and loads like any model"""
+        with tempfile.TemporaryDirectory() as directory:
+            dataset = os.path.join(directory, "dataset")
+            archive = os.path.join(directory, "archive")
+            os.makedirs(dataset)
+            write_dataset(dataset)
+            train([dataset], {"knn": KNeighborsClassifier(3)}, budget_ms=1000.0, jobs=1, archive_dir=archive)
+            manifest = build_cascade([dataset], 1, tolerance=0.01, archive_dir=archive)
+            self.assertEqual(manifest["version"], 2)
+            self.assertEqual(manifest["cascade"]["base_version"], 1)
+            self.assertGreaterEqual(manifest["cascade"]["cascade_accuracy"], manifest["cascade"]["full_accuracy"] - 0.01)
+            model = load_model(*artifact_paths(2, archive))
+            self.assertIsInstance(model.classifier, CascadeClassifier)
+            self.assertEqual(model.labels, ["A", "B", "C"])
+
+    def test_cli_writes_loadable_version(self):
+        """Test that running cascade.py as a script writes a version another process can load"""
+        with tempfile.TemporaryDirectory() as directory:
+            dataset = os.path.join(directory, "dataset")
+            archive = os.path.join(directory, "archive")
+            os.makedirs(dataset)
+            write_dataset(dataset)
+            train([dataset], {"knn": KNeighborsClassifier(3)}, budget_ms=1000.0, jobs=1, archive_dir=archive)
+            script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cascade.py")
+            subprocess.run([sys.executable, script, dataset, "--version", "1", "--tolerance", "0.01", "--archive", archive],
+                           check=True, capture_output=True)
+            model = load_model(*artifact_paths(2, archive))
+            self.assertIsInstance(model.classifier, CascadeClassifier)
+            self.assertIs(type(model.classifier.stages[0]), CentroidStage)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,94 @@
+"""
+Test suite for dynamic-sign (J, Z) recognition
+"""
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from dynamic_signs import LandmarkWindow, DynamicSignRecognizer, TrajectoryTemplateModel
+
+
+def hand_at(x, y, rng=None, jitter=0.0):
+    """Build 21 landmarks for a hand whose fingertips sit around (x, y)"""
+    offsets = np.linspace(-0.03, 0.03, 21)
+    noise = rng.normal(0.0, jitter, (21, 2)) if rng is not None else np.zeros((21, 2))
+    return [SimpleNamespace(x=x + dx + nx, y=y + dy + ny, z=0.0) for dx, dy, (nx, ny) in zip(offsets, offsets, noise)]
+
+
+def trace(points, frames):
+    """Interpolate a polyline into per-frame positions"""
+    points = np.array(points, dtype=float)
+    segment = np.linspace(0, len(points) - 1, frames)
+    return np.stack([np.interp(segment, np.arange(len(points)), points[:, i]) for i in range(2)], axis=1)
+
+
+def run(recognizer, positions, rng, track_id=0):
+    """Feed a hand along a path and collect detections"""
+    detections = []
+    for x, y in positions:
+        result = recognizer.update(track_id, hand_at(x, y, rng, jitter=0.0005))
+        if result is not None:
+            detections.append(result[0])
+    return detections
+
+
+class TestLandmarkWindow(unittest.TestCase):
+    """Test the ring buffer view"""
+
+    def test_view_is_ordered_and_zero_copy(self):
+        """Test that the view is a slice of the buffer, oldest row first"""
+        window = LandmarkWindow(window=4)
+        for i in range(6):
+            window.push_landmarks(hand_at(i * 0.1, 0.0))
+        view = window.view()
+        self.assertEqual(view.shape, (4, 63))
+        self.assertIs(view.base, window._buffer)
+        np.testing.assert_allclose(view[:, 0], [0.2 - 0.03, 0.3 - 0.03, 0.4 - 0.03, 0.5 - 0.03])
+
+
+class TestDynamicSignRecognizer(unittest.TestCase):
+    """Test gesture detection on synthetic paths"""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        still = [(0.5, 0.4)] * 40
+        self.lead_in = still
+
+    def test_static_hand_never_runs_model(self):
+        """Test that a still hand stays below the energy gate"""
+        recognizer = DynamicSignRecognizer()
+        detections = run(recognizer, [(0.5, 0.5)] * 300, self.rng)
+        self.assertEqual(detections, [])
+        self.assertEqual(recognizer.model_calls, 0)
+
+    def test_z(self):
+        """Test that a Z drawn with the hand is recognized"""
+        recognizer = DynamicSignRecognizer()
+        path = trace([(0.4, 0.3), (0.6, 0.3), (0.4, 0.5), (0.6, 0.5)], 36)
+        detections = run(recognizer, self.lead_in + list(path) + [tuple(path[-1])] * 40, self.rng)
+        self.assertEqual(detections, ["Z"])
+
+    def test_mirrored_j(self):
+        """Test that a J drawn by the other hand is recognized"""
+        recognizer = DynamicSignRecognizer()
+        path = trace([(0.5, 0.3), (0.5, 0.45), (0.5, 0.54), (0.53, 0.6), (0.58, 0.6), (0.61, 0.54)], 36)
+        detections = run(recognizer, self.lead_in + list(path) + [tuple(path[-1])] * 40, self.rng)
+        self.assertEqual(detections, ["J"])
+
+    def test_straight_move_is_not_a_sign(self):
+        """Test that moving the hand into position is not mistaken for J or Z"""
+        recognizer = DynamicSignRecognizer()
+        path = trace([(0.2, 0.5), (0.7, 0.5)], 30)
+        detections = run(recognizer, self.lead_in + list(path) + [tuple(path[-1])] * 40, self.rng)
+        self.assertEqual(detections, [])
+        self.assertGreater(recognizer.model_calls, 0)
+
+    def test_model_rejects_tiny_motion(self):
+        """Test that the template model ignores paths below the minimum extent"""
+        model = TrajectoryTemplateModel()
+        window = np.zeros((40, 63))
+        window[:, 24] = np.linspace(0.5, 0.51, 40)
+        self.assertIsNone(model.predict_window(window))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
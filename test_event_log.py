@@ -0,0 +1,86 @@
+"""
+Test suite for the structured event log
+"""
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from event_log import EventLog
+from metrics import MetricsRegistry
+
+
+class TestEventLog(unittest.TestCase):
+    """Test batching, rate limiting, the ring and queries"""
+
+    def test_flush_writes_json_lines_and_messages(self):
+        """Test that a flush writes every event to the file and messages to the terminal"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.jsonl")
+            stream = io.StringIO()
+            events = EventLog(path, stream=stream)
+            events.emit("correct", "Correct! 'A'", letter="A")
+            events.emit("frame", index=3)
+            self.assertEqual(stream.getvalue(), "")
+            events.stop()
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual([record["event"] for record in records], ["correct", "frame"])
+        self.assertEqual(records[0]["letter"], "A")
+        self.assertEqual(records[1]["index"], 3)
+        self.assertEqual(stream.getvalue(), "Correct! 'A'\n")
+
+    def test_rate_limited_events_are_coalesced(self):
+        """Test that events inside the interval are held back and written once, with a count"""
+        stream = io.StringIO()
+        events = EventLog(rate_limits={"mismatch": 60.0}, stream=stream)
+        for letter in "BCDE":
+            events.emit("mismatch", f"Detected '{letter}'", letter=letter)
+        events.flush()
+        self.assertEqual([record["letter"] for record in events.recent("mismatch")], ["B"])
+        events.flush(release_held=True)
+        written = events.recent("mismatch")
+        self.assertEqual([record["letter"] for record in written], ["B", "E"])
+        self.assertEqual(written[1]["suppressed"], 2)
+        self.assertEqual(stream.getvalue(), "Detected 'B'\nDetected 'E' (+2 similar)\n")
+
+    def test_ring_drops_oldest(self):
+        """Test that a full ring drops the oldest unwritten events"""
+        metrics = MetricsRegistry()
+        events = EventLog(capacity=3, echo=False, metrics=metrics)
+        for index in range(5):
+            events.emit("frame", index=index)
+        self.assertEqual(events.dropped, 2)
+        events.flush()
+        self.assertEqual(metrics.snapshot()["gauges"]["events_dropped"], 2)
+
+    def test_recent_filters(self):
+        """Test querying by type, sequence number and limit"""
+        events = EventLog(echo=False)
+        for index in range(6):
+            events.emit("even" if index % 2 == 0 else "odd", index=index)
+        self.assertEqual([record["index"] for record in events.recent("even")], [0, 2, 4])
+        self.assertEqual([record["index"] for record in events.recent(since=4)], [4, 5])
+        self.assertEqual([record["index"] for record in events.recent(limit=2)], [4, 5])
+
+    def test_background_writer_and_cheap_emit(self):
+        """Test that the writer thread flushes on its own and emit costs microseconds"""
+        stream = io.StringIO()
+        events = EventLog(stream=stream, flush_interval=0.01).start()
+        try:
+            start = time.perf_counter()
+            for index in range(1000):
+                events.emit("frame", index=index)
+            self.assertLess((time.perf_counter() - start) / 1000 * 1e6, 50.0)
+            events.emit("done", "done")
+            deadline = time.monotonic() + 5.0
+            while "done" not in stream.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(stream.getvalue(), "done\n")
+        finally:
+            events.stop()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,114 @@
+"""
+Test suite for the offline landmark extraction dataset format
+"""
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from extract_landmarks import (
+    ROW_DTYPE,
+    INDEX_NAME,
+    ChunkWriter,
+    LandmarkDataset,
+    detection_rows,
+    discover_units,
+    pending_units,
+)
+
+
+def make_rows(n, frame_offset=0, value=0.0):
+    """Build n dataset rows with recognizable contents"""
+    rows = np.zeros(n, dtype=ROW_DTYPE)
+    rows["frame"] = np.arange(n) + frame_offset
+    rows["features"] = value
+    return rows
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x")
+
+
+class TestDiscovery(unittest.TestCase):
+    """Test finding work units and resuming"""
+
+    def test_units_and_labels(self):
+        """Test that videos are labelled by their directory and image folders by their own name"""
+        with tempfile.TemporaryDirectory() as root:
+            touch(os.path.join(root, "A", "clip1.mp4"))
+            touch(os.path.join(root, "B", "1.jpg"))
+            touch(os.path.join(root, "B", "0.png"))
+            touch(os.path.join(root, "B", "notes.txt"))
+            units = discover_units([root])
+            self.assertEqual(sorted((unit["kind"], unit["label"]) for unit in units), [("images", "B"), ("video", "A")])
+            images = next(unit for unit in units if unit["kind"] == "images")
+            self.assertEqual(images["images"], ["0.png", "1.jpg"])
+            self.assertEqual({unit["label"] for unit in discover_units([root], label="Z")}, {"Z"})
+
+    def test_pending_skips_finished_units(self):
+        """Test that finished units are skipped unless they changed or failed"""
+        with tempfile.TemporaryDirectory() as root:
+            touch(os.path.join(root, "A", "a.mp4"))
+            touch(os.path.join(root, "A", "b.mp4"))
+            touch(os.path.join(root, "A", "c.mp4"))
+            a, b, c = sorted(discover_units([root]), key=lambda unit: unit["path"])
+            with open(os.path.join(root, INDEX_NAME), "w") as f:
+                entries = [dict(a, rows=0, chunks=[]), dict(b, mtime=b["mtime"] - 10, rows=0, chunks=[]),
+                           {"path": c["path"], "error": "boom"}]
+                # Ends with a line cut short, as after a crash mid-write
+                f.write("".join(json.dumps(entry) + "\n" for entry in entries) + '{"path": "cut sh')
+            pending = pending_units([a, b, c], root)
+            self.assertEqual([unit["path"] for unit in pending], [b["path"], c["path"]])
+
+
+class TestChunks(unittest.TestCase):
+    """Test writing and reading chunked datasets"""
+
+    def test_units_span_chunks(self):
+        """Test that a unit larger than the chunk size is split across chunks and read back whole"""
+        with tempfile.TemporaryDirectory() as root:
+            writer = ChunkWriter(root, chunk_rows=4)
+            writer.append(make_rows(3, value=1.0))
+            first = writer.finish_unit()
+            writer.append(make_rows(6, frame_offset=100, value=2.0))
+            second = writer.finish_unit()
+            writer.close()
+            self.assertEqual(len(first), 1)
+            self.assertEqual([stop - start for _, start, stop in second], [1, 4, 1])
+
+            with open(os.path.join(root, INDEX_NAME), "w") as f:
+                f.writelines(
+                    json.dumps({"path": path, "label": label, "chunks": spans, "rows": n}) + "\n"
+                    for path, label, spans, n in (("/a", "A", first, 3), ("/b", "B", second, 6))
+                )
+            dataset = LandmarkDataset(root)
+            self.assertEqual(len(dataset), 9)
+            rows = dataset.rows(dataset.entries[1])
+            np.testing.assert_array_equal(rows["frame"], np.arange(6) + 100)
+            features, labels, units = dataset.arrays()
+            self.assertEqual(features.shape, (9, 64))
+            self.assertEqual(list(labels), ["A"] * 3 + ["B"] * 6)
+            self.assertEqual(list(units), [0] * 3 + [1] * 6)
+
+    def test_detection_rows(self):
+        """Test that a detection becomes one row per hand with classifier features and image landmarks"""
+        landmarks = [SimpleNamespace(x=0.1 * i, y=0.2, z=0.3) for i in range(21)]
+        detection = SimpleNamespace(
+            hand_landmarks=[landmarks, landmarks],
+            hand_world_landmarks=[landmarks, landmarks],
+            handedness=[[SimpleNamespace(index=1)], [SimpleNamespace(index=0)]],
+        )
+        rows = detection_rows(detection, 7)
+        self.assertEqual(list(rows["frame"]), [7, 7])
+        self.assertEqual(list(rows["hand"]), [0, 1])
+        self.assertEqual(list(rows["features"][:, 0]), [1.0, 0.0])
+        self.assertAlmostEqual(float(rows["landmarks"][0, 3]), 0.1, places=6)
+        empty = SimpleNamespace(hand_landmarks=[], hand_world_landmarks=[], handedness=[])
+        self.assertEqual(len(detection_rows(empty, 0)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,116 @@
+"""
+Test suite for the lexicon-constrained fingerspelling decoder
+"""
+import string
+import time
+import unittest
+import numpy as np
+from fingerspelling import PrefixTrie, LexiconBeamDecoder, DEFAULT_LEXICON_PATH
+
+ALPHABET = list(string.ascii_uppercase)
+
+
+def letter_frame(letter, confidence=0.9, rng=None):
+    """Build a probability vector peaked on one letter with the rest spread as noise"""
+    noise = rng.random(len(ALPHABET)) if rng is not None else np.ones(len(ALPHABET))
+    probs = noise / noise.sum() * (1.0 - confidence)
+    probs[ALPHABET.index(letter)] += confidence
+    return probs
+
+
+def spell(decoder, letters, frames_per_letter=8, rng=None):
+    """Feed a held sign per letter, with a short wobble between double letters"""
+    previous = None
+    for letter in letters:
+        if letter == previous:
+            for _ in range(2):
+                decoder.step(np.full(len(ALPHABET), 1.0 / len(ALPHABET)))
+        for _ in range(frames_per_letter):
+            decoder.step(letter_frame(letter, rng=rng))
+        previous = letter
+
+
+def lower_hand(decoder):
+    """Feed blank frames until the decoder commits (or gives up on) the word"""
+    for _ in range(decoder.commit_blank_frames):
+        word = decoder.step_blank()
+        if word is not None:
+            return word
+    return None
+
+
+class TestPrefixTrie(unittest.TestCase):
+    """Test trie construction"""
+
+    def test_build(self):
+        """Test node layout for a tiny lexicon"""
+        trie = PrefixTrie(["HE", "HELLO", "HELP"], ALPHABET)
+        self.assertEqual(trie.n_words, 3)
+        # root, H, HE, HEL, HELL, HELP, HELLO
+        self.assertEqual(trie.n_nodes, 7)
+        node = trie.children[0, ALPHABET.index("H")]
+        node = trie.children[node, ALPHABET.index("E")]
+        self.assertTrue(trie.is_word[node])
+        self.assertEqual(trie.prefixes[node], "HE")
+
+    def test_skips_unspellable_words(self):
+        """Test that words with letters outside the alphabet are dropped"""
+        trie = PrefixTrie(["ABC", "ABZ"], ["A", "B", "C"])
+        self.assertEqual(trie.n_words, 1)
+
+    def test_default_lexicon(self):
+        """Test that the shipped word list loads"""
+        trie = PrefixTrie.from_file(DEFAULT_LEXICON_PATH, ALPHABET)
+        self.assertGreater(trie.n_words, 100)
+
+
+class TestLexiconBeamDecoder(unittest.TestCase):
+    """Test decoding of per-frame probabilities"""
+
+    def setUp(self):
+        self.trie = PrefixTrie(["HELLO", "HELP", "HELD", "HE", "LOVE", "LOW"], ALPHABET)
+        self.rng = np.random.default_rng(0)
+
+    def test_held_letters_collapse(self):
+        """Test that a letter held over many frames is spelled once"""
+        decoder = LexiconBeamDecoder(self.trie)
+        spell(decoder, "HELP", frames_per_letter=30, rng=self.rng)
+        self.assertEqual(decoder.hypotheses(1)[0][0], "HELP")
+        self.assertEqual(lower_hand(decoder), "HELP")
+
+    def test_double_letter(self):
+        """Test that a wobble between double letters spells both"""
+        decoder = LexiconBeamDecoder(self.trie)
+        spell(decoder, "HELLO", rng=self.rng)
+        self.assertEqual(lower_hand(decoder), "HELLO")
+
+    def test_lexicon_rejects_noise(self):
+        """Test that an off-lexicon glitch frame does not derail the word"""
+        decoder = LexiconBeamDecoder(self.trie)
+        spell(decoder, "HEL", rng=self.rng)
+        decoder.step(letter_frame("Q", confidence=0.95))
+        spell(decoder, "D", rng=self.rng)
+        self.assertEqual(lower_hand(decoder), "HELD")
+
+    def test_partial_prefix_is_dropped(self):
+        """Test that lowering the hand mid-word resets without committing"""
+        decoder = LexiconBeamDecoder(self.trie)
+        spell(decoder, "LO", rng=self.rng)
+        self.assertIsNone(lower_hand(decoder))
+        self.assertEqual(decoder.hypotheses(1)[0][0], "")
+
+    def test_frame_cost(self):
+        """Test that a frame over the full lexicon stays well inside a 60 FPS budget"""
+        trie = PrefixTrie.from_file(DEFAULT_LEXICON_PATH, ALPHABET)
+        decoder = LexiconBeamDecoder(trie)
+        frames = [letter_frame(letter, confidence=0.5, rng=self.rng) for letter in "THANKYOU" * 50]
+        start = time.perf_counter()
+        for probs in frames:
+            decoder.step(probs)
+        per_frame_ms = (time.perf_counter() - start) * 1000 / len(frames)
+        print(f"\n  Beam decoder: {per_frame_ms:.3f}ms/frame over {trie.n_nodes} trie nodes")
+        self.assertLess(per_frame_ms, 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,88 @@
+"""
+Test suite for the shared-memory frame ring
+"""
+import unittest
+import multiprocessing as mp_proc
+import numpy as np
+from frame_ring import SharedFrameRing
+
+
+def _write_frames(name, values):
+    """Write one frame per value from another process"""
+    ring = SharedFrameRing.attach(name)
+    for value in values:
+        seq, view = ring.begin_write()
+        view[:] = value
+        ring.commit(seq)
+    ring.close()
+
+
+class TestSharedFrameRing(unittest.TestCase):
+    """Test writing, reading and overwrite detection"""
+
+    def setUp(self):
+        self.ring = SharedFrameRing.create(width=8, height=4, n_slots=3)
+
+    def tearDown(self):
+        self.ring.close()
+
+    def test_empty_ring_has_no_frame(self):
+        """Test that nothing is returned before the first commit"""
+        self.assertEqual(self.ring.latest_seq, 0)
+        self.assertIsNone(self.ring.latest())
+        self.assertIsNone(self.ring.read_latest())
+
+    def test_latest_is_a_read_only_view(self):
+        """Test that the newest frame comes back as a view into shared memory"""
+        frame = np.full((4, 8, 3), 7, dtype=np.uint8)
+        seq = self.ring.write(frame)
+        latest_seq, view = self.ring.latest()
+        self.assertEqual(latest_seq, seq)
+        np.testing.assert_array_equal(view, frame)
+        self.assertFalse(view.flags.writeable)
+        self.assertFalse(view.flags.owndata)
+        self.assertIsNone(self.ring.latest(last_seq=seq))
+
+    def test_overwritten_view_is_not_current(self):
+        """Test that a reader can tell its slot was reused after the ring wrapped"""
+        seq = self.ring.write(np.zeros((4, 8, 3), dtype=np.uint8))
+        for value in range(1, self.ring.n_slots):
+            self.ring.write(np.full((4, 8, 3), value, dtype=np.uint8))
+            self.assertTrue(self.ring.is_current(seq))
+        self.ring.write(np.full((4, 8, 3), 99, dtype=np.uint8))
+        self.assertFalse(self.ring.is_current(seq))
+
+    def test_slot_being_written_is_not_returned(self):
+        """Test that a claimed but uncommitted slot is never handed to readers"""
+        self.ring.write(np.ones((4, 8, 3), dtype=np.uint8))
+        seq, view = self.ring.begin_write()
+        view[:] = 5
+        latest_seq, latest_view = self.ring.latest()
+        self.assertLess(latest_seq, seq)
+        self.assertEqual(int(latest_view[0, 0, 0]), 1)
+        self.ring.commit(seq)
+        self.assertEqual(self.ring.latest_seq, seq)
+
+    def test_read_latest_copies_into_buffer(self):
+        """Test that read_latest fills a preallocated buffer"""
+        self.ring.write(np.full((4, 8, 3), 3, dtype=np.uint8))
+        out = np.empty((4, 8, 3), dtype=np.uint8)
+        seq, frame = self.ring.read_latest(out)
+        self.assertIs(frame, out)
+        self.assertEqual(seq, 1)
+        self.assertTrue((out == 3).all())
+
+    def test_frames_cross_processes(self):
+        """Test that frames written in another process are visible without copying through a pipe"""
+        ctx = mp_proc.get_context("spawn")
+        writer = ctx.Process(target=_write_frames, args=(self.ring.name, [10, 20, 30, 40]))
+        writer.start()
+        writer.join(30)
+        self.assertEqual(writer.exitcode, 0)
+        seq, view = self.ring.latest()
+        self.assertEqual(seq, 4)
+        self.assertTrue((view == 40).all())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
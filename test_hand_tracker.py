@@ -0,0 +1,73 @@
+"""
+Test suite for the multi-hand tracker
+"""
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from hand_tracker import HandTracker
+
+
+def fake_hand(cx, cy, size=0.1):
+    """Build 21 normalized landmarks spread around a centre point"""
+    offsets = np.linspace(-size / 2, size / 2, 21)
+    return [SimpleNamespace(x=cx + dx, y=cy + dy, z=0.0) for dx, dy in zip(offsets, offsets[::-1])]
+
+
+class TestHandTracker(unittest.TestCase):
+    """Test identity assignment across frames"""
+
+    def test_new_hands_get_ids(self):
+        """Test that each new hand gets its own ID"""
+        tracker = HandTracker(max_hands=2)
+        ids = tracker.update([fake_hand(0.3, 0.5), fake_hand(0.7, 0.5)])
+        self.assertEqual(sorted(ids), [0, 1])
+        self.assertEqual(tracker.active_ids, [0, 1])
+
+    def test_ids_follow_hands_when_detection_order_swaps(self):
+        """Test that IDs stick to positions, not to MediaPipe's detection order"""
+        tracker = HandTracker(max_hands=2)
+        left, right = tracker.update([fake_hand(0.3, 0.5), fake_hand(0.7, 0.5)])
+        for step in range(10):
+            # Hands drift towards each other and MediaPipe reports them in swapped order
+            ids = tracker.update([fake_hand(0.7 - 0.01 * step, 0.5), fake_hand(0.3 + 0.01 * step, 0.5)])
+            self.assertEqual(ids, [right, left])
+
+    def test_brief_dropout_keeps_id(self):
+        """Test that a hand missing for a few frames keeps its ID"""
+        tracker = HandTracker(max_hands=2, max_missed=3)
+        (first,) = tracker.update([fake_hand(0.5, 0.5)])
+        tracker.update([])
+        tracker.update([])
+        (again,) = tracker.update([fake_hand(0.52, 0.5)])
+        self.assertEqual(first, again)
+
+    def test_long_dropout_starts_new_track(self):
+        """Test that a hand gone longer than max_missed comes back with a new ID"""
+        tracker = HandTracker(max_hands=2, max_missed=2)
+        (first,) = tracker.update([fake_hand(0.5, 0.5)])
+        for _ in range(3):
+            tracker.update([])
+        self.assertEqual(tracker.active_ids, [])
+        (again,) = tracker.update([fake_hand(0.5, 0.5)])
+        self.assertNotEqual(first, again)
+
+    def test_far_jump_is_a_new_hand(self):
+        """Test that a detection far from every track is not matched to one"""
+        tracker = HandTracker(max_hands=2)
+        (first,) = tracker.update([fake_hand(0.1, 0.1)])
+        (second,) = tracker.update([fake_hand(0.9, 0.9)])
+        self.assertNotEqual(first, second)
+        self.assertEqual(tracker.active_ids, [first, second])
+
+    def test_new_hand_replaces_aging_track_when_slots_are_full(self):
+        """Test that a new hand never gets -1 while a missing hand still holds the only free slot"""
+        tracker = HandTracker(max_hands=2)
+        self.assertEqual(tracker.update([fake_hand(0.3, 0.5), fake_hand(0.7, 0.5)]), [0, 1])
+        self.assertEqual(tracker.update([fake_hand(0.3, 0.5)]), [0])
+        ids = tracker.update([fake_hand(0.3, 0.5), fake_hand(0.7, 0.1)])
+        self.assertEqual(ids, [0, 2])
+        self.assertEqual(tracker.active_ids, [0, 2])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
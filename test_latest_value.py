@@ -0,0 +1,99 @@
+"""
+Test suite for the latest-value mailbox
+"""
+import threading
+import time
+import unittest
+import numpy as np
+from latest_value import LatestValueMailbox
+
+
+class TestLatestValueMailbox(unittest.TestCase):
+    """Test single-threaded mailbox semantics"""
+
+    def test_initial_value(self):
+        """Test that the initial value is visible with sequence 0"""
+        mailbox = LatestValueMailbox("empty")
+        self.assertEqual(mailbox.latest(), (0, "empty"))
+        self.assertIsNone(mailbox.poll(0))
+
+    def test_publish_overwrites(self):
+        """Test that only the newest value is kept"""
+        mailbox = LatestValueMailbox()
+        mailbox.publish("a")
+        mailbox.publish("b")
+        seq = mailbox.publish("c")
+        self.assertEqual(seq, 3)
+        self.assertEqual(mailbox.poll(0), (3, "c"))
+        self.assertIsNone(mailbox.poll(3))
+
+    def test_wait_timeout(self):
+        """Test that wait returns None when nothing new arrives"""
+        mailbox = LatestValueMailbox()
+        self.assertIsNone(mailbox.wait(0, timeout=0.01))
+
+    def test_wait_wakes_on_publish(self):
+        """Test that a blocked consumer is woken by a publish"""
+        mailbox = LatestValueMailbox()
+        timer = threading.Timer(0.02, mailbox.publish, args=("late",))
+        timer.start()
+        self.assertEqual(mailbox.wait(0, timeout=2.0), (1, "late"))
+        timer.join()
+
+
+class TestMailboxStress(unittest.TestCase):
+    """Stress test with concurrent producers and consumers"""
+
+    PRODUCERS = 4
+    CONSUMERS = 4
+    PUBLISHES_PER_PRODUCER = 5000
+
+    def test_concurrent_producers_and_consumers(self):
+        """Test that consumers only ever see consistent, monotonically newer values"""
+        mailbox = LatestValueMailbox(np.zeros(64, dtype=np.int64))
+        stop = threading.Event()
+        errors = []
+        reads = [0] * self.CONSUMERS
+
+        def produce(producer_id):
+            for i in range(self.PUBLISHES_PER_PRODUCER):
+                # Every element carries the same stamp, so a torn array would be detectable
+                mailbox.publish(np.full(64, producer_id * 1_000_000 + i, dtype=np.int64))
+
+        def consume(consumer_id):
+            last_seq = 0
+            while not stop.is_set() or mailbox.seq != last_seq:
+                slot = mailbox.wait(last_seq, timeout=0.01)
+                if slot is None:
+                    continue
+                seq, value = slot
+                if seq <= last_seq:
+                    errors.append(f"sequence went backwards: {last_seq} -> {seq}")
+                if not np.all(value == value[0]):
+                    errors.append(f"torn value at seq {seq}")
+                last_seq = seq
+                reads[consumer_id] += 1
+
+        consumers = [threading.Thread(target=consume, args=(i,)) for i in range(self.CONSUMERS)]
+        producers = [threading.Thread(target=produce, args=(i,)) for i in range(self.PRODUCERS)]
+        start = time.perf_counter()
+        for thread in consumers + producers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        stop.set()
+        for thread in consumers:
+            thread.join(timeout=10.0)
+        elapsed = time.perf_counter() - start
+
+        total = self.PRODUCERS * self.PUBLISHES_PER_PRODUCER
+        self.assertEqual(errors, [])
+        self.assertEqual(mailbox.seq, total)
+        for count in reads:
+            self.assertGreater(count, 0)
+            self.assertLessEqual(count, total)
+        print(f"\n  {total} publishes, {sum(reads)} reads across {self.CONSUMERS} consumers in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,72 @@
+"""
+Test suite for per-letter latency analytics
+"""
+import time
+import unittest
+from letter_latency import LetterLatency
+from test_power_state import FakeClock
+
+
+class TestLetterLatency(unittest.TestCase):
+    """Test first-hit and acceptance timing, wrong classes and the snapshot"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.latency = LetterLatency(edges_ms=(500, 1000, 2000), clock=self.clock)
+
+    def frame(self, seconds, predicted, accepted=None, key=0):
+        self.clock.now = seconds
+        self.latency.observe(predicted, accepted, (0, key))
+
+    def test_first_hit_and_accept(self):
+        """Test that the first correct frame and the acceptance land in their latency bins"""
+        self.latency.set_target("H")
+        self.frame(0.2, "g")
+        self.frame(0.7, "h")
+        self.frame(0.8, "h")
+        self.frame(1.5, "h", "H", key=1)
+        snapshot = self.latency.snapshot()
+        self.assertEqual(snapshot["edges_ms"], [500, 1000, 2000])
+        letter = snapshot["letters"]["H"]
+        self.assertEqual(letter["targets"], 1)
+        self.assertEqual(letter["first_hit"], [0, 1, 0, 0])
+        self.assertEqual(letter["accept"], [0, 0, 1, 0])
+        self.assertEqual(letter["median_accept_ms"], 2000)
+        self.assertEqual(letter["wrong_classes"], {"G": 1})
+
+    def test_held_letter_is_not_a_fresh_acceptance(self):
+        """Test that a letter still held from the previous target does not count (double letters)"""
+        self.latency.set_target("L")
+        self.frame(0.1, "l", "L", key=1)
+        self.latency.set_target("L")
+        self.frame(0.2, "l", "L", key=1)
+        self.assertEqual(self.latency.snapshot()["letters"]["L"]["accept"], [1, 0, 0, 0])
+        self.frame(0.3, "l", "L", key=2)
+        self.assertEqual(self.latency.snapshot()["letters"]["L"]["accept"], [2, 0, 0, 0])
+
+    def test_wrong_acceptance_and_overflow(self):
+        """Test wrong acceptances, the overflow bin, and that nothing is counted without a target"""
+        self.frame(0.1, "a", "A", key=1)
+        self.assertEqual(self.latency.snapshot()["letters"], {})
+        self.latency.set_target("B")
+        self.frame(0.5, "a", "A", key=2)
+        self.frame(9.0, "b", "B", key=3)
+        letter = self.latency.snapshot()["letters"]["B"]
+        self.assertEqual(letter["wrong_accepts"], 1)
+        self.assertEqual(letter["accept"], [0, 0, 0, 1])
+        self.assertEqual(letter["median_accept_ms"], 2000)
+        self.latency.reset()
+        self.assertEqual(self.latency.snapshot()["letters"], {})
+
+    def test_observe_is_cheap(self):
+        """Test that accounting one frame costs microseconds"""
+        latency = LetterLatency()
+        latency.set_target("A")
+        start = time.perf_counter()
+        for index in range(10000):
+            latency.observe("b", None, (0, 0))
+        self.assertLess((time.perf_counter() - start) / 10000 * 1e6, 20.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
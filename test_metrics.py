@@ -0,0 +1,44 @@
+"""
+Test suite for the metrics registry
+"""
+import threading
+import unittest
+from metrics import MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test counters, gauges and timings"""
+
+    def test_snapshot(self):
+        """Test that every kind of metric appears in the snapshot"""
+        metrics = MetricsRegistry()
+        metrics.increment("frames")
+        metrics.increment("frames", 2)
+        metrics.set_gauge("camera_fps", 29.5)
+        metrics.observe("loop_ms", 10.0)
+        metrics.observe("loop_ms", 20.0)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["counters"], {"frames": 3})
+        self.assertEqual(snapshot["gauges"], {"camera_fps": 29.5})
+        self.assertEqual(snapshot["timings"]["loop_ms"], {"count": 2, "mean": 15.0, "max": 20.0})
+        metrics.reset()
+        self.assertEqual(metrics.counter("frames"), 0)
+
+    def test_concurrent_increments(self):
+        """Test that increments from several threads are not lost"""
+        metrics = MetricsRegistry()
+
+        def work():
+            for _ in range(10000):
+                metrics.increment("hits")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(metrics.counter("hits"), 40000)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,124 @@
+"""
+Test suite for hot-reloadable classifier artifacts
+"""
+import json
+import os
+import tempfile
+import time
+import unittest
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import RobustScaler
+from classification import FEATURE_COLUMNS
+from metrics import MetricsRegistry
+from model_store import ModelHolder, artifact_paths, available_versions, load_model
+
+
+def write_version(archive, version, letters="ab", n_features=64, manifest=None):
+    """Train a tiny classifier over the given letters and write it as predictor_vN/scaler_vN"""
+    rng = np.random.default_rng(version)
+    features = rng.normal(size=(20 * len(letters), n_features)) + np.repeat(np.arange(len(letters)), 20)[:, None]
+    labels = np.repeat(list(letters), 20)
+    scaler = RobustScaler().fit(features)
+    classifier = LogisticRegression(max_iter=500).fit(scaler.transform(features), labels)
+    classifier_path, scaler_path, manifest_path = artifact_paths(version, archive)
+    joblib.dump(classifier, classifier_path)
+    joblib.dump(scaler, scaler_path)
+    if manifest is not None:
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f)
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll a condition until it holds or the timeout expires; returns whether it held"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestLoadModel(unittest.TestCase):
+    """Test loading and validation"""
+
+    def test_versions_need_both_artifacts(self):
+        """Test that only versions with a predictor and a scaler are available"""
+        with tempfile.TemporaryDirectory() as archive:
+            write_version(archive, 1)
+            write_version(archive, 3)
+            os.remove(artifact_paths(3, archive)[1])
+            self.assertEqual(available_versions(archive), [1])
+
+    def test_load_valid(self):
+        """Test that a valid pair loads with its version, labels and manifest"""
+        with tempfile.TemporaryDirectory() as archive:
+            write_version(archive, 2, manifest={"model": "logistic_regression", "feature_schema": {"columns": FEATURE_COLUMNS}})
+            model = load_model(*artifact_paths(2, archive))
+            self.assertEqual(model.version, 2)
+            self.assertEqual(model.labels, ["A", "B"])
+            self.assertEqual(model.manifest["model"], "logistic_regression")
+
+    def test_load_rejects_wrong_features(self):
+        """Test that artifacts built for other features are rejected"""
+        with tempfile.TemporaryDirectory() as archive:
+            write_version(archive, 1, n_features=42)
+            with self.assertRaises(ValueError):
+                load_model(*artifact_paths(1, archive))
+            write_version(archive, 2, manifest={"feature_schema": {"columns": FEATURE_COLUMNS[:10]}})
+            with self.assertRaises(ValueError):
+                load_model(*artifact_paths(2, archive))
+
+
+class TestModelHolder(unittest.TestCase):
+    """Test background reloads and swaps"""
+
+    def test_reload_swaps_in_newest(self):
+        """Test that a reload request loads the newest version in the background and records metrics"""
+        with tempfile.TemporaryDirectory() as archive:
+            write_version(archive, 1)
+            metrics = MetricsRegistry()
+            swapped = []
+            holder = ModelHolder(archive, metrics=metrics, on_swap=swapped.append)
+            first = holder.load(*artifact_paths(1, archive)[:2])
+            holder.record_samples(np.ones((3, 64)))
+            write_version(archive, 2, letters="abc")
+            holder.request_reload()
+            self.assertTrue(wait_for(lambda: holder.current.version == 2))
+            self.assertIs(swapped[0], first)
+            self.assertEqual(holder.current.labels, ["A", "B", "C"])
+            snapshot = metrics.snapshot()
+            self.assertEqual(snapshot["gauges"]["model_version"], 2)
+            self.assertEqual(snapshot["timings"]["model_swap_ms"]["count"], 2)
+            self.assertEqual(snapshot["counters"]["model_reloads"], 1)
+
+    def test_failed_reload_keeps_current(self):
+        """Test that a broken version is reported and the current model stays active"""
+        with tempfile.TemporaryDirectory() as archive:
+            write_version(archive, 1)
+            holder = ModelHolder(archive, metrics=MetricsRegistry())
+            holder.load(*artifact_paths(1, archive)[:2])
+            write_version(archive, 2, n_features=10)
+            holder.request_reload(2)
+            self.assertTrue(wait_for(lambda: holder.last_error is not None))
+            self.assertEqual(holder.current.version, 1)
+            self.assertEqual(holder.status()["available"], [1, 2])
+            self.assertEqual(holder.metrics.counter("model_reload_failures"), 1)
+
+    def test_watch_picks_up_new_version(self):
+        """Test that the watcher loads a version once its manifest is written"""
+        with tempfile.TemporaryDirectory() as archive:
+            write_version(archive, 1)
+            holder = ModelHolder(archive)
+            holder.load(*artifact_paths(1, archive)[:2])
+            holder.watch(interval=0.02)
+            try:
+                write_version(archive, 2, manifest={"feature_schema": {"columns": FEATURE_COLUMNS}})
+                self.assertTrue(wait_for(lambda: holder.current.version == 2))
+            finally:
+                holder.stop()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
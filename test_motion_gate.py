@@ -0,0 +1,75 @@
+"""
+Test suite for the frame-difference detection gate
+"""
+import unittest
+import numpy as np
+from metrics import MetricsRegistry
+from motion_gate import MotionGate
+
+
+def scene(offset=0, noise=None, shape=(240, 320)):
+    """Build a BGR frame with a gradient background and a bright square at a horizontal offset"""
+    frame = np.zeros(shape + (3,), dtype=np.uint8)
+    frame[:] = np.linspace(40, 120, shape[1], dtype=np.uint8)[None, :, None]
+    frame[80:160, 100 + offset:180 + offset] = 230
+    if noise is not None:
+        frame = np.clip(frame.astype(np.int16) + noise.integers(-3, 4, frame.shape), 0, 255).astype(np.uint8)
+    return frame
+
+
+class TestMotionGate(unittest.TestCase):
+    """Test gate decisions"""
+
+    def test_static_scene_is_skipped_except_forced_frames(self):
+        """Test that a still, noisy scene runs detection only every force_every frames"""
+        rng = np.random.default_rng(0)
+        gate = MotionGate(force_every=10)
+        decisions = [gate.check(scene(noise=rng)) for _ in range(41)]
+        self.assertTrue(decisions[0])
+        self.assertEqual([i for i, detect in enumerate(decisions) if detect], [0, 10, 20, 30, 40])
+        self.assertEqual(gate.decisions, {"motion": 1, "forced": 4, "skipped": 36})
+
+    def test_motion_runs_detection(self):
+        """Test that a moving object triggers detection on the frame it moves"""
+        gate = MotionGate(force_every=100)
+        gate.check(scene())
+        self.assertFalse(gate.check(scene()))
+        self.assertTrue(gate.check(scene(offset=40)))
+        self.assertGreater(gate.score, gate.threshold)
+
+    def test_slow_drift_accumulates(self):
+        """Test that small per-frame moves add up against the last detected frame"""
+        gate = MotionGate(force_every=100)
+        gate.check(scene())
+        decisions = [gate.check(scene(offset=step)) for step in range(1, 30)]
+        self.assertIn(False, decisions[:2])
+        self.assertIn(True, decisions)
+
+    def test_buffers_are_reused(self):
+        """Test that checking frames does not allocate new thumbnails"""
+        gate = MotionGate(force_every=3)
+        buffers = {id(gate._gray), id(gate._reference)}
+        for offset in range(0, 60, 5):
+            gate.check(scene(offset=offset))
+        self.assertEqual({id(gate._gray), id(gate._reference)}, buffers)
+
+    def test_metrics_receive_decisions(self):
+        """Test that gate decisions are counted in the metrics registry"""
+        metrics = MetricsRegistry()
+        gate = MotionGate(force_every=5, metrics=metrics)
+        for _ in range(6):
+            gate.check(scene())
+        self.assertEqual(metrics.counter("gate_motion"), 1)
+        self.assertEqual(metrics.counter("gate_skipped"), 4)
+        self.assertEqual(metrics.counter("gate_forced"), 1)
+
+    def test_reset_forces_detection(self):
+        """Test that the frame after a reset is always detected"""
+        gate = MotionGate(force_every=100)
+        gate.check(scene())
+        gate.reset()
+        self.assertTrue(gate.check(scene()))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
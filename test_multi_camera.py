@@ -0,0 +1,73 @@
+"""
+Test suite for the multi-camera supervisor and its helpers
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+from multi_camera import CameraSupervisor, assign_cores, parse_source
+
+
+def flaky_worker(worker_id, source, result_queue, stop_event, cores, loop_video):
+    """Fails (exit code 1) the first time it runs for a source, then finishes cleanly"""
+    if not os.path.exists(source):
+        open(source, "w").close()
+        result_queue.put({"type": "error", "worker": worker_id, "error": "camera lost"})
+        sys.exit(1)
+    result_queue.put({"type": "done", "worker": worker_id, "frames": 0, "dropped": 0})
+
+
+class TestMultiCameraHelpers(unittest.TestCase):
+    """Test source parsing and core assignment"""
+
+    def test_parse_source(self):
+        """Test that integers are camera indices and anything else is a path"""
+        self.assertEqual(parse_source("0"), 0)
+        self.assertEqual(parse_source(2), 2)
+        self.assertEqual(parse_source("clips/a.mp4"), "clips/a.mp4")
+
+    @unittest.skipUnless(hasattr(os, "sched_getaffinity"), "CPU affinity not supported on this platform")
+    def test_assign_cores_disjoint(self):
+        """Test that workers get disjoint core groups when there are enough cores"""
+        available = len(os.sched_getaffinity(0))
+        n_workers = max(1, min(2, available - 1))
+        groups = assign_cores(n_workers)
+        self.assertEqual(len(groups), n_workers)
+        flat = [core for group in groups for core in group]
+        self.assertEqual(len(flat), len(set(flat)))
+        self.assertTrue(all(group for group in groups))
+
+    @unittest.skipUnless(hasattr(os, "sched_getaffinity"), "CPU affinity not supported on this platform")
+    def test_assign_cores_oversubscribed(self):
+        """Test that more workers than cores still gives every worker a core"""
+        available = len(os.sched_getaffinity(0))
+        groups = assign_cores(available * 2)
+        self.assertEqual(len(groups), available * 2)
+        self.assertTrue(all(len(group) == 1 for group in groups))
+
+
+class TestCameraSupervisor(unittest.TestCase):
+    """Test worker restarts"""
+
+    def test_failed_worker_is_restarted(self):
+        """Test that a worker exiting nonzero is restarted after a backoff, and one exiting cleanly is finished"""
+        with tempfile.TemporaryDirectory() as directory:
+            supervisor = CameraSupervisor([os.path.join(directory, "failed-once")], worker=flaky_worker)
+            supervisor.start()
+            messages = []
+            deadline = time.monotonic() + 30.0
+            try:
+                while supervisor.running and time.monotonic() < deadline:
+                    message = supervisor.poll(timeout=0.1)
+                    if message is not None:
+                        messages.append(message["type"])
+            finally:
+                supervisor.stop()
+            self.assertFalse(supervisor.running)
+            self.assertEqual(supervisor.summary()["workers"][0]["restarts"], 1)
+            self.assertEqual(messages[0], "error")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
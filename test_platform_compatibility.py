@@ -3,15 +3,57 @@ Test suite for cross-platform compatibility
 """
 import unittest
 import cv2
+import os
 import platform
+import tempfile
+import time
 from platform_utils import (
     get_camera_backend,
     initialize_camera,
     find_instruction_image,
-    get_platform_info
+    get_platform_info,
+    camera_identity,
+    load_camera_cache,
+    save_camera_config,
+    probe_camera,
 )
 
 
+class FakeCapture:
+    """Capture device with a fixed set of modes, each delivering frames at its own rate"""
+    
+    def __init__(self):
+        # (fourcc, width, height) -> frames per second
+        self.modes = {("MJPG", 640, 480): 60, ("MJPG", 1280, 720): 30, ("YUYV", 640, 480): 30, ("YUYV", 1280, 720): 20}
+        self.requested = {cv2.CAP_PROP_FOURCC: cv2.VideoWriter_fourcc(*"YUYV"),
+                          cv2.CAP_PROP_FRAME_WIDTH: 640, cv2.CAP_PROP_FRAME_HEIGHT: 480}
+    
+    def _mode(self):
+        code = int(self.requested[cv2.CAP_PROP_FOURCC])
+        fourcc = "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+        mode = (fourcc, int(self.requested[cv2.CAP_PROP_FRAME_WIDTH]), int(self.requested[cv2.CAP_PROP_FRAME_HEIGHT]))
+        # Unsupported sizes fall back to VGA, as drivers do
+        return mode if mode in self.modes else (fourcc, 640, 480)
+    
+    def set(self, prop, value):
+        self.requested[prop] = value
+        return True
+    
+    def get(self, prop):
+        fourcc, width, height = self._mode()
+        if prop == cv2.CAP_PROP_FOURCC:
+            return float(cv2.VideoWriter_fourcc(*fourcc))
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(height)
+        return 0.0
+    
+    def read(self):
+        time.sleep(1.0 / self.modes[self._mode()])
+        return True, None
+
+
 class TestPlatformUtils(unittest.TestCase):
     """Test platform utility functions"""
     
@@ -51,7 +93,10 @@ class TestCameraInitialization(unittest.TestCase):
     def test_initialize_camera_returns_tuple(self):
         """Test that camera initialization returns expected tuple"""
         try:
-            result = initialize_camera(camera_index=0, target_fps=30)
+            # No probing, and never the real ./camera_cache.json
+            with tempfile.TemporaryDirectory() as directory:
+                result = initialize_camera(camera_index=0, target_fps=30, probe=False,
+                                           cache_path=os.path.join(directory, "camera_cache.json"))
             self.assertIsInstance(result, tuple)
             self.assertEqual(len(result), 5)
             
@@ -72,6 +117,41 @@ class TestCameraInitialization(unittest.TestCase):
             self.skipTest(f"Camera not available: {e}")
 
 
+
+class TestCameraModeCache(unittest.TestCase):
+    """Test capture mode probing and the per-device cache"""
+    
+    def test_probe_prefers_fastest_delivered_mode(self):
+        """Test that probing measures each distinct mode and ranks the real 60 FPS mode first"""
+        results = probe_camera(FakeCapture(), target_fps=60, n_frames=5)
+        modes = [(config["fourcc"], config["width"], config["height"]) for config in results]
+        self.assertEqual(modes[0], ("MJPG", 640, 480))
+        # 960x540 is not offered, so it maps onto an already measured mode
+        self.assertEqual(len(modes), len(set(modes)))
+        self.assertEqual(len(modes), 4)
+        self.assertGreater(results[0]["measured_fps"], 40)
+    
+    def test_cache_round_trip(self):
+        """Test that a saved mode is found again under the same device identity"""
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = os.path.join(directory, "camera_cache.json")
+            self.assertEqual(load_camera_cache(cache_path), {})
+            identity = camera_identity(0, cv2.CAP_ANY)
+            config = {"fourcc": "MJPG", "width": 640, "height": 480, "fps": 60, "measured_fps": 59.8, "read_ms": 2.1}
+            save_camera_config(identity, config, cache_path)
+            save_camera_config(camera_identity(1, cv2.CAP_ANY), dict(config, width=1280), cache_path)
+            self.assertEqual(load_camera_cache(cache_path)[identity], config)
+            self.assertEqual(os.listdir(directory), ["camera_cache.json"])
+    
+    def test_unreadable_cache_is_empty(self):
+        """Test that a corrupt cache file is treated as no cache"""
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = os.path.join(directory, "camera_cache.json")
+            with open(cache_path, "w") as f:
+                f.write("{not json")
+            self.assertEqual(load_camera_cache(cache_path), {})
+
+
 if __name__ == "__main__":
     # Run tests with verbose output
     unittest.main(verbosity=2)
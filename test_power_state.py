@@ -0,0 +1,88 @@
+"""
+Test suite for the idle/attract power state machine
+"""
+import threading
+import time
+import unittest
+from metrics import MetricsRegistry
+from power_state import PowerStateMachine, ACTIVE, IDLE
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPowerStateMachine(unittest.TestCase):
+    """Test transitions and idle polling"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.metrics = MetricsRegistry()
+        self.power = PowerStateMachine(idle_after=5.0, poll_interval=0.25, clock=self.clock, metrics=self.metrics)
+
+    def run_frames(self, seconds, hand_present, fps=30):
+        """Feed one detection per frame for a while"""
+        for _ in range(int(seconds * fps)):
+            self.clock.now += 1.0 / fps
+            self.power.observe(hand_present)
+
+    def test_goes_idle_after_period_without_hands(self):
+        """Test that the state stays active until idle_after has passed since the last hand"""
+        self.run_frames(1.0, True)
+        self.run_frames(4.9, False)
+        self.assertEqual(self.power.state, ACTIVE)
+        self.run_frames(0.2, False)
+        self.assertEqual(self.power.state, IDLE)
+        self.assertEqual(self.metrics.counter("power_idle"), 1)
+
+    def test_idle_polls_at_low_rate(self):
+        """Test that idle presence checks are due once per poll interval"""
+        self.run_frames(6.0, False)
+        due = 0
+        for _ in range(300):  # 10 s of 30 FPS frame slots
+            self.clock.now += 1.0 / 30
+            if self.power.poll_due():
+                self.power.polled()
+                due += 1
+                self.power.observe(False)
+        self.assertIn(due, range(36, 41))
+
+    def test_hand_wakes_on_next_frame(self):
+        """Test that one detection with a hand returns to active and the next full frame records the latency"""
+        self.run_frames(6.0, False)
+        self.assertEqual(self.power.state, IDLE)
+        self.power.observe(True)
+        self.assertEqual(self.power.state, ACTIVE)
+        self.assertTrue(self.power.poll_due())
+        self.clock.now += 1.0 / 30
+        latency = self.power.active_frame()
+        self.assertAlmostEqual(latency, 1.0 / 30)
+        self.assertIsNone(self.power.active_frame())
+        self.assertEqual(self.metrics.snapshot()["timings"]["power_wake_ms"]["count"], 1)
+
+    def test_durations(self):
+        """Test that time is split between the two states"""
+        self.run_frames(10.0, False)
+        durations = self.power.durations()
+        self.assertAlmostEqual(durations[ACTIVE], 5.0, delta=0.05)
+        self.assertAlmostEqual(durations[IDLE], 5.0, delta=0.05)
+
+    def test_wait_for_poll_returns_on_wake(self):
+        """Test that a hand seen on another thread cuts the idle sleep short"""
+        power = PowerStateMachine(idle_after=0.0, poll_interval=5.0)
+        power.observe(False)
+        self.assertEqual(power.state, IDLE)
+        threading.Timer(0.05, power.observe, args=(True,)).start()
+        start = time.monotonic()
+        self.assertTrue(power.wait_for_poll())
+        self.assertLess(time.monotonic() - start, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,84 @@
+"""
+Test suite for the background session recorder
+"""
+import os
+import tempfile
+import time
+import unittest
+import cv2
+import numpy as np
+from session_recorder import SessionRecorder, write_clip
+
+
+def frame(value):
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+class TestSessionRecorder(unittest.TestCase):
+    """Test the rolling buffer, dropping and dumps"""
+
+    def test_offer_drops_oldest_when_encoder_lags(self):
+        """Test that a full queue drops frames instead of blocking the caller"""
+        recorder = SessionRecorder(max_pending=4)
+        for value in range(10):
+            recorder.offer(frame(value))
+        self.assertEqual(recorder.dropped, 6)
+        recorder.drain()
+        self.assertEqual(recorder.status()["buffered_frames"], 4)
+
+    def test_ring_keeps_last_seconds(self):
+        """Test that frames older than the buffer length are forgotten"""
+        recorder = SessionRecorder(seconds=0.05)
+        recorder.offer(frame(0))
+        recorder.drain()
+        time.sleep(0.1)
+        recorder.offer(frame(1))
+        recorder.offer(frame(2))
+        recorder.drain()
+        self.assertEqual(recorder.status()["buffered_frames"], 2)
+
+    def test_background_encoder_and_dump(self):
+        """Test that the encoder thread fills the ring and a dump writes a readable clip"""
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = SessionRecorder(directory=directory, max_pending=64).start()
+            try:
+                for value in range(20):
+                    recorder.offer(frame(value * 10))
+                    time.sleep(0.005)
+                deadline = time.monotonic() + 5.0
+                while recorder.status()["buffered_frames"] < 20 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                path = recorder.dump(wait=True)
+            finally:
+                recorder.stop()
+            self.assertIsNone(recorder.last_error)
+            self.assertTrue(os.path.exists(path))
+            self.assertEqual(recorder.last_dump["frames"], 20)
+            capture = cv2.VideoCapture(path)
+            self.assertEqual(int(capture.get(cv2.CAP_PROP_FRAME_COUNT)), recorder.last_dump["written"])
+            capture.release()
+
+    def test_clip_keeps_capture_timing(self):
+        """Test that a gap in the frames is held on screen instead of being squeezed out"""
+        _, jpeg = cv2.imencode(".jpg", frame(128))
+        # 10 FPS, then nothing for one second (e.g. idle mode), then 10 FPS again
+        times = [0.0, 0.1, 0.2, 1.2, 1.3]
+        with tempfile.TemporaryDirectory() as directory:
+            clip = write_clip(os.path.join(directory, "clip.mp4"), [(t, jpeg.tobytes()) for t in times])
+            self.assertEqual(clip["fps"], 10)
+            self.assertEqual(clip["written"], 14)
+            capture = cv2.VideoCapture(clip["path"])
+            self.assertEqual(int(capture.get(cv2.CAP_PROP_FRAME_COUNT)), 14)
+            capture.release()
+
+    def test_empty_dump_reports_error(self):
+        """Test that dumping an empty buffer reports an error instead of writing a file"""
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = SessionRecorder(directory=directory)
+            path = recorder.dump(wait=True)
+            self.assertFalse(os.path.exists(path))
+            self.assertIn("no frames", recorder.last_error)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
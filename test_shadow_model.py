@@ -0,0 +1,106 @@
+"""
+Test suite for shadow evaluation of a candidate classifier
+"""
+import json
+import os
+import tempfile
+import time
+import unittest
+import numpy as np
+from metrics import MetricsRegistry
+from model_store import LoadedModel
+from shadow_model import ShadowEvaluator
+from test_sign_engine import IdentityScaler
+
+
+class FirstFeatureClassifier:
+    """Predicts "a" when the first feature is 0 and "b" otherwise"""
+
+    classes_ = np.array(["a", "b"])
+
+    def predict_proba(self, data):
+        probs = np.zeros((len(data), 2))
+        probs[np.arange(len(data)), (data[:, 0] != 0).astype(int)] = 1.0
+        return probs
+
+
+def candidate():
+    return LoadedModel(2, FirstFeatureClassifier(), IdentityScaler(), ["A", "B"], None)
+
+
+def rows(*first_values):
+    features = np.zeros((len(first_values), 64))
+    features[:, 0] = first_values
+    return features
+
+
+class TestShadowEvaluator(unittest.TestCase):
+    """Test agreement statistics and the production-side cost"""
+
+    def test_agreement_and_disagreements(self):
+        """Test overall and per-class agreement and the disagreement counts"""
+        shadow = ShadowEvaluator(candidate(), metrics=MetricsRegistry())
+        shadow.offer(rows(0), ["a"])
+        shadow.offer(rows(1, 0), ["b", "b"])
+        shadow.offer(rows(1), ["c"])
+        shadow.drain()
+        report = shadow.report()
+        self.assertEqual(report["frames"], 3)
+        self.assertEqual(report["hands"], 4)
+        self.assertAlmostEqual(report["agreement"], 0.5)
+        self.assertEqual(report["per_class"]["B"], {"hands": 2, "agreement": 0.5})
+        self.assertEqual(
+            sorted((item["production"], item["candidate"]) for item in report["disagreements"]),
+            [("B", "A"), ("C", "B")],
+        )
+        self.assertEqual(report["latency_ms"].keys(), {"mean", "p50", "p99"})
+        self.assertEqual(shadow.metrics.counter("shadow_frames"), 3)
+
+    def test_queue_is_lossy(self):
+        """Test that a full queue drops the oldest frames instead of growing"""
+        shadow = ShadowEvaluator(candidate(), max_pending=4)
+        for _ in range(10):
+            shadow.offer(rows(0), ["a"])
+        self.assertEqual(shadow.dropped, 6)
+        shadow.drain()
+        self.assertEqual(shadow.report()["frames"], 4)
+
+    def test_worker_evaluates_in_background(self):
+        """Test that the background worker picks up offered frames"""
+        shadow = ShadowEvaluator(candidate()).start()
+        try:
+            shadow.offer(rows(1), ["b"])
+            deadline = time.monotonic() + 5.0
+            while shadow.report()["frames"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(shadow.report()["agreement"], 1.0)
+        finally:
+            shadow.stop()
+
+    def test_offer_is_cheap(self):
+        """Test that offering a frame costs microseconds, not an inference"""
+        shadow = ShadowEvaluator(candidate(), max_pending=8)
+        features = rows(0)
+        labels = ["a"]
+        start = time.perf_counter()
+        for _ in range(10000):
+            shadow.offer(features, labels)
+        per_offer_us = (time.perf_counter() - start) / 10000 * 1e6
+        self.assertLess(per_offer_us, 20.0)
+
+    def test_export(self):
+        """Test that the report is exported as JSON"""
+        shadow = ShadowEvaluator(candidate())
+        shadow.offer(rows(0), ["a"])
+        shadow.drain()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "shadow.json")
+            shadow.export(path)
+            with open(path) as f:
+                exported = json.load(f)
+        self.assertEqual(exported["candidate_version"], 2)
+        self.assertEqual(exported["agreement"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,253 @@
+"""
+Test suite for the SignRecognizer engine, with a scripted landmarker and classifier
+"""
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from metrics import MetricsRegistry
+from model_store import LoadedModel
+from sign_engine import SignRecognizer, EngineOptions, VIDEO
+from template_store import TemplateStore
+from letter_latency import LetterLatency
+
+
+def hand(x, handedness=0):
+    """Build one detected hand: 21 landmarks around horizontal position x"""
+    landmarks = [SimpleNamespace(x=x + 0.01 * i, y=0.5 + 0.01 * i, z=0.0) for i in range(21)]
+    return landmarks, [SimpleNamespace(index=handedness)]
+
+
+def detection(*hands):
+    """Build a HandLandmarkerResult-like detection from hand() tuples"""
+    return SimpleNamespace(
+        hand_landmarks=[landmarks for landmarks, _ in hands],
+        hand_world_landmarks=[landmarks for landmarks, _ in hands],
+        handedness=[handedness for _, handedness in hands],
+    )
+
+
+class ScriptedLandmarker:
+    """Returns queued detections in order"""
+
+    def __init__(self, detections):
+        self.detections = list(detections)
+        self.timestamps = []
+        self.closed = False
+
+    def detect_for_video(self, image, timestamp_ms):
+        self.timestamps.append(timestamp_ms)
+        return self.detections.pop(0)
+
+    def close(self):
+        self.closed = True
+
+
+class HandednessClassifier:
+    """Confidently predicts "a" for left hands and "b" for right hands"""
+
+    classes_ = np.array(["a", "b"])
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict_proba(self, data):
+        self.calls += 1
+        probs = np.full((len(data), 2), 0.02)
+        probs[np.arange(len(data)), data[:, 0].astype(int)] = 0.98
+        return probs
+
+
+class ScriptedDynamic:
+    """Stands in for DynamicSignRecognizer: reports a motion letter on chosen frames"""
+
+    def __init__(self, frames, letter="Z"):
+        self.frames = set(frames)
+        self.letter = letter
+        self.calls = 0
+        self.count = 0
+
+    def update(self, track_id, landmarks):
+        self.calls += 1
+        if self.calls in self.frames:
+            self.count += 1
+            return self.letter, 0.9
+        return None
+
+    def detection_count(self, track_id):
+        return self.count
+
+    def drop(self, track_id):
+        pass
+
+    def tracked_ids(self):
+        return [0]
+
+
+class IdentityScaler:
+    """Scaler stand-in that passes features through unchanged"""
+
+    def transform(self, data):
+        return data
+
+
+def make_engine(detections, **kwargs):
+    """Build a VIDEO-mode engine around scripted detections, without drawing overlays"""
+    engine = SignRecognizer(EngineOptions(running_mode=VIDEO, overlay=None), **kwargs)
+    engine.models.swap(LoadedModel(1, HandednessClassifier(), IdentityScaler(), ["A", "B"], None))
+    engine.landmarker = ScriptedLandmarker(detections)
+    return engine
+
+
+FRAME = np.zeros((48, 64, 3), dtype=np.uint8)
+
+
+class TestSignRecognizer(unittest.TestCase):
+    """Test frame processing"""
+
+    def test_steady_hand_is_accepted(self):
+        """Test that a steady hand keeps its track ID and its letter is accepted"""
+        engine = make_engine([detection(hand(0.2))] * 12)
+        results = [engine.process(FRAME) for _ in range(12)]
+        self.assertEqual({result.primary.track_id for result in results}, {0})
+        self.assertEqual(results[-1].primary.letter, "A")
+        self.assertEqual(results[-1].primary.raw, "a")
+        self.assertEqual(results[-1].live_ids, (0,))
+        self.assertEqual(results[-1].primary.features.shape, (64,))
+
+    def test_dynamic_letter_is_held_until_next_acceptance(self):
+        """Test that a motion letter stays paired with its accept_key on later frames, until a static acceptance"""
+        engine = make_engine([detection(hand(0.2))] * 12 + [detection(hand(0.2, 1))] * 12)
+        engine.dynamic = ScriptedDynamic(frames=[10])
+        results = [engine.process(FRAME) for _ in range(24)]
+        self.assertEqual(results[8].primary.letter, "A")
+        detected = results[9].primary
+        self.assertEqual(detected.letter, "Z")
+        # A consumer that only sees a later frame still gets Z with the new key
+        for result in results[10:12]:
+            self.assertEqual(result.primary.accept_key, detected.accept_key)
+            self.assertEqual(result.primary.letter, "Z")
+        self.assertNotEqual(results[-1].primary.accept_key, detected.accept_key)
+        self.assertEqual(results[-1].primary.letter, "B")
+
+    def test_two_hands_primary_is_oldest_track(self):
+        """Test that with two hands the first-seen one stays primary"""
+        engine = make_engine([detection(hand(0.6, 1)), detection(hand(0.2, 0), hand(0.6, 1))])
+        engine.process(FRAME)
+        result = engine.process(FRAME)
+        self.assertEqual(len(result.hands), 2)
+        self.assertEqual(result.primary.track_id, 0)
+        self.assertEqual(result.primary.raw, "b")
+        self.assertEqual(engine.classifier.calls, 2)
+
+    def test_new_hand_with_slots_full_is_not_primary(self):
+        """Test that a hand appearing while a lost hand still holds a slot gets a real ID and does not become primary"""
+        engine = make_engine([
+            detection(hand(0.2, 0), hand(0.6, 1)),
+            detection(hand(0.2, 0)),
+            detection(hand(0.2, 0), hand(0.95, 1)),
+        ])
+        for _ in range(3):
+            result = engine.process(FRAME)
+        self.assertEqual([prediction.track_id for prediction in result.hands], [0, 2])
+        self.assertEqual(result.primary.track_id, 0)
+        self.assertEqual(sorted(engine.acceptors), [0, 2])
+
+    def test_no_hands(self):
+        """Test that a frame without hands has no primary hand and drops state of lost tracks"""
+        engine = make_engine([detection(hand(0.2))] + [detection()] * 6)
+        engine.process(FRAME)
+        self.assertIn(0, engine.acceptors)
+        for _ in range(6):
+            result = engine.process(FRAME)
+        self.assertIsNone(result.primary)
+        self.assertEqual(result.hands, ())
+        self.assertEqual(engine.acceptors, {})
+
+    def test_batch_matches_single_frames(self):
+        """Test that process_batch gives the same letters as frame-by-frame processing with one classifier call"""
+        detections = [detection(hand(0.2)), detection(), detection(hand(0.21), hand(0.7, 1))] * 4
+        single = make_engine(detections)
+        expected = [single.process(FRAME) for _ in detections]
+        batched = make_engine(detections)
+        results = batched.process_batch([FRAME] * len(detections))
+        self.assertEqual(batched.classifier.calls, 1)
+        self.assertEqual(
+            [[hand[:4] for hand in result.hands] for result in results],
+            [[hand[:4] for hand in result.hands] for result in expected],
+        )
+
+    def test_replay_advances_acceptance_without_detection(self):
+        """Test that replaying the last detection feeds the acceptors again without a new detection"""
+        engine = make_engine([detection(hand(0.2))])
+        engine.process(FRAME)
+        for _ in range(11):
+            result = engine.replay_last()
+        self.assertEqual(len(engine.landmarker.timestamps), 1)
+        self.assertEqual(result.primary.letter, "A")
+        self.assertIsNone(make_engine([]).replay_last())
+
+    def test_model_swap_with_new_labels_resets_acceptors(self):
+        """Test that hands keep being classified across a swap and acceptors restart for a new label set"""
+        engine = make_engine([detection(hand(0.2))] * 2)
+        engine.process(FRAME)
+        acceptor = engine.acceptors[0]
+        classifier = HandednessClassifier()
+        classifier.classes_ = np.array(["a", "b", "c"])
+        classifier.predict_proba = lambda data: np.tile([0.9, 0.05, 0.05], (len(data), 1))
+        engine.models.swap(LoadedModel(2, classifier, IdentityScaler(), ["A", "B", "C"], None))
+        result = engine.process(FRAME)
+        self.assertIsNot(engine.acceptors[0], acceptor)
+        self.assertEqual(len(result.primary.probs), 3)
+
+    def test_custom_signs_are_matched(self):
+        """Test that recorded templates are matched per hand beside the classifier"""
+        engine = make_engine([detection(hand(0.2))] * 2)
+        first = engine.process(FRAME)
+        self.assertIsNone(first.primary.custom)
+        engine.templates = TemplateStore(path=None)
+        engine.templates.add("WAVE", first.primary.features[None, :])
+        result = engine.process(FRAME)
+        self.assertEqual(result.primary.custom[0], "WAVE")
+        self.assertEqual(result.primary.raw, "a")
+
+    def test_latency_is_timed_on_primary_hand(self):
+        """Test that the primary hand's predictions and acceptance are timed against the target letter"""
+        engine = make_engine([detection(hand(0.2))] * 12)
+        engine.latency = LetterLatency()
+        engine.latency.set_target("A")
+        for _ in range(12):
+            engine.process(FRAME)
+        letter = engine.latency.snapshot()["letters"]["A"]
+        self.assertEqual(sum(letter["first_hit"]), 1)
+        self.assertEqual(sum(letter["accept"]), 1)
+
+    def test_results_are_delivered(self):
+        """Test the callback, the results mailbox, per-frame timings and metrics"""
+        delivered = []
+        metrics = MetricsRegistry()
+        engine = make_engine([detection(hand(0.2))], on_result=delivered.append, metrics=metrics)
+        result = engine.process(FRAME)
+        self.assertEqual(delivered, [result])
+        self.assertIs(engine.results.latest()[1], result)
+        self.assertEqual(set(result.timings), {"detect_ms", "classify_ms"})
+        self.assertEqual(metrics.snapshot()["timings"]["engine_classify_ms"]["count"], 1)
+
+    def test_timestamps_increase(self):
+        """Test that repeated caller timestamps are bumped so the landmarker sees increasing ones"""
+        engine = make_engine([detection()] * 3)
+        for _ in range(3):
+            engine.process(FRAME, timestamp_ms=100)
+        self.assertEqual(engine.landmarker.timestamps, [100, 101, 102])
+
+    def test_close(self):
+        """Test that leaving the context manager closes the landmarker"""
+        engine = make_engine([])
+        landmarker = engine.landmarker
+        with engine:
+            pass
+        self.assertTrue(landmarker.closed)
+        self.assertIsNone(engine.landmarker)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
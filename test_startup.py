@@ -0,0 +1,76 @@
+"""
+Test suite for the startup helpers
+"""
+import sys
+import time
+import unittest
+from startup import StartupProfiler, lazy_import, preload, run_parallel
+
+
+class TestLazyImport(unittest.TestCase):
+    """Test deferred module imports"""
+
+    def test_import_is_deferred_until_use(self):
+        """Test that naming a module does not import it, and using it does"""
+        sys.modules.pop("colorsys", None)
+        colorsys = lazy_import("colorsys")
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertEqual(colorsys.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertIn("colorsys", sys.modules)
+
+    def test_preload_returns_the_module(self):
+        """Test that preload imports the real module and the proxy exposes its namespace"""
+        proxy = lazy_import("json")
+        module = preload(proxy)
+        self.assertIs(module, sys.modules["json"])
+        self.assertIs(proxy.dumps, module.dumps)
+        self.assertIs(preload(module), module)
+
+
+class TestRunParallel(unittest.TestCase):
+    """Test concurrent startup tasks"""
+
+    def test_tasks_overlap(self):
+        """Test that independent tasks run at the same time and return their results"""
+        profiler = StartupProfiler()
+        start = time.perf_counter()
+        results = run_parallel({
+            "a": lambda: time.sleep(0.2) or "a",
+            "b": lambda: time.sleep(0.2) or "b",
+        }, profiler)
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertEqual(results, {"a": "a", "b": "b"})
+        self.assertEqual(sorted(step[0] for step in profiler.steps()), ["a", "b"])
+
+    def test_error_is_raised_after_all_tasks_finish(self):
+        """Test that a failing task raises only once the others are done"""
+        finished = []
+
+        def fail():
+            raise RuntimeError("camera missing")
+
+        def slow():
+            time.sleep(0.1)
+            finished.append(True)
+
+        with self.assertRaises(RuntimeError):
+            run_parallel({"fail": fail, "slow": slow})
+        self.assertEqual(finished, [True])
+
+
+class TestStartupProfiler(unittest.TestCase):
+    """Test step recording"""
+
+    def test_step_records_duration(self):
+        """Test that a timed block is reported with its duration"""
+        profiler = StartupProfiler()
+        with profiler.step("load"):
+            time.sleep(0.05)
+        ((name, offset, duration, _),) = profiler.steps()
+        self.assertEqual(name, "load")
+        self.assertGreaterEqual(offset, 0.0)
+        self.assertGreaterEqual(duration, 45.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
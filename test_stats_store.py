@@ -0,0 +1,96 @@
+"""
+Test suite for the write-behind statistics store
+"""
+import os
+import sqlite3
+import tempfile
+import unittest
+from event_log import EventLog
+from stats_store import StatsStore, benchmark
+
+
+class TestStatsStore(unittest.TestCase):
+    """Test write-behind commits and the aggregate queries"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "stats.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_wal_mode(self):
+        """Test that the database is created in WAL mode"""
+        StatsStore(self.path)
+        with sqlite3.connect(self.path) as connection:
+            self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_nothing_written_until_flushed(self):
+        """Test that recording only queues rows and the writer commits them"""
+        store = StatsStore(self.path, flush_interval=0.01)
+        session = store.start_session("ana", "word", "AB")
+        store.record_attempt(session, "ana", "A", "A", ms=500.0)
+        self.assertEqual(store.per_letter(), [])
+        store.start()
+        self.assertTrue(store.wait_idle(5.0))
+        store.stop()
+        self.assertEqual(store.committed, 2)
+        self.assertEqual(store.per_letter()[0]["attempts"], 1)
+
+    def test_aggregates(self):
+        """Test per-letter, per-player and per-day aggregates"""
+        store = StatsStore(self.path)
+        first = store.start_session("ana", "word", "AB")
+        store.record_attempt(first, "ana", "A", "S", ms=300.0)
+        store.record_attempt(first, "ana", "A", "A", ms=900.0)
+        store.record_attempt(first, "ana", "B", "B", ms=400.0)
+        store.end_session(first, completed=True)
+        second = store.start_session("ben", "word", "B")
+        store.record_attempt(second, "ben", "B", "B", ms=600.0)
+        store.end_session(second)
+        store.flush()
+
+        letters = {row["letter"]: row for row in store.per_letter()}
+        self.assertEqual(letters["A"]["attempts"], 2)
+        self.assertEqual(letters["A"]["accuracy"], 0.5)
+        self.assertEqual(letters["A"]["mean_ms_to_correct"], 900.0)
+        self.assertEqual(letters["B"]["mean_ms_to_correct"], 500.0)
+        self.assertEqual([row["letter"] for row in store.per_letter(player="ben")], ["B"])
+        players = {row["player"]: row for row in store.per_player()}
+        self.assertEqual((players["ana"]["sessions"], players["ana"]["completed"], players["ana"]["attempts"]), (1, 1, 3))
+        self.assertEqual(players["ben"]["completed"], 0)
+        days = store.per_day()
+        self.assertEqual(len(days), 1)
+        self.assertEqual((days[0]["sessions"], days[0]["attempts"]), (2, 4))
+
+    def test_full_queue_drops(self):
+        """Test that a full queue drops new rows instead of growing"""
+        store = StatsStore(self.path, max_pending=3)
+        for _ in range(5):
+            store.record_attempt(None, "ana", "A", "A")
+        self.assertEqual(store.dropped, 2)
+        store.flush()
+        self.assertEqual(store.per_letter()[0]["attempts"], 3)
+
+    def test_failed_batch_is_counted_and_reported(self):
+        """Test that rows of a batch that fails to commit count as dropped and the error goes to the event log"""
+        events = EventLog(echo=False)
+        store = StatsStore(self.path, events=events)
+        store.record_attempt(None, "ana", "A", "A")
+        store._enqueue("INSERT INTO missing_table VALUES (?)", (1,))
+        store.flush()
+        self.assertEqual(store.dropped, 2)
+        self.assertEqual(store.committed, 0)
+        (error,) = events.recent("error")
+        self.assertEqual(error["where"], "stats_store")
+        self.assertEqual(error["rows"], 2)
+
+    def test_benchmark(self):
+        """Test that the ingestion benchmark runs and reports its figures"""
+        result = benchmark(n_attempts=2000, batch_size=100)
+        self.assertEqual(result["rows"], 2000)
+        self.assertGreater(result["rows_per_s"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
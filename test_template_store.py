@@ -0,0 +1,122 @@
+"""
+Test suite for custom-sign templates
+"""
+import os
+import tempfile
+import time
+import unittest
+import numpy as np
+from template_store import TemplateStore, normalize_landmarks
+
+
+def handshape(seed):
+    """One random hand as a feature row (right hand, wrist at the origin, 9 cm palm)"""
+    rng = np.random.default_rng(seed)
+    features = np.zeros(64)
+    features[1:] = rng.normal(scale=0.05, size=63)
+    features[1:4] = 0.0
+    features[28:31] = [0.0, 0.09, 0.0]
+    return features
+
+
+def frames(shape, n, noise=0.001, seed=0):
+    """n jittered copies of a feature row"""
+    rng = np.random.default_rng(seed)
+    rows = np.repeat(shape[None, :], n, axis=0)
+    rows[:, 1:] += rng.normal(scale=noise, size=(n, 63))
+    return rows
+
+
+class TestNormalize(unittest.TestCase):
+    """Test template normalization"""
+
+    def test_position_scale_and_hand_invariant(self):
+        """Test that moving, scaling and mirroring a hand gives the same template"""
+        right = handshape(1)
+        moved = right.copy()
+        moved[1:] = (right[1:].reshape(21, 3) * 2.5 + [0.1, -0.2, 0.3]).ravel()
+        left = right.copy()
+        left[0] = 1
+        left[1::3] *= -1
+        rows = normalize_landmarks(np.stack([right, moved, left]))
+        np.testing.assert_allclose(rows[1], rows[0], atol=1e-5)
+        np.testing.assert_allclose(rows[2], rows[0], atol=1e-5)
+        self.assertAlmostEqual(float(np.linalg.norm(rows[0].reshape(21, 3)[9])), 1.0, places=5)
+
+
+class TestTemplateStore(unittest.TestCase):
+    """Test matching, incremental inserts and persistence"""
+
+    def test_match_buffered_and_indexed(self):
+        """Test that templates match before and after the tree is rebuilt, and far hands match nothing"""
+        store = TemplateStore(path=None, max_distance=0.3)
+        store.add("HELLO", frames(handshape(1), 20))
+        store.add("BYE", frames(handshape(2), 20))
+        queries = np.stack([handshape(1), handshape(2), handshape(3)])
+        before = store.match(queries)
+        store.rebuild()
+        self.assertEqual(store.status()["indexed"], 40)
+        after = store.match(queries)
+        for matches in (before, after):
+            self.assertEqual([match and match[0] for match in matches], ["HELLO", "BYE", None])
+        self.assertLess(after[0][1], 0.3)
+
+    def test_inserts_trigger_background_rebuild(self):
+        """Test that filling the buffer rebuilds the tree in the background"""
+        store = TemplateStore(path=None, rebuild_every=16)
+        store.add("HELLO", frames(handshape(1), 16))
+        deadline = time.monotonic() + 5.0
+        while store.status()["indexed"] < 16 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(store.status()["indexed"], 16)
+        self.assertEqual(store.labels(), {"HELLO": 16})
+
+    def test_remove(self):
+        """Test that a removed label no longer matches"""
+        store = TemplateStore(path=None)
+        store.add("HELLO", frames(handshape(1), 10))
+        store.rebuild()
+        store.add("HELLO", frames(handshape(1), 5))
+        store.remove("HELLO")
+        store.rebuild(["HELLO"])
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.match(handshape(1)[None, :]), [None])
+
+    def test_recording(self):
+        """Test that a recording adds the frames showing one hand and saves the store"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "custom.npz")
+            store = TemplateStore(path)
+            store.start_recording("HELLO", seconds=0.2)
+            shape = handshape(1)
+            for row in frames(shape, 10):
+                store.observe(row[None, :])
+            store.observe(np.stack([shape, handshape(2)]))  # two hands: not recorded
+            time.sleep(0.25)
+            store.observe(shape[None, :])
+            self.assertIsNone(store.recording)
+            deadline = time.monotonic() + 5.0
+            while not os.path.exists(path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            loaded = TemplateStore(path)
+            self.assertEqual(loaded.labels(), {"HELLO": 10})
+            self.assertEqual(loaded.match(shape[None, :])[0][0], "HELLO")
+
+    def test_query_latency(self):
+        """Test that one lookup against 30,000 indexed templates stays under a millisecond"""
+        store = TemplateStore(path=None)
+        shapes = [handshape(seed) for seed in range(40)]
+        for index, shape in enumerate(shapes):
+            store.add(f"SIGN{index}", frames(shape, 750, noise=0.002, seed=index))
+        store.rebuild()
+        queries = [frames(shape, 1, noise=0.002, seed=100) for shape in shapes] * 5
+        store.match(queries[0])
+        start = time.perf_counter()
+        for query in queries:
+            store.match(query)
+        per_query_ms = (time.perf_counter() - start) / len(queries) * 1000
+        self.assertLess(per_query_ms, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
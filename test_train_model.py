@@ -0,0 +1,124 @@
+"""
+Test suite for latency-aware model training and selection
+"""
+import json
+import os
+import tempfile
+import unittest
+import time
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from extract_landmarks import ROW_DTYPE, INDEX_NAME, ChunkWriter
+from train_model import cv_splits, next_version, select_model, train
+
+
+def write_dataset(directory, letters="ABC", units_per_letter=6, frames=20):
+    """Write a synthetic extracted dataset: one cluster of features per letter, one unit per clip"""
+    rng = np.random.default_rng(0)
+    writer = ChunkWriter(directory, chunk_rows=64)
+    with open(os.path.join(directory, INDEX_NAME), "w") as index:
+        for class_index, letter in enumerate(letters):
+            for unit in range(units_per_letter):
+                rows = np.zeros(frames, dtype=ROW_DTYPE)
+                rows["frame"] = np.arange(frames)
+                rows["features"] = rng.normal(class_index * 3.0, 1.0, (frames, 64))
+                writer.append(rows)
+                entry = {"path": f"/{letter}/{unit}.mp4", "label": letter.lower(), "rows": frames,
+                         "chunks": writer.finish_unit()}
+                index.write(json.dumps(entry) + "\n")
+    writer.close()
+
+
+class SlowKNeighborsClassifier(KNeighborsClassifier):
+    """Accurate but over any millisecond budget"""
+
+    def predict_proba(self, X):
+        time.sleep(0.003)
+        return super().predict_proba(X)
+
+
+class TestSelection(unittest.TestCase):
+    """Test candidate selection and versioning"""
+
+    def test_most_accurate_within_budget(self):
+        """Test that the budget excludes slow candidates and accuracy decides among the rest"""
+        def result(accuracy, p99):
+            return {"accuracy": accuracy, "latency": {"1": {"p99_ms": p99}}}
+        results = {"slow": result(0.99, 5.0), "good": result(0.95, 1.0), "fast": result(0.90, 0.1), "untimed": {"accuracy": 1.0}}
+        self.assertEqual(select_model(results, 2.0), "good")
+        self.assertEqual(select_model(results, 10.0), "slow")
+        self.assertIsNone(select_model(results, 0.01))
+
+    def test_next_version(self):
+        """Test that versions continue after the highest existing artifact"""
+        with tempfile.TemporaryDirectory() as archive:
+            self.assertEqual(next_version(archive), 1)
+            for name in ("predictor_v1.pkl", "scaler_v1.pkl", "predictor_v3.json", "predictor_v10_old.pkl"):
+                open(os.path.join(archive, name), "w").close()
+            self.assertEqual(next_version(archive), 4)
+
+    def test_folds_hold_out_whole_units(self):
+        """Test that no source unit appears on both sides of a fold"""
+        labels = np.repeat(["A", "B"], 50)
+        groups = np.repeat(np.arange(10), 10)
+        for train_rows, test_rows in cv_splits(labels, groups):
+            self.assertFalse(set(groups[train_rows]) & set(groups[test_rows]))
+
+    def test_single_row_class_stays_in_training(self):
+        """Test that a class with one row does not break stratified folds and is never held out"""
+        labels = np.array(["A"] * 10 + ["B"] * 10 + ["C"])
+        groups = np.zeros(len(labels), dtype=int)
+        splits = cv_splits(labels, groups)
+        self.assertGreaterEqual(len(splits), 2)
+        for train_rows, test_rows in splits:
+            self.assertIn(20, train_rows)
+            self.assertNotIn(20, test_rows)
+            self.assertFalse(set(train_rows) & set(test_rows))
+
+
+class TestTrain(unittest.TestCase):
+    """Test the whole pipeline on a synthetic dataset"""
+
+    def test_writes_versioned_artifacts(self):
+        """Test that training writes predictor, scaler and a manifest with accuracy, latency and schema"""
+        with tempfile.TemporaryDirectory() as directory:
+            dataset = os.path.join(directory, "dataset")
+            archive = os.path.join(directory, "archive")
+            os.makedirs(dataset)
+            write_dataset(dataset)
+            candidates = {"logistic_regression": LogisticRegression(max_iter=500), "knn": KNeighborsClassifier(3)}
+            manifest = train([dataset], candidates, budget_ms=1000.0, jobs=1, finalists=2, archive_dir=archive)
+
+            self.assertEqual(manifest["version"], 1)
+            self.assertEqual(sorted(os.listdir(archive)), ["predictor_v1.json", "predictor_v1.pkl", "scaler_v1.pkl"])
+            self.assertGreater(manifest["accuracy"], 0.9)
+            self.assertEqual(manifest["classes"], ["A", "B", "C"])
+            self.assertEqual(manifest["feature_schema"]["n_features"], 64)
+            self.assertEqual(set(manifest["latency"]), {"1", "2", "32"})
+            self.assertEqual(manifest["training"]["units"], 18)
+            with open(os.path.join(archive, "predictor_v1.json")) as f:
+                self.assertEqual(json.load(f)["model"], manifest["model"])
+
+    def test_timing_continues_past_finalists_over_budget(self):
+        """Test that a cheaper candidate is timed and selected when every finalist is over budget"""
+        with tempfile.TemporaryDirectory() as directory:
+            write_dataset(directory, units_per_letter=3)
+            archive = os.path.join(directory, "archive")
+            candidates = {"slow_knn": SlowKNeighborsClassifier(3), "logistic_regression": LogisticRegression(max_iter=500)}
+            manifest = train([directory], candidates, budget_ms=2.0, jobs=1, finalists=1, archive_dir=archive)
+            self.assertIsNotNone(manifest)
+            self.assertEqual(manifest["model"], "logistic_regression")
+
+    def test_nothing_written_over_budget(self):
+        """Test that no artifact is written when no candidate meets the budget"""
+        with tempfile.TemporaryDirectory() as directory:
+            write_dataset(directory, units_per_letter=3)
+            archive = os.path.join(directory, "archive")
+            manifest = train([directory], {"knn": KNeighborsClassifier(3)}, budget_ms=0.0, jobs=1, archive_dir=archive)
+            self.assertIsNone(manifest)
+            self.assertFalse(os.path.exists(archive))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,99 @@
+"""
+Test suite for per-user calibration
+"""
+import time
+import unittest
+import numpy as np
+from cascade import CentroidStage
+from model_store import LoadedModel
+from sign_engine import SignRecognizer, EngineOptions, VIDEO
+from user_adapter import CalibrationSession, UserAdapter
+from test_model_store import wait_for
+from test_sign_engine import IdentityScaler
+
+
+POPULATION = np.eye(3, 64) * 3.0
+
+
+def population_model():
+    """A model whose letters A, B, C sit at the population centroids"""
+    return LoadedModel(1, CentroidStage(POPULATION, ["a", "b", "c"]), IdentityScaler(), ["A", "B", "C"], None)
+
+
+def user_rows(letter, n, seed=0):
+    """This user's A sits closer to the population's B; B and C are typical"""
+    centers = {"A": 0.45 * POPULATION[0] + 0.55 * POPULATION[1], "B": POPULATION[1], "C": POPULATION[2]}
+    rng = np.random.default_rng(seed)
+    return centers[letter] + rng.normal(scale=0.05, size=(n, 64))
+
+
+class TestUserAdapter(unittest.TestCase):
+    """Test the per-frame adjustment"""
+
+    def test_adjust_keeps_uncalibrated_letters(self):
+        """Test that rows still sum to one and letters without prototypes keep their probability"""
+        model = population_model()
+        features = np.concatenate([user_rows("A", 5), user_rows("B", 5)])
+        adapter = UserAdapter.fit(model, features, [0] * 5 + [1] * 5)
+        probs = model.classifier.predict_proba(user_rows("A", 3, seed=1))
+        adjusted = adapter.adjust(user_rows("A", 3, seed=1), probs)
+        np.testing.assert_allclose(adjusted.sum(axis=1), 1.0)
+        np.testing.assert_allclose(adjusted[:, 2], probs[:, 2])
+        self.assertTrue(np.all(np.argmax(probs, axis=1) == 1))
+        self.assertTrue(np.all(np.argmax(adjusted, axis=1) == 0))
+
+    def test_adjust_is_cheap(self):
+        """Test that adjusting one frame costs microseconds"""
+        model = population_model()
+        adapter = UserAdapter.fit(model, np.concatenate([user_rows(letter, 10) for letter in "ABC"]), np.repeat([0, 1, 2], 10))
+        scaled = user_rows("A", 1)
+        probs = model.classifier.predict_proba(scaled)
+        start = time.perf_counter()
+        for _ in range(2000):
+            adapter.adjust(scaled, probs)
+        self.assertLess((time.perf_counter() - start) / 2000 * 1e6, 100.0)
+
+
+class TestCalibrationSession(unittest.TestCase):
+    """Test prompting, background training and validation"""
+
+    def test_session_trains_and_engine_applies_adapter(self):
+        """Test that a full session yields an adapter that fixes this user's A, used only with its model"""
+        model = population_model()
+        engine = SignRecognizer(EngineOptions(running_mode=VIDEO, overlay=None))
+        engine.models.swap(model)
+        session = CalibrationSession(model, on_ready=lambda adapter: setattr(engine, "adapter", adapter),
+                                     samples_per_letter=10, settle_frames=3)
+        for letter in "ABC":
+            self.assertEqual(session.prompt, letter)
+            for row in user_rows(letter, 13):
+                session.observe(row)
+        self.assertIsNone(session.prompt)
+        self.assertTrue(wait_for(lambda: session.state != "training"))
+        self.assertEqual(session.state, "ready")
+        self.assertGreater(session.result["adapted_accuracy"], session.result["base_accuracy"])
+        features = user_rows("A", 4, seed=2)
+        self.assertTrue(np.all(np.argmax(engine._classify(model, features), axis=1) == 0))
+        other = model._replace(version=2)
+        self.assertTrue(np.all(np.argmax(engine._classify(other, features), axis=1) == 1))
+
+    def test_settle_frames_are_skipped(self):
+        """Test that the first frames after a prompt are not kept"""
+        session = CalibrationSession(population_model(), samples_per_letter=5, settle_frames=3)
+        for row in user_rows("B", 4):
+            session.observe(row)
+        self.assertEqual(session.status()["collected"], 1)
+
+    def test_nothing_collected_is_rejected(self):
+        """Test that finishing without samples reports an error and produces no adapter"""
+        ready = []
+        session = CalibrationSession(population_model(), on_ready=ready.append)
+        session.finish()
+        self.assertTrue(wait_for(lambda: session.state != "training"))
+        self.assertEqual(session.state, "rejected")
+        self.assertIn("error", session.result)
+        self.assertEqual(ready, [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
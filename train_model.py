@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Latency-aware classifier training and selection
+
+Trains every candidate classifier on an extracted landmark dataset
+(``extract_landmarks.py``) with cross-validation, spreading the (candidate,
+fold) fits over all cores. Folds are grouped by source clip or image folder, so
+near-identical consecutive frames never sit on both sides of a split.
+
+The most accurate candidates are then refit on all the data and timed on this
+machine the way the app calls them: scaler plus ``predict_proba`` on one row
+(one hand), and on batches. The most accurate candidate whose single-row p99
+latency fits ``--budget-ms`` is written to ``archive/`` as the next
+``predictor_vN.pkl``/``scaler_vN.pkl`` with a ``predictor_vN.json`` manifest
+holding accuracy, latency, the candidate table and the feature schema.
+
+Usage:
+    python train_model.py datasets/v2
+    python train_model.py datasets/v2 datasets/extra --budget-ms 1.0 --jobs 8
+"""
+import argparse
+import datetime
+import json
+import os
+import re
+import time
+import joblib
+import numpy as np
+import sklearn
+from sklearn.base import clone
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GroupKFold, StratifiedKFold
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import RobustScaler
+from sklearn.svm import SVC
+from classification import FEATURE_COLUMNS, predict_proba
+from extract_landmarks import LandmarkDataset
+from platform_utils import get_platform_info
+
+ARCHIVE_DIR = "archive"
+
+# Inference runs one hand (or two) per frame on one core: candidates are timed with n_jobs=1
+CANDIDATES = {
+    "logistic_regression": LogisticRegression(max_iter=2000),
+    "knn": KNeighborsClassifier(n_neighbors=5, n_jobs=1),
+    "svc_rbf": SVC(kernel="rbf", C=10.0, probability=True),
+    "random_forest": RandomForestClassifier(n_estimators=200, n_jobs=1, random_state=0),
+    "extra_trees": ExtraTreesClassifier(n_estimators=200, n_jobs=1, random_state=0),
+    "mlp": MLPClassifier(hidden_layer_sizes=(128, 64), max_iter=500, early_stopping=True, random_state=0),
+}
+
+
+def load_datasets(directories):
+    """
+    Concatenate the training arrays of several extracted datasets.
+
+    Returns:
+        tuple: (features (n, 64), upper-case labels (n,), group ID per row (n,)), groups being source units
+    """
+    features, labels, groups = [], [], []
+    offset = 0
+    for directory in directories:
+        x, y, units = LandmarkDataset(directory).arrays()
+        features.append(x)
+        labels.append(np.array([str(label).upper() for label in y], dtype=object))
+        groups.append(units + offset)
+        offset += units.max() + 1 if len(units) else 0
+    return np.concatenate(features), np.concatenate(labels), np.concatenate(groups)
+
+
+def cv_splits(labels, groups, n_splits=5):
+    """
+    Cross-validation folds, grouped by source unit when there are enough units.
+
+    Returns:
+        list: (train indices, test indices) per fold
+    """
+    n_groups = len(np.unique(groups))
+    if n_groups >= n_splits:
+        return list(GroupKFold(n_splits=n_splits).split(labels, labels, groups))
+    # Too few clips to hold whole ones out: fall back to stratified frames.
+    # Classes with a single row cannot be stratified; they stay on the training side of every fold.
+    _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    single = counts[inverse] < 2
+    rows = np.flatnonzero(~single)
+    if len(np.unique(inverse[rows])) < 2:
+        raise ValueError("cross-validation needs at least two classes with two or more rows each")
+    n_splits = max(2, min(n_splits, counts[counts >= 2].min()))
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=0).split(rows, labels[rows])
+    return [(np.concatenate((rows[train], np.flatnonzero(single))), rows[test]) for train, test in folds]
+
+
+def _fit_fold(name, estimator, features, labels, train, test):
+    """Fit scaler and candidate on one fold's training rows; returns (name, accuracy, fit seconds)"""
+    model = make_pipeline(RobustScaler(), clone(estimator))
+    start = time.perf_counter()
+    model.fit(features[train], labels[train])
+    seconds = time.perf_counter() - start
+    return name, float(model.score(features[test], labels[test])), seconds
+
+
+def cross_validate(candidates, features, labels, groups, n_splits=5, jobs=-1):
+    """
+    Cross-validate every candidate, all (candidate, fold) fits in parallel.
+
+    Args:
+        candidates: {name: unfitted estimator}
+        features, labels, groups: Training arrays
+        n_splits: Folds
+        jobs: Parallel jobs (-1 for all cores)
+
+    Returns:
+        dict: name -> {"accuracy", "accuracy_std", "fit_s"} (means over folds)
+    """
+    splits = cv_splits(labels, groups, n_splits)
+    fits = joblib.Parallel(n_jobs=jobs)(
+        joblib.delayed(_fit_fold)(name, estimator, features, labels, train, test)
+        for name, estimator in candidates.items()
+        for train, test in splits
+    )
+    results = {}
+    for name in candidates:
+        scores = [accuracy for fit_name, accuracy, _ in fits if fit_name == name]
+        seconds = [fit_s for fit_name, _, fit_s in fits if fit_name == name]
+        results[name] = {
+            "accuracy": float(np.mean(scores)),
+            "accuracy_std": float(np.std(scores)),
+            "fit_s": float(np.mean(seconds)),
+            "folds": len(scores),
+        }
+    return results
+
+
+def fit_final(estimator, features, labels):
+    """Fit the app's two artifacts, scaler and classifier, on all the data"""
+    scaler = RobustScaler().fit(features)
+    classifier = clone(estimator).fit(scaler.transform(features), labels)
+    return scaler, classifier
+
+
+def measure_latency(classifier, scaler, features, batch_sizes=(1, 2, 32), repeats=200, warmup=20):
+    """
+    Time the app's per-frame call, ``predict_proba(classifier, scaler.transform(rows))``.
+
+    Args:
+        classifier, scaler: Fitted artifacts
+        features: Unscaled rows to draw inputs from
+        batch_sizes: Rows per call to time (1 is one hand, 2 both hands)
+        repeats: Timed calls per batch size
+        warmup: Untimed calls first
+
+    Returns:
+        dict: str(batch size) -> {"p50_ms", "p99_ms", "per_row_ms"} per call
+    """
+    rng = np.random.default_rng(0)
+    latency = {}
+    for batch in batch_sizes:
+        rows = [features[rng.integers(0, len(features), batch)] for _ in range(warmup + repeats)]
+        times = []
+        for index, data in enumerate(rows):
+            start = time.perf_counter()
+            predict_proba(classifier, scaler.transform(data))
+            if index >= warmup:
+                times.append((time.perf_counter() - start) * 1000)
+        p50, p99 = np.percentile(times, [50, 99])
+        latency[str(batch)] = {"p50_ms": float(p50), "p99_ms": float(p99), "per_row_ms": float(p50) / batch}
+    return latency
+
+
+def select_model(results, budget_ms):
+    """
+    Pick the most accurate candidate whose single-row p99 latency fits the budget.
+
+    Args:
+        results: name -> {"accuracy", "latency"} (candidates without latency are ignored)
+        budget_ms: Single-row p99 budget in milliseconds
+
+    Returns:
+        str or None: Selected candidate name, None if nothing fits
+    """
+    eligible = [
+        name for name, result in results.items()
+        if "latency" in result and result["latency"]["1"]["p99_ms"] <= budget_ms
+    ]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda name: (results[name]["accuracy"], -results[name]["latency"]["1"]["p99_ms"]))
+
+
+def next_version(archive_dir=ARCHIVE_DIR):
+    """The first N without an archive/predictor_vN artifact"""
+    versions = [
+        int(match.group(1)) for match in
+        (re.fullmatch(r"predictor_v(\d+)\.(?:pkl|json)", name) for name in os.listdir(archive_dir))
+        if match
+    ] if os.path.isdir(archive_dir) else []
+    return max(versions, default=0) + 1
+
+
+def write_artifacts(version, classifier, scaler, manifest, archive_dir=ARCHIVE_DIR):
+    """
+    Write predictor_vN.pkl, scaler_vN.pkl and predictor_vN.json.
+
+    The manifest goes last, so a manifest always describes complete artifacts.
+
+    Returns:
+        str: Manifest path
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    joblib.dump(classifier, os.path.join(archive_dir, f"predictor_v{version}.pkl"))
+    joblib.dump(scaler, os.path.join(archive_dir, f"scaler_v{version}.pkl"))
+    path = os.path.join(archive_dir, f"predictor_v{version}.json")
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+def train(datasets, candidates=None, budget_ms=2.0, jobs=-1, n_splits=5, finalists=3, archive_dir=ARCHIVE_DIR):
+    """
+    Cross-validate, time and select a classifier, then write it as the next version.
+
+    Args:
+        datasets: Extracted dataset directories
+        candidates: {name: unfitted estimator} (default: CANDIDATES)
+        budget_ms: Single-row p99 latency budget
+        jobs: Parallel jobs for cross-validation
+        n_splits: Folds
+        finalists: How many of the most accurate candidates are refit and timed; if none of them
+            meets the budget, the next ones are timed until one does
+        archive_dir: Where versioned artifacts go
+
+    Returns:
+        dict or None: The manifest written, None if no candidate met the budget
+    """
+    candidates = candidates if candidates is not None else CANDIDATES
+    features, labels, groups = load_datasets(datasets)
+    print(f"Dataset: {len(features)} rows, {len(np.unique(labels))} classes, {len(np.unique(groups))} source units")
+
+    start = time.perf_counter()
+    results = cross_validate(candidates, features, labels, groups, n_splits, jobs)
+    print(f"Cross-validated {len(candidates)} candidates in {time.perf_counter() - start:.1f}s")
+
+    # Time the most accurate candidates one at a time, so timings are not skewed by parallel fits.
+    # Past the finalists, keep going down the ranking until some candidate meets the budget.
+    ranked = sorted(results, key=lambda name: results[name]["accuracy"], reverse=True)
+    fitted = {}
+    for rank, name in enumerate(ranked):
+        if rank >= finalists and select_model(results, budget_ms) is not None:
+            break
+        scaler, classifier = fit_final(candidates[name], features, labels)
+        results[name]["latency"] = measure_latency(classifier, scaler, features)
+        fitted[name] = (scaler, classifier)
+    for name in ranked:
+        print(format_candidate(name, results[name], budget_ms))
+
+    selected = select_model(results, budget_ms)
+    if selected is None:
+        print(f"No candidate meets the {budget_ms}ms single-row budget; nothing written")
+        return None
+
+    version = next_version(archive_dir)
+    scaler, classifier = fitted[selected]
+    manifest = {
+        "version": version,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "model": selected,
+        "params": {key: repr(value) for key, value in candidates[selected].get_params().items()},
+        "accuracy": results[selected]["accuracy"],
+        "accuracy_std": results[selected]["accuracy_std"],
+        "latency": results[selected]["latency"],
+        "latency_budget_ms": budget_ms,
+        "classes": [str(label) for label in classifier.classes_],
+        "feature_schema": {
+            "n_features": len(FEATURE_COLUMNS),
+            "columns": FEATURE_COLUMNS,
+            "landmarks": "hand_world_landmarks",
+            "scaler": type(scaler).__name__,
+        },
+        "training": {
+            "datasets": [os.path.abspath(directory) for directory in datasets],
+            "rows": len(features),
+            "units": len(np.unique(groups)),
+            "cv_folds": results[selected]["folds"],
+            "sklearn_version": sklearn.__version__,
+        },
+        "machine": get_platform_info(),
+        "candidates": results,
+    }
+    path = write_artifacts(version, classifier, scaler, manifest, archive_dir)
+    print(f"Selected {selected}: wrote predictor_v{version} ({path})")
+    return manifest
+
+
+def format_candidate(name, result, budget_ms):
+    """One summary line for a candidate"""
+    line = f"  {name:20s} accuracy {result['accuracy'] * 100:5.1f}% ±{result['accuracy_std'] * 100:.1f}"
+    if "latency" not in result:
+        return line + " | not timed"
+    single = result["latency"]["1"]
+    verdict = "ok" if single["p99_ms"] <= budget_ms else "over budget"
+    return (line + f" | 1 row p50 {single['p50_ms']:.2f} p99 {single['p99_ms']:.2f}ms | "
+            f"32 rows {result['latency']['32']['per_row_ms']:.3f}ms/row | {verdict}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train, time and select a letter classifier")
+    parser.add_argument("datasets", nargs="+", help="dataset directories from extract_landmarks.py")
+    parser.add_argument("--candidates", nargs="+", choices=sorted(CANDIDATES), default=None,
+                        help="candidates to try (default: all)")
+    parser.add_argument("--budget-ms", type=float, default=2.0, help="single-row p99 inference budget")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel fits (-1 for all cores)")
+    parser.add_argument("--folds", type=int, default=5, help="cross-validation folds")
+    parser.add_argument("--finalists", type=int, default=3, help="most accurate candidates refit and timed (more are timed if none fits the budget)")
+    parser.add_argument("--archive", default=ARCHIVE_DIR, help="artifact directory")
+    args = parser.parse_args()
+
+    candidates = {name: CANDIDATES[name] for name in args.candidates} if args.candidates else CANDIDATES
+    print("=" * 60)
+    print("MODEL TRAINING")
+    print("=" * 60)
+    manifest = train(args.datasets, candidates, args.budget_ms, args.jobs, args.folds, args.finalists, args.archive)
+    print("=" * 60)
+    if manifest is None:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Per-user calibration of the letter classifier
+
+Hands differ: the same letter from two signers lands in different parts of the
+feature space. A calibration session prompts the user through the letters and
+buffers a second or so of each (``CalibrationSession.observe``, an append on
+the callback thread). When it finishes, a background thread fits a
+``UserAdapter``: one prototype (mean scaled feature row) per calibrated letter.
+Per frame the adapter blends the prototypes' nearest-centroid probabilities
+into the classifier's probabilities for those letters, leaving the other
+letters' probabilities untouched: one small matrix product per frame.
+
+The adapter is checked on the second half of each letter's samples before it is
+used; one that does not beat the plain classifier there is reported and
+discarded. It belongs to the model it was fitted on and is ignored after a hot
+reload swaps in another one.
+"""
+import threading
+import time
+import numpy as np
+from cascade import CentroidStage
+from classification import predict_proba
+
+
+class UserAdapter:
+    """
+    Prototype offsets on top of one LoadedModel, for one user.
+
+    Usage:
+        adapter = UserAdapter.fit(model, features, columns)
+        probs = adapter.adjust(model.scaler.transform(features), probs)
+    """
+
+    def __init__(self, model, stage, weight=0.5):
+        """
+        Args:
+            model: LoadedModel the prototypes were computed for
+            stage: CentroidStage whose classes are column indices into the model's probabilities
+            weight: Share of the calibrated letters' probability given to the prototypes
+        """
+        self.model = model
+        self.stage = stage
+        self.weight = weight
+        self._columns = stage.classes_.astype(int)
+
+    @classmethod
+    def fit(cls, model, features, columns, weight=0.5):
+        """
+        Args:
+            model: LoadedModel in use
+            features: Unscaled feature rows of shape (n, 64)
+            columns: Index of each row's letter in model.labels
+
+        Returns:
+            UserAdapter
+        """
+        stage = CentroidStage.fit(model.scaler.transform(features), np.asarray(columns))
+        return cls(model, stage, weight)
+
+    def adjust(self, scaled, probs):
+        """
+        Args:
+            scaled: Scaled feature rows
+            probs: The model's probabilities for those rows
+
+        Returns:
+            np.ndarray: Adjusted probabilities (rows still sum to 1)
+        """
+        columns = self._columns
+        calibrated = probs[:, columns]
+        # The calibrated letters keep their total probability; the prototypes redistribute part of it
+        mass = calibrated.sum(axis=1, keepdims=True)
+        adjusted = probs.copy()
+        adjusted[:, columns] = (1 - self.weight) * calibrated + self.weight * mass * self.stage.predict_proba(scaled)
+        return adjusted
+
+
+def _accuracy(probs, columns):
+    return float(np.mean(np.argmax(probs, axis=1) == columns)) if len(columns) else 0.0
+
+
+class CalibrationSession:
+    """
+    Prompts through the letters, buffers samples and trains an adapter in the background.
+
+    Usage:
+        session = CalibrationSession(engine.models.current, on_ready=lambda a: setattr(engine, "adapter", a))
+        session.observe(hand.features)   # per frame with one hand in view
+        session.prompt                   # letter to show the user
+    """
+
+    def __init__(self, model, on_ready=None, letters=None, samples_per_letter=30, settle_frames=15, metrics=None):
+        """
+        Args:
+            model: LoadedModel to calibrate
+            on_ready: Called with the UserAdapter once it is trained and validated (training thread)
+            letters: Letters to prompt for (default: all of the model's labels)
+            samples_per_letter: Frames kept per letter
+            settle_frames: Frames skipped after each new prompt while the user forms the sign
+            metrics: Optional MetricsRegistry for calibration_ms timings
+        """
+        self.model = model
+        self.on_ready = on_ready
+        self.letters = list(letters) if letters is not None else list(model.labels)
+        self.samples_per_letter = samples_per_letter
+        self.settle_frames = settle_frames
+        self.metrics = metrics
+        self.state = "collecting"  # then "training", "ready" or "rejected"
+        self.result = None
+        self.adapter = None
+        self._index = 0
+        self._seen = 0
+        self._samples = {letter: [] for letter in self.letters}
+
+    @property
+    def prompt(self):
+        """Letter the user should sign now, or None once collection is over"""
+        if self.state != "collecting" or self._index >= len(self.letters):
+            return None
+        return self.letters[self._index]
+
+    def observe(self, features):
+        """
+        Buffer one frame of the prompted letter (callback thread; never blocks).
+
+        Args:
+            features: Unscaled feature row of the user's hand
+        """
+        letter = self.prompt
+        if letter is None:
+            return
+        self._seen += 1
+        if self._seen <= self.settle_frames:
+            return
+        samples = self._samples[letter]
+        samples.append(features)
+        if len(samples) >= self.samples_per_letter:
+            self.skip()
+
+    def skip(self):
+        """Move on to the next letter; trains once the last one is done"""
+        self._index += 1
+        self._seen = 0
+        if self._index >= len(self.letters):
+            self.finish()
+
+    def finish(self):
+        """Stop collecting and train on what was collected, on a background thread"""
+        if self.state != "collecting":
+            return
+        self.state = "training"
+        threading.Thread(target=self._train, daemon=True).start()
+
+    def _train(self):
+        start = time.perf_counter()
+        try:
+            self.adapter, self.result = self.train()
+        except Exception as e:
+            self.adapter, self.result = None, {"error": str(e)}
+        if self.metrics is not None:
+            self.metrics.observe("calibration_ms", (time.perf_counter() - start) * 1000)
+        self.state = "ready" if self.adapter is not None else "rejected"
+        if self.adapter is not None and self.on_ready is not None:
+            self.on_ready(self.adapter)
+
+    def train(self):
+        """
+        Fit on the first half of each letter's samples, compare on the second half, then refit on all.
+
+        Returns:
+            tuple: (UserAdapter or None if it did not help, dict with held-out accuracies)
+        """
+        model = self.model
+        fit_rows, fit_columns, test_rows, test_columns = [], [], [], []
+        for letter, samples in self._samples.items():
+            if len(samples) < 2:
+                continue
+            column = model.labels.index(letter)
+            half = len(samples) // 2
+            fit_rows += samples[:half]
+            fit_columns += [column] * half
+            test_rows += samples[half:]
+            test_columns += [column] * (len(samples) - half)
+        if not fit_rows:
+            return None, {"error": "no letters were calibrated"}
+        fit_rows, test_rows = np.array(fit_rows), np.array(test_rows)
+        test_columns = np.array(test_columns)
+        adapter = UserAdapter.fit(model, fit_rows, fit_columns)
+        scaled = model.scaler.transform(test_rows)
+        probs = predict_proba(model.classifier, scaled)
+        result = {
+            "letters": len(set(fit_columns)),
+            "base_accuracy": _accuracy(probs, test_columns),
+            "adapted_accuracy": _accuracy(adapter.adjust(scaled, probs), test_columns),
+        }
+        if result["adapted_accuracy"] < result["base_accuracy"]:
+            return None, result
+        rows = np.concatenate([fit_rows, test_rows])
+        return UserAdapter.fit(model, rows, list(fit_columns) + list(test_columns)), result
+
+    def status(self):
+        """
+        Returns:
+            dict: JSON-serializable state, prompt, progress and held-out result
+        """
+        letter = self.prompt
+        return {
+            "state": self.state,
+            "prompt": letter,
+            "collected": len(self._samples[letter]) if letter is not None else None,
+            "samples_per_letter": self.samples_per_letter,
+            "letters_done": min(self._index, len(self.letters)),
+            "letters": len(self.letters),
+            "result": self.result,
+        }
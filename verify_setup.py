@@ -111,5 +111,5 @@ print("\n✅ All checks passed! You're ready to run the application.")
 print("\nNext steps:")
 print("  • Basic demo:        python demo.py")
 print("  • Interactive game:  python demo_with_game.py")
-print("  • Camera test:       python test_camera_fps.py")
+print("  • Camera test:       python camera_characterize.py")
 print("\n" + "="*60)